@@ -1,10 +1,46 @@
 import json
-from collections import defaultdict
-from typing import List, Literal, Union, Tuple, Dict
+from concurrent.futures import Executor
+from collections import defaultdict, OrderedDict
+from typing import List, Literal, Union, Tuple, Dict, Set, Hashable, Callable, Iterator
 import numpy as np
 from numpy.typing import NDArray
 import copy
 import pandas as pd
+from .Kernels import kernels
+
+
+def window_sum(values: NDArray, starts: NDArray, ends: NDArray) -> NDArray:
+    """Sum the values over the windows [start, end) of the first axis using cumulative sums
+
+    Args:
+        values (NDArray): values to sum, the first axis is the one the windows slide on
+        starts (NDArray): first index of each window
+        ends (NDArray): end index (excluded) of each window
+
+    Returns:
+        NDArray: sum of each window, the first axis indexes the windows
+    """
+    cumulative = np.zeros((values.shape[0] + 1, *values.shape[1:]), dtype=int)
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    return cumulative[ends] - cumulative[starts]
+
+
+def zobrist_keys(shape: Tuple[int, ...], seed: int) -> NDArray:
+    """Draw random 64-bit keys for Zobrist hashing
+
+    The hash of a state is the XOR of the keys of its features, so it is updated in O(1) when a
+    feature is added or removed.
+
+    Args:
+        shape (Tuple[int, ...]): shape of the array of keys
+        seed (int): seed of the random generator, so that the keys are the same across processes
+
+    Returns:
+        NDArray: array of keys
+    """
+    return np.random.default_rng(seed).integers(
+        0, np.iinfo(np.uint64).max, size=shape, dtype=np.uint64, endpoint=True
+    )
 
 
 class Room:
@@ -137,6 +173,7 @@ class Patient(Occupant):
         self.surgery_duration = surgery_duration
         self.surgeon = surgeon
         self.incompatible_rooms = incompatible_rooms
+        self.incompatible_room_ids = {room.id for room in incompatible_rooms}
         self.surgery_due_day = surgery_due_day
         self.assignment = dict()
         self.assignment["id"] = self.id
@@ -311,8 +348,6 @@ class Indexer:
         Returns:
             int: index of the object
         """
-        if type == "occupants":
-            type = "patients"
         index = self.types[type]
         self.types[type] += 1
         self.indexer[type][index] = obj
@@ -340,8 +375,6 @@ class Indexer:
         Returns:
             Union[Patient, Occupant, Surgeon, Nurse, OperatingTheater, Room]: object
         """
-        if type == "occupants":
-            type = "patients"
         return self.indexer[type][index]
 
     def reverse_lookup(
@@ -365,8 +398,6 @@ class Indexer:
         Returns:
             int: index of the object
         """
-        if type == "occupants":
-            type = "patients"
         return self.reverse_indexer[type][id]
 
     def id_lookup(
@@ -453,6 +484,98 @@ class PASActionUnschedule(NeighboringAction):
         )
 
 
+class PASActionMove(NeighboringAction):
+    def __init__(
+        self,
+        day: int,
+        room: int,
+        patient: int,
+        ot: int,
+        new_day: int,
+        new_room: int,
+        new_ot: int,
+    ):
+        """Patient moving action: the scheduled patient changes admission day, room and/or operating theater
+
+        Args:
+            day (int): index of the current day
+            room (int): index of the current room
+            patient (int): index of the patient
+            ot (int): index of the current operating theater
+            new_day (int): index of the new day
+            new_room (int): index of the new room
+            new_ot (int): index of the new operating theater
+        """
+        self.day = day
+        self.room = room
+        self.patient = patient
+        self.ot = ot
+        self.new_day = new_day
+        self.new_room = new_room
+        self.new_ot = new_ot
+
+    def __str__(self):
+        return f"Moved patient {self.patient}, day {self.new_day}, room {self.new_room}, OT {self.new_ot}"
+
+    def __eq__(self, value):
+        if not isinstance(value, PASActionMove):
+            return False
+        # Moving the patient back is the same move
+        slot = (self.day, self.room, self.ot)
+        new_slot = (self.new_day, self.new_room, self.new_ot)
+        value_slot = (value.day, value.room, value.ot)
+        value_new_slot = (value.new_day, value.new_room, value.new_ot)
+        return self.patient == value.patient and {slot, new_slot} == {
+            value_slot,
+            value_new_slot,
+        }
+
+
+class PASActionSwap(NeighboringAction):
+    def __init__(
+        self,
+        day: int,
+        room: int,
+        patient: int,
+        ot: int,
+        other_day: int,
+        other_room: int,
+        other_patient: int,
+        other_ot: int,
+    ):
+        """Patient swapping action: two scheduled patients exchange admission day, room and operating theater
+
+        Args:
+            day (int): index of the day of the first patient
+            room (int): index of the room of the first patient
+            patient (int): index of the first patient
+            ot (int): index of the operating theater of the first patient
+            other_day (int): index of the day of the second patient
+            other_room (int): index of the room of the second patient
+            other_patient (int): index of the second patient
+            other_ot (int): index of the operating theater of the second patient
+        """
+        self.day = day
+        self.room = room
+        self.patient = patient
+        self.ot = ot
+        self.other_day = other_day
+        self.other_room = other_room
+        self.other_patient = other_patient
+        self.other_ot = other_ot
+
+    def __str__(self):
+        return f"Swapped patients {self.patient} and {self.other_patient}"
+
+    def __eq__(self, value):
+        if not isinstance(value, PASActionSwap):
+            return False
+        return {self.patient, self.other_patient} == {
+            value.patient,
+            value.other_patient,
+        }
+
+
 class NRAActionSchedule(NeighboringAction):
     def __init__(self, shift: int, room: int, nurse: int):
         """Nurse scheduling action
@@ -509,6 +632,93 @@ class NRAActionUnschedule(NeighboringAction):
         )
 
 
+class NRAActionReassign(NeighboringAction):
+    def __init__(self, shift: int, room: int, nurse: int, new_nurse: int):
+        """Nurse reassigning action: the room is handed from a nurse to another one
+
+        Args:
+            shift (int): index of the shift
+            room (int): index of the room
+            nurse (int): index of the nurse currently covering the room
+            new_nurse (int): index of the nurse that takes over the room
+        """
+        self.shift = shift
+        self.room = room
+        self.nurse = nurse
+        self.new_nurse = new_nurse
+
+    def __str__(self):
+        return f"Reassigned room {self.room} from nurse {self.nurse} to nurse {self.new_nurse}, shift {self.shift}"
+
+    def __eq__(self, value):
+        if not isinstance(value, NRAActionReassign):
+            return False
+        # Handing the room back is the same move
+        return (
+            self.shift == value.shift
+            and self.room == value.room
+            and {self.nurse, self.new_nurse} == {value.nurse, value.new_nurse}
+        )
+
+
+class NRAActionSwap(NeighboringAction):
+    def __init__(
+        self, shift: int, room: int, nurse: int, other_room: int, other_nurse: int
+    ):
+        """Nurse swapping action: two nurses exchange their rooms within a shift
+
+        Args:
+            shift (int): index of the shift
+            room (int): index of the room of the first nurse
+            nurse (int): index of the first nurse
+            other_room (int): index of the room of the second nurse
+            other_nurse (int): index of the second nurse
+        """
+        self.shift = shift
+        self.room = room
+        self.nurse = nurse
+        self.other_room = other_room
+        self.other_nurse = other_nurse
+
+    def __str__(self):
+        return f"Swapped nurses {self.nurse} and {self.other_nurse}, shift {self.shift}, rooms {self.room} and {self.other_room}"
+
+    def __eq__(self, value):
+        if not isinstance(value, NRAActionSwap):
+            return False
+        return self.shift == value.shift and {self.room, self.other_room} == {
+            value.room,
+            value.other_room,
+        }
+
+
+class NeighborhoodBound:
+    def __init__(
+        self,
+        admissible: Callable[[NeighboringAction, int], bool],
+        bound: float = float("inf"),
+    ):
+        """Initialize the NeighborhoodBound object, which keeps track of the best admissible penalty
+        found so far while a neighborhood is evaluated
+
+        Args:
+            admissible (Callable[[NeighboringAction, int], bool]): whether a move with the given penalty can be selected, e.g. it is not tabu
+            bound (float, optional): initial bound. Defaults to inf.
+        """
+        self.admissible = admissible
+        self.bound = bound
+
+    def update(self, action: NeighboringAction, penalty: int):
+        """Tighten the bound with an evaluated move
+
+        Args:
+            action (NeighboringAction): evaluated move
+            penalty (int): exact penalty after the move
+        """
+        if penalty < self.bound and self.admissible(action, penalty):
+            self.bound = penalty
+
+
 class ActionError(Exception):
     def __init__(self, message: str = "Action error"):
         """Initialize the ActionError object
@@ -636,17 +846,13 @@ class Loader:
             self.indexer.get_index("occupants", occupant)
         return occupants
 
-    def load_patients(self, occupants: NDArray) -> NDArray:
+    def load_patients(self) -> NDArray:
         """Load the patients
 
-        Args:
-            occupants (NDArray): array of occupants
-
         Returns:
-            NDArray: array of patients (including occupants)
+            NDArray: array of patients (occupants excluded)
         """
         patients = np.array([], dtype=Patient)
-        patients = np.append(patients, occupants)
         for patient_dict in self.data["patients"]:
             surgeon_id = patient_dict.pop("surgeon_id")
             surgeon = self.indexer.id_lookup("surgeons", surgeon_id)
@@ -706,6 +912,184 @@ class Logger:
         )
 
 
+class PenaltyCache:
+    def __init__(self, max_size: int):
+        """Initialize the PenaltyCache object, a bounded LRU cache from state hashes to penalties
+
+        Args:
+            max_size (int): maximum number of cached states (0 disables the cache)
+        """
+        self.max_size = max_size
+        self.entries: OrderedDict[int, Tuple[int, Dict[str, int]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state_hash: int) -> Union[Tuple[int, Dict[str, int]], None]:
+        """Return the penalty of a state, if cached
+
+        Args:
+            state_hash (int): hash of the state
+
+        Returns:
+            Union[Tuple[int, Dict[str, int]], None]: overall penalty and individual penalties, None if the state is not cached
+        """
+        entry = self.entries.get(state_hash)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(state_hash)
+        return entry
+
+    def put(self, state_hash: int, entry: Tuple[int, Dict[str, int]]):
+        """Cache the penalty of a state, evicting the least recently used one if the cache is full
+
+        Args:
+            state_hash (int): hash of the state
+            entry (Tuple[int, Dict[str, int]]): overall penalty and individual penalties
+        """
+        if self.max_size <= 0:
+            return
+        self.entries[state_hash] = entry
+        self.entries.move_to_end(state_hash)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the statistics of the cache
+
+        Returns:
+            Dict[str, int]: number of hits, misses and cached states
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+
+class MoveCache:
+    def __init__(self, shared: Union["MoveCache", None] = None):
+        """Initialize the MoveCache object, which keeps the penalty increase of the evaluated moves
+        across iterations, together with the resources each of them depends on
+
+        A resource is a tuple ("room", day, room), ("ot", day, operating theater) or ("surgeon", day, surgeon).
+        When a move is committed, only the cached moves depending on the resources it changes are invalidated.
+
+        Args:
+            shared (Union[MoveCache, None], optional): cache whose moves are also read, e.g. the cache of the hospital for the cache of a worker thread. It must not change while this cache is used, and the moves evaluated meanwhile are handed back with merge. Defaults to None.
+        """
+        self.shared = shared
+        self.deltas: Dict[Hashable, float] = {}
+        # Moves whose evaluation was stopped by a bound, whose penalty increase is only a lower bound
+        self.lower_bounds: Set[Hashable] = set()
+        # For each resource, keep track of the cached moves that depend on it
+        self.dependents: defaultdict[Tuple[str, int, int], Set[Hashable]] = defaultdict(
+            set
+        )
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Union[float, None]:
+        """Return the penalty increase of a move, if cached
+
+        Args:
+            key (Hashable): key of the move
+
+        Returns:
+            Union[float, None]: penalty increase (inf if the move is infeasible), None if the move is not cached
+        """
+        delta = self.deltas.get(key)
+        if delta is None and self.shared is not None:
+            delta = self.shared.deltas.get(key)
+        if delta is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return delta
+
+    def is_exact(self, key: Hashable) -> bool:
+        """Check whether the cached penalty increase of a move is exact or only a lower bound
+
+        Args:
+            key (Hashable): key of the move
+
+        Returns:
+            bool: True if the penalty increase is exact, False otherwise
+        """
+        if key not in self.deltas and self.shared is not None:
+            return self.shared.is_exact(key)
+        return key not in self.lower_bounds
+
+    def put(
+        self,
+        key: Hashable,
+        delta: float,
+        footprint: Set[Tuple[str, int, int]],
+        exact: bool = True,
+    ):
+        """Cache the penalty increase of a move
+
+        Args:
+            key (Hashable): key of the move
+            delta (float): penalty increase (inf if the move is infeasible)
+            footprint (Set[Tuple[str, int, int]]): resources the penalty increase depends on
+            exact (bool, optional): False if the penalty increase is only a lower bound. Defaults to True.
+        """
+        self.deltas[key] = delta
+        if exact:
+            self.lower_bounds.discard(key)
+        else:
+            self.lower_bounds.add(key)
+        for resource in footprint:
+            self.dependents[resource].add(key)
+
+    def invalidate(self, footprint: Set[Tuple[str, int, int]]):
+        """Remove the moves depending on any of the given resources
+
+        Args:
+            footprint (Set[Tuple[str, int, int]]): resources that have changed
+        """
+        for resource in footprint:
+            for key in self.dependents.pop(resource, ()):
+                self.lower_bounds.discard(key)
+                if self.deltas.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def merge(self, other: "MoveCache"):
+        """Move the cached moves of another cache into this one, e.g. the ones of a worker thread
+
+        Args:
+            other (MoveCache): cache to empty
+        """
+        self.deltas.update(other.deltas)
+        self.lower_bounds.difference_update(other.deltas)
+        self.lower_bounds.update(other.lower_bounds)
+        for resource, keys in other.dependents.items():
+            self.dependents[resource] |= keys
+        self.hits += other.hits
+        self.misses += other.misses
+        other.clear()
+        other.hits = 0
+        other.misses = 0
+
+    def clear(self):
+        """Remove all the cached moves"""
+        self.deltas.clear()
+        self.lower_bounds.clear()
+        self.dependents.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the statistics of the cache
+
+        Returns:
+            Dict[str, int]: number of hits, misses, invalidated and cached moves
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self.deltas),
+        }
+
+
 class PAS:
     def __init__(
         self,
@@ -713,6 +1097,8 @@ class PAS:
         days: int,
         rooms: int,
         patients: int,
+        age_groups: int,
+        capacities: NDArray,
     ):
         """Initialize the Patient Admission Scheduling (PAS) object
 
@@ -721,9 +1107,32 @@ class PAS:
             days (int): number of days
             rooms (int): number of rooms
             patients (int): number of patients
+            age_groups (int): number of distinct age groups
+            capacities (NDArray): capacity of each room
         """
         # For every day, keep track of the patients assigned to each room
         self.pas_matrix = np.zeros((days, rooms, patients), dtype=bool)
+        # Occupants never move: for every day, keep track of their number, gender and age range in each room
+        self.occupancy_baseline = np.zeros((days, rooms), dtype=int)
+        self.gender_baseline = np.full((days, rooms), "", dtype=object)
+        self.age_baseline = np.zeros((days, rooms, age_groups), dtype=int)
+        # For every day, keep track of the number of people and of their gender in each room ("" if empty)
+        self.occupancy = np.zeros((days, rooms), dtype=int)
+        self.room_gender = np.full((days, rooms), "", dtype=object)
+        # For every day, keep track of how many people of each age group are in each room
+        self.age_histogram = np.zeros((days, rooms, age_groups), dtype=int)
+        # For every day, keep track of the rooms that cannot host any other patient
+        self.capacities = capacities
+        self.room_full = np.zeros((days, rooms), dtype=bool)
+        # Keep track of the scheduled patients
+        self.scheduled = np.zeros(patients, dtype=bool)
+        # For every day, keep track of how many unscheduled patients could stay in each room
+        self.admission_windows = np.zeros((patients, days, rooms), dtype=bool)
+        self.admission_demand = np.zeros((days, rooms), dtype=int)
+        # Zobrist keys of the admission day and room of each patient, and hash of the current state
+        self.day_keys = zobrist_keys((patients, days), 1)
+        self.room_keys = zobrist_keys((patients, rooms), 2)
+        self.state_hash = 0
         self.indexer = indexer
 
     def print(self):
@@ -739,28 +1148,77 @@ class PAS:
                     )
             print()
 
-    def save(self) -> NDArray:
+    def save(
+        self,
+    ) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, int]:
         """Save the current status of the PAS problem
 
         Returns:
-            NDArray: PAS matrix
+            Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, int]: PAS matrix, room occupancy, room gender, age histogram, full rooms mask, scheduled patients mask, admission demand, state hash
         """
         self.pas_matrix_copy = copy.deepcopy(self.pas_matrix)
-        return self.pas_matrix_copy
+        self.occupancy_copy = copy.deepcopy(self.occupancy)
+        self.room_gender_copy = copy.deepcopy(self.room_gender)
+        self.age_histogram_copy = copy.deepcopy(self.age_histogram)
+        self.room_full_copy = copy.deepcopy(self.room_full)
+        self.scheduled_copy = copy.deepcopy(self.scheduled)
+        self.admission_demand_copy = copy.deepcopy(self.admission_demand)
+        self.state_hash_copy = self.state_hash
+        return (
+            self.pas_matrix_copy,
+            self.occupancy_copy,
+            self.room_gender_copy,
+            self.age_histogram_copy,
+            self.room_full_copy,
+            self.scheduled_copy,
+            self.admission_demand_copy,
+            self.state_hash_copy,
+        )
 
-    def restore(self, pas_matrix: NDArray = None):
+    def restore(
+        self,
+        pas_matrix: NDArray = None,
+        occupancy: NDArray = None,
+        room_gender: NDArray = None,
+        age_histogram: NDArray = None,
+        room_full: NDArray = None,
+        scheduled: NDArray = None,
+        admission_demand: NDArray = None,
+        state_hash: int = None,
+    ):
         """Restore the PAS problem to the previous status
 
         Args:
-            pas_matrix (NDArray): PAS matrix
+            pas_matrix (NDArray, optional): PAS matrix. Defaults to None.
+            occupancy (NDArray, optional): room occupancy. Defaults to None.
+            room_gender (NDArray, optional): room gender. Defaults to None.
+            age_histogram (NDArray, optional): age histogram. Defaults to None.
+            room_full (NDArray, optional): full rooms mask. Defaults to None.
+            scheduled (NDArray, optional): scheduled patients mask. Defaults to None.
+            admission_demand (NDArray, optional): admission demand. Defaults to None.
+            state_hash (int, optional): state hash. Defaults to None.
         """
         if pas_matrix is not None:
             self.pas_matrix = copy.deepcopy(pas_matrix)
+            self.occupancy = copy.deepcopy(occupancy)
+            self.room_gender = copy.deepcopy(room_gender)
+            self.age_histogram = copy.deepcopy(age_histogram)
+            self.room_full = copy.deepcopy(room_full)
+            self.scheduled = copy.deepcopy(scheduled)
+            self.admission_demand = copy.deepcopy(admission_demand)
+            self.state_hash = state_hash
         else:
             self.pas_matrix = copy.deepcopy(self.pas_matrix_copy)
+            self.occupancy = copy.deepcopy(self.occupancy_copy)
+            self.room_gender = copy.deepcopy(self.room_gender_copy)
+            self.age_histogram = copy.deepcopy(self.age_histogram_copy)
+            self.room_full = copy.deepcopy(self.room_full_copy)
+            self.scheduled = copy.deepcopy(self.scheduled_copy)
+            self.admission_demand = copy.deepcopy(self.admission_demand_copy)
+            self.state_hash = self.state_hash_copy
 
     def add_occupants(self, occupants: NDArray):
-        """Add occupants to the PAS matrix
+        """Add occupants to the PAS baseline arrays
 
         Args:
             occupants (NDArray): array of occupants
@@ -772,17 +1230,32 @@ class PAS:
             if not isinstance(occupant, Occupant):
                 raise ValueError("Occupant is not an instance of Occupant")
 
-            occupant_index = self.indexer.reverse_lookup("occupants", occupant.id)
             room_index = self.indexer.reverse_lookup("rooms", occupant.room.id)
-            coordinates = (
-                np.arange(0, occupant.length_of_stay),
-                room_index,
-                occupant_index,
-            )
-            self.pas_matrix[coordinates] = True
+            coordinates = (np.arange(0, occupant.length_of_stay), room_index)
+            self.occupancy_baseline[coordinates] += 1
+            self.gender_baseline[coordinates] = occupant.gender
+            self.age_baseline[(*coordinates, occupant.age_group)] += 1
+        self.occupancy = self.occupancy_baseline.copy()
+        self.room_gender = self.gender_baseline.copy()
+        self.age_histogram = self.age_baseline.copy()
+        self.room_full = self.occupancy >= self.capacities
+
+    def add_admission_windows(self, admission_windows: NDArray):
+        """Set the days and rooms where each patient could stay if admitted
+
+        Args:
+            admission_windows (NDArray): for each patient, mask of the days and rooms of the possible stays
+        """
+        self.admission_windows = admission_windows
+        self.admission_demand = admission_windows[~self.scheduled].sum(axis=0)
 
     def schedule_patient(
-        self, day: int, end_day: int, room_index: int, patient_index: int
+        self,
+        day: int,
+        end_day: int,
+        room_index: int,
+        patient: Patient,
+        patient_index: int,
     ):
         """Schedule the patient
 
@@ -790,17 +1263,45 @@ class PAS:
             day (int): start day
             end_day (int): end day
             room_index (int): index of the room
+            patient (Patient): patient object
             patient_index (int): index of the patient
         """
         self.pas_matrix[day:end_day, room_index, patient_index] = True
+        self.occupancy[day:end_day, room_index] += 1
+        self.room_gender[day:end_day, room_index] = patient.gender
+        self.age_histogram[day:end_day, room_index, patient.age_group] += 1
+        self.room_full[day:end_day, room_index] = (
+            self.occupancy[day:end_day, room_index] >= self.capacities[room_index]
+        )
+        self.scheduled[patient_index] = True
+        self.admission_demand -= self.admission_windows[patient_index]
+        self.state_hash ^= int(self.day_keys[patient_index, day]) ^ int(
+            self.room_keys[patient_index, room_index]
+        )
 
-    def unschedule_patient(self, patient_index: int):
+    def unschedule_patient(self, patient: Patient, patient_index: int):
         """Unschedule the patient
 
         Args:
+            patient (Patient): patient object
             patient_index (int): index of the patient
         """
-        self.pas_matrix[:, :, patient_index] = False
+        days, rooms = np.nonzero(self.pas_matrix[:, :, patient_index])
+        if len(days) > 0:
+            self.state_hash ^= int(self.day_keys[patient_index, days[0]]) ^ int(
+                self.room_keys[patient_index, rooms[0]]
+            )
+        self.occupancy[days, rooms] -= 1
+        self.age_histogram[days, rooms, patient.age_group] -= 1
+        self.room_gender[days, rooms] = np.where(
+            self.occupancy[days, rooms] > 0, self.room_gender[days, rooms], ""
+        )
+        self.room_full[days, rooms] = (
+            self.occupancy[days, rooms] >= self.capacities[rooms]
+        )
+        self.pas_matrix[days, rooms, patient_index] = False
+        self.scheduled[patient_index] = False
+        self.admission_demand += self.admission_windows[patient_index]
 
     def get_patient_schedule(self, patient_index: int) -> Tuple[int, int]:
         """Return the schedule of the patient
@@ -823,7 +1324,7 @@ class PAS:
         Returns:
             bool: True if the patient is already scheduled, False otherwise
         """
-        return self.pas_matrix[:, :, patient_index].any(axis=(0, 1))
+        return self.scheduled[patient_index]
 
     def check_admission_day(self, day: int, patient: Patient) -> bool:
         """Check if the patient can be scheduled on the given day
@@ -841,26 +1342,32 @@ class PAS:
         return check
 
     def check_gender(
-        self, day: int, end_day, patients: NDArray, patient: Patient, room_index: int
+        self, day: int, end_day: int, patient: Patient, room_index: int
     ) -> bool:
         """Check if all patients in the room have the same gender
 
         Args:
             day (int): start day
-            end_day (_type_): end day
-            patients (NDArray): array of patients
+            end_day (int): end day
             patient (Patient): patient object
             room_index (int): index of the room
 
         Returns:
             bool: True if all patients in the room have the same gender, False otherwise
         """
-        # Mask of patients in the same room
-        patients_same_room_mask = np.any(
-            self.pas_matrix[day:end_day, room_index, :], axis=0
-        )
-        gender_fun = np.vectorize(lambda p: p.gender == patient.gender, otypes=[bool])
-        return gender_fun(patients[patients_same_room_mask]).all()
+        room_gender = self.room_gender[day:end_day, room_index]
+        return kernels.gender_fits(room_gender, patient.gender)
+
+    def get_gender_mask(self, patient: Patient) -> NDArray:
+        """Return the mask of the days and rooms where the patient does not cause a gender mix
+
+        Args:
+            patient (Patient): patient object
+
+        Returns:
+            NDArray: mask of compatible days and rooms
+        """
+        return (self.room_gender == "") | (self.room_gender == patient.gender)
 
     def check_room_compatible(self, patient: Patient, room: Room) -> bool:
         """Check if the patient is compatible with the room
@@ -872,7 +1379,7 @@ class PAS:
         Returns:
             bool: True if the patient is compatible with the room, False otherwise
         """
-        return room.id not in patient.incompatible_rooms
+        return room.id not in patient.incompatible_room_ids
 
     def check_room_capacity(
         self, day: int, end_day: int, room_index: int, room: Room
@@ -888,10 +1395,7 @@ class PAS:
         Returns:
             bool: True if the room capacity is not exceeded, False otherwise
         """
-        n_patients_same_room: int = self.pas_matrix[day:end_day, room_index, :].sum(
-            axis=1
-        )
-        return np.all(n_patients_same_room + 1 <= room.capacity)
+        return not self.room_full[day:end_day, room_index].any()
 
     def check_room_empty(self, day: int, room_index: int) -> bool:
         """Check if the room is empty
@@ -902,7 +1406,7 @@ class PAS:
         Returns:
             bool: True if the room is empty, False otherwise
         """
-        return not self.pas_matrix[day, room_index, :].any()
+        return self.occupancy[day, room_index] == 0
 
     def get_scheduled_patients_mask(self) -> NDArray:
         """Return the mask of scheduled patients
@@ -910,7 +1414,15 @@ class PAS:
         Returns:
             NDArray: mask of scheduled patients
         """
-        return self.pas_matrix.any(axis=(0, 1))
+        return self.scheduled
+
+    def get_age_range(self) -> Tuple[NDArray, NDArray, NDArray]:
+        """Return, for every day and room, the youngest and oldest age group
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray]: minimum age group, maximum age group, mask of occupied rooms
+        """
+        return kernels.age_range(self.age_histogram)
 
     def penalty_age_mix(self, weight: int, age_groups: int) -> int:
         """Compute the penalty for age mix
@@ -922,16 +1434,23 @@ class PAS:
         Returns:
             int: penalty for age mix
         """
-        days, rooms, patients = np.nonzero(self.pas_matrix)
-        min_ages = np.zeros(self.pas_matrix.shape, dtype=int) + age_groups
-        max_ages = np.zeros(self.pas_matrix.shape, dtype=int)
-        for day, room, patient in zip(days, rooms, patients):
-            age = self.indexer.lookup("patients", patient).age_group
-            min_ages[day, room, patient] = age
-            max_ages[day, room, patient] = age
-        return (max_ages.max(axis=-1) - min_ages.min(axis=-1))[
-            min_ages.min(axis=-1) < age_groups
-        ].sum() * weight
+        min_age, max_age, occupied = self.get_age_range()
+        return (max_age - min_age)[occupied].sum() * weight
+
+    def penalty_age_deltas(self, patient: Patient) -> NDArray:
+        """Compute, for every day and room, the increase of the age mix penalty (S1) caused by the patient
+
+        Args:
+            patient (Patient): patient object
+
+        Returns:
+            NDArray: unweighted penalty increase for each day and room
+        """
+        min_age, max_age, occupied = self.get_age_range()
+        new_range = np.maximum(max_age, patient.age_group) - np.minimum(
+            min_age, patient.age_group
+        )
+        return np.where(occupied, new_range - (max_age - min_age), 0)
 
     def penalty_unscheduled(self, weight: int) -> int:
         """Compute the penalty for unscheduled patients
@@ -969,6 +1488,23 @@ class SCP:
         self.scp_matrix = np.zeros(
             (days, patients, surgeons, operating_theaters), dtype=int
         )
+        # For each day, keep track of the number of surgeries in each operating theater
+        self.ot_count = np.zeros((days, operating_theaters), dtype=int)
+        # For each day, keep track of the surgery time booked in each operating theater
+        self.ot_time = np.zeros((days, operating_theaters), dtype=int)
+        # For each day, keep track of the surgery time booked for each surgeon
+        self.surgeon_time = np.zeros((days, surgeons), dtype=int)
+        # For each day, keep track of the number of surgeries of each surgeon in each operating theater
+        self.surgeon_ot_count = np.zeros(
+            (days, surgeons, operating_theaters), dtype=int
+        )
+        # Running totals of open operating theaters, surgeon transfers and admission delay
+        self.open_ots = 0
+        self.transfers = 0
+        self.delay = 0
+        # Zobrist keys of the operating theater of each patient, and hash of the current state
+        self.ot_keys = zobrist_keys((patients, operating_theaters), 3)
+        self.state_hash = 0
         self.indexer = indexer
         self.dummy_ot = dummy_ot
 
@@ -987,25 +1523,71 @@ class SCP:
                     )
             print()
 
-    def save(self) -> NDArray:
+    def save(
+        self,
+    ) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, int, int, int, int]:
         """Save the current status of the SCP problem
 
         Returns:
-            NDArray: SCP matrix
+            Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, int, int, int, int]: SCP matrix, surgeries per operating theater, surgery time per operating theater, surgery time per surgeon, surgeries per surgeon and operating theater, open operating theaters, surgeon transfers, admission delay, state hash
         """
         self.scp_matrix_copy = copy.deepcopy(self.scp_matrix)
-        return self.scp_matrix_copy
+        self.ot_count_copy = copy.deepcopy(self.ot_count)
+        self.ot_time_copy = copy.deepcopy(self.ot_time)
+        self.surgeon_time_copy = copy.deepcopy(self.surgeon_time)
+        self.surgeon_ot_count_copy = copy.deepcopy(self.surgeon_ot_count)
+        self.totals_copy = (self.open_ots, self.transfers, self.delay, self.state_hash)
+        return (
+            self.scp_matrix_copy,
+            self.ot_count_copy,
+            self.ot_time_copy,
+            self.surgeon_time_copy,
+            self.surgeon_ot_count_copy,
+            *self.totals_copy,
+        )
 
-    def restore(self, scp_matrix: NDArray = None):
+    def restore(
+        self,
+        scp_matrix: NDArray = None,
+        ot_count: NDArray = None,
+        ot_time: NDArray = None,
+        surgeon_time: NDArray = None,
+        surgeon_ot_count: NDArray = None,
+        open_ots: int = None,
+        transfers: int = None,
+        delay: int = None,
+        state_hash: int = None,
+    ):
         """Restore the SCP problem to the previous status
 
         Args:
-            scp_matrix (NDArray): SCP matrix
+            scp_matrix (NDArray, optional): SCP matrix. Defaults to None.
+            ot_count (NDArray, optional): surgeries per operating theater. Defaults to None.
+            ot_time (NDArray, optional): surgery time per operating theater. Defaults to None.
+            surgeon_time (NDArray, optional): surgery time per surgeon. Defaults to None.
+            surgeon_ot_count (NDArray, optional): surgeries per surgeon and operating theater. Defaults to None.
+            open_ots (int, optional): open operating theaters. Defaults to None.
+            transfers (int, optional): surgeon transfers. Defaults to None.
+            delay (int, optional): admission delay. Defaults to None.
+            state_hash (int, optional): state hash. Defaults to None.
         """
         if scp_matrix is not None:
             self.scp_matrix = copy.deepcopy(scp_matrix)
+            self.ot_count = copy.deepcopy(ot_count)
+            self.ot_time = copy.deepcopy(ot_time)
+            self.surgeon_time = copy.deepcopy(surgeon_time)
+            self.surgeon_ot_count = copy.deepcopy(surgeon_ot_count)
+            self.open_ots, self.transfers, self.delay = open_ots, transfers, delay
+            self.state_hash = state_hash
         else:
             self.scp_matrix = copy.deepcopy(self.scp_matrix_copy)
+            self.ot_count = copy.deepcopy(self.ot_count_copy)
+            self.ot_time = copy.deepcopy(self.ot_time_copy)
+            self.surgeon_time = copy.deepcopy(self.surgeon_time_copy)
+            self.surgeon_ot_count = copy.deepcopy(self.surgeon_ot_count_copy)
+            self.open_ots, self.transfers, self.delay, self.state_hash = (
+                self.totals_copy
+            )
 
     def schedule_patient(
         self,
@@ -1026,15 +1608,56 @@ class SCP:
         self.scp_matrix[day, patient_index, surgeon_index, ot_index] = (
             patient.surgery_duration
         )
+        self.update_counters(day, patient, surgeon_index, ot_index, 1)
+        self.state_hash ^= int(self.ot_keys[patient_index, ot_index])
 
-    def unschedule_patient(self, patient_index: int):
+    def unschedule_patient(self, patient: Patient, patient_index: int):
         """Unschedule the patient
 
         Args:
+            patient (Patient): patient object
             patient_index (int): index of the patient
         """
+        days, surgeons, ots = np.nonzero(self.scp_matrix[:, patient_index, :, :])
+        for day, surgeon_index, ot_index in zip(days, surgeons, ots):
+            self.update_counters(day, patient, surgeon_index, ot_index, -1)
+            self.state_hash ^= int(self.ot_keys[patient_index, ot_index])
         self.scp_matrix[:, patient_index, :, :] = 0
 
+    def update_counters(
+        self,
+        day: int,
+        patient: Patient,
+        surgeon_index: int,
+        ot_index: int,
+        step: Literal[1, -1],
+    ):
+        """Update the surgery counters and the running totals of S5, S6 and S7
+
+        Args:
+            day (int): day of the surgery
+            patient (Patient): patient object
+            surgeon_index (int): index of the surgeon
+            ot_index (int): index of the operating theater
+            step (Literal[1, -1]): 1 when the surgery is added, -1 when it is removed
+        """
+        self.ot_time[day, ot_index] += step * patient.surgery_duration
+        self.surgeon_time[day, surgeon_index] += step * patient.surgery_duration
+        if ot_index < self.dummy_ot:
+            return
+        # An operating theater opens with its first surgery and closes with its last one
+        before = self.ot_count[day, ot_index]
+        self.ot_count[day, ot_index] += step
+        self.open_ots += int(self.ot_count[day, ot_index] > 0) - int(before > 0)
+
+        # A surgeon is transferred once for every operating theater after the first one
+        before = np.count_nonzero(self.surgeon_ot_count[day, surgeon_index, :])
+        self.surgeon_ot_count[day, surgeon_index, ot_index] += step
+        after = np.count_nonzero(self.surgeon_ot_count[day, surgeon_index, :])
+        self.transfers += max(after - 1, 0) - max(before - 1, 0)
+
+        self.delay += step * max(day - patient.surgery_release_day, 0)
+
     def get_patient_schedule(self, patient_index: int) -> Tuple[int, int, int]:
         """Return the schedule of the patient
 
@@ -1061,12 +1684,28 @@ class SCP:
         Returns:
             bool: True if the surgeon is available, False otherwise
         """
-        surgeries_duration = self.scp_matrix[day, :, surgeon_index, :].sum(axis=(0, 1))
         return (
-            surgeries_duration + patient.surgery_duration
+            self.surgeon_time[day, surgeon_index] + patient.surgery_duration
             <= surgeon.max_surgery_time[day]
         )
 
+    def get_surgeon_overtime_mask(
+        self, surgeon: Surgeon, surgeon_index: int, patient: Patient
+    ) -> NDArray:
+        """Return the mask of the days when the surgeon is available for the surgery
+
+        Args:
+            surgeon (Surgeon): surgeon object
+            surgeon_index (int): index of the surgeon
+            patient (Patient): patient object
+
+        Returns:
+            NDArray: mask of the days when the surgeon is available
+        """
+        return self.surgeon_time[
+            :, surgeon_index
+        ] + patient.surgery_duration <= np.array(surgeon.max_surgery_time)
+
     def check_operating_theater_overtime(
         self,
         day: int,
@@ -1085,14 +1724,51 @@ class SCP:
         Returns:
             bool: True if the operating theater is available, False otherwise
         """
-        surgeries_duration = self.scp_matrix[day, :, :, operating_theater_index].sum(
-            axis=(0, 1)
-        )
         return (
-            surgeries_duration + patient.surgery_duration
+            self.ot_time[day, operating_theater_index] + patient.surgery_duration
             <= operating_theater.availability[day]
         )
 
+    def check_operating_theaters_overtime(
+        self, days: NDArray, availability: NDArray, patient: Patient
+    ) -> NDArray:
+        """Check which operating theaters are available for the surgery on each of the given days
+
+        Args:
+            days (NDArray): days of the surgery
+            availability (NDArray): availability of each operating theater on the given days, in minutes
+            patient (Patient): patient object
+
+        Returns:
+            NDArray: mask of the operating theaters that are available, for each day
+        """
+        return self.ot_time[days] + patient.surgery_duration <= availability
+
+    def penalty_ot_deltas(
+        self,
+        days: NDArray,
+        surgeon_index: int,
+        open_ot_weight: int,
+        transfer_weight: int,
+    ) -> NDArray:
+        """Compute, for each day and operating theater, the increase of the open operating theater (S5) and surgeon transfer (S6) penalties caused by one more surgery
+
+        Args:
+            days (NDArray): days of the surgery
+            surgeon_index (int): index of the surgeon
+            open_ot_weight (int): weight of the open operating theater penalty
+            transfer_weight (int): weight of the surgeon transfer penalty
+
+        Returns:
+            NDArray: penalty increase for each day and operating theater
+        """
+        opened = self.ot_count[days] == 0
+        used = self.surgeon_ot_count[days, surgeon_index] > 0
+        transferred = ~used & used.any(axis=-1, keepdims=True)
+        delta = opened * open_ot_weight + transferred * transfer_weight
+        delta[..., : self.dummy_ot] = 0
+        return delta
+
     def penalty_open_ot(self, weight: int) -> int:
         """Compute the penalty for open operating theaters
 
@@ -1102,10 +1778,7 @@ class SCP:
         Returns:
             int: penalty for open operating theaters
         """
-        return (
-            self.scp_matrix[:, :, :, self.dummy_ot :].any(axis=(1, 2)).sum(axis=(0, 1))
-            * weight
-        )
+        return self.open_ots * weight
 
     def penalty_transfer(self, weight: int) -> int:
         """Compute the penalty for surgeon transfers
@@ -1116,10 +1789,7 @@ class SCP:
         Returns:
             int: penalty for surgeon transfers
         """
-        different_ots = (
-            self.scp_matrix[:, :, :, self.dummy_ot :].any(axis=1).sum(axis=-1)
-        )
-        return (different_ots[different_ots > 0] - 1).sum() * weight
+        return self.transfers * weight
 
     def penalty_delay(self, weight: int) -> int:
         """Compute the penalty for patient delays
@@ -1130,14 +1800,7 @@ class SCP:
         Returns:
             int: penalty for patient delays
         """
-        penalty = 0
-        days, patients, _, _ = np.nonzero(self.scp_matrix[:, :, :, self.dummy_ot :])
-        for day, patient in zip(days, patients):
-            release_day = self.indexer.lookup("patients", patient).surgery_release_day
-            if (diff := day - release_day) > 0:
-                penalty += diff
-
-        return penalty * weight
+        return self.delay * weight
 
 
 class NRA:
@@ -1149,6 +1812,7 @@ class NRA:
         rooms: int,
         nurses: int,
         patients: int,
+        skill_levels: int,
     ):
         """Initialize the Nurse Rostering Assignment (NRA) object
 
@@ -1159,6 +1823,7 @@ class NRA:
             rooms (int): number of rooms
             nurses (int): number of nurses
             patients (int): number of patients
+            skill_levels (int): number of skill levels
         """
         self.days = days
         self.shifts = shifts
@@ -1166,10 +1831,26 @@ class NRA:
         self.nra_matrix = np.zeros((days * shifts, rooms, nurses), dtype=bool)
         # For each shift, keep track of the patient assigned to each room
         self.patient_matrix = np.zeros((days * shifts, rooms, patients), dtype=bool)
-        # For each shift, keep track of the workload produced by each patient in each room
-        self.workload_matrix = np.zeros((days * shifts, rooms, patients), dtype=int)
-        # For each shift, keep track of the skill level required by each patient in each room
-        self.skill_matrix = np.zeros((days * shifts, rooms, patients), dtype=int)
+        # Occupants never move: for each shift, keep track of their total workload and maximum skill level in each room
+        self.workload_baseline = np.zeros((days * shifts, rooms), dtype=int)
+        self.skill_baseline = np.zeros((days * shifts, rooms), dtype=int)
+        # For each shift, keep track of the total workload produced in each room
+        self.workload_sum = np.zeros((days * shifts, rooms), dtype=int)
+        # For each shift, keep track of how many people require each skill level in each room
+        self.skill_histogram = np.zeros((days * shifts, rooms, skill_levels), dtype=int)
+        # For each shift, keep track of the maximum skill level required in each room
+        self.skill_max = np.zeros((days * shifts, rooms), dtype=int)
+        # For each shift, keep track of the number of nurses assigned to each room
+        self.coverage = np.zeros((days * shifts, rooms), dtype=int)
+        # For each day, keep track of the rooms that are covered in all shifts
+        self.room_covered = np.zeros((days, rooms), dtype=bool)
+        # For each shift, keep track of the nurse covering each room (-1 if uncovered)
+        self.room_nurse = np.full((days * shifts, rooms), -1, dtype=int)
+        # For each shift, keep track of the rooms whose nurse is under-skilled or overloaded
+        self.hot_spots = np.zeros((days * shifts, rooms), dtype=bool)
+        # Zobrist keys of each nurse assignment, and hash of the current state
+        self.nurse_keys = zobrist_keys((days * shifts, rooms, nurses), 4)
+        self.state_hash = 0
         self.indexer = indexer
 
     def print(self):
@@ -1185,56 +1866,100 @@ class NRA:
                     )
             print()
 
-    def save(self) -> Tuple[NDArray, NDArray, NDArray, NDArray]:
+    def save(
+        self,
+    ) -> Tuple[
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        NDArray,
+        int,
+    ]:
         """Save the current status of the NRA problem
 
         Returns:
-            Tuple[NDArray, NDArray, NDArray, NDArray]: NRA matrix, workload matrix, skill matrix, patient matrix
+            Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, int]: NRA matrix, patient matrix, workload sums, skill histogram, maximum skill levels, room coverage, covered rooms mask, room nurses, hot spots, state hash
         """
         self.nra_matrix_copy = copy.deepcopy(self.nra_matrix)
-        self.workload_matrix_copy = copy.deepcopy(self.workload_matrix)
-        self.skill_matrix_copy = copy.deepcopy(self.skill_matrix)
         self.patient_matrix_copy = copy.deepcopy(self.patient_matrix)
+        self.workload_sum_copy = copy.deepcopy(self.workload_sum)
+        self.skill_histogram_copy = copy.deepcopy(self.skill_histogram)
+        self.skill_max_copy = copy.deepcopy(self.skill_max)
+        self.coverage_copy = copy.deepcopy(self.coverage)
+        self.room_covered_copy = copy.deepcopy(self.room_covered)
+        self.room_nurse_copy = copy.deepcopy(self.room_nurse)
+        self.hot_spots_copy = copy.deepcopy(self.hot_spots)
+        self.state_hash_copy = self.state_hash
         return (
             self.nra_matrix_copy,
-            self.workload_matrix_copy,
-            self.skill_matrix_copy,
             self.patient_matrix_copy,
+            self.workload_sum_copy,
+            self.skill_histogram_copy,
+            self.skill_max_copy,
+            self.coverage_copy,
+            self.room_covered_copy,
+            self.room_nurse_copy,
+            self.hot_spots_copy,
+            self.state_hash_copy,
         )
 
     def restore(
         self,
         nra_matrix: NDArray = None,
-        workload_matrix: NDArray = None,
-        skill_matrix: NDArray = None,
         patient_matrix: NDArray = None,
+        workload_sum: NDArray = None,
+        skill_histogram: NDArray = None,
+        skill_max: NDArray = None,
+        coverage: NDArray = None,
+        room_covered: NDArray = None,
+        room_nurse: NDArray = None,
+        hot_spots: NDArray = None,
+        state_hash: int = None,
     ):
         """Restore the NRA problem to the previous status
 
         Args:
             nra_matrix (NDArray, optional): NRA matrix. Defaults to None.
-            workload_matrix (NDArray, optional): workload matrix. Defaults to None.
-            skill_matrix (NDArray, optional): skill matrix. Defaults to None.
             patient_matrix (NDArray, optional): patient matrix. Defaults to None.
+            workload_sum (NDArray, optional): workload sums. Defaults to None.
+            skill_histogram (NDArray, optional): skill histogram. Defaults to None.
+            skill_max (NDArray, optional): maximum skill levels. Defaults to None.
+            coverage (NDArray, optional): room coverage. Defaults to None.
+            room_covered (NDArray, optional): covered rooms mask. Defaults to None.
+            room_nurse (NDArray, optional): room nurses. Defaults to None.
+            hot_spots (NDArray, optional): hot spots mask. Defaults to None.
+            state_hash (int, optional): state hash. Defaults to None.
         """
-        if (
-            nra_matrix is not None
-            and workload_matrix is not None
-            and skill_matrix is not None
-            and patient_matrix is not None
-        ):
+        if nra_matrix is not None:
             self.nra_matrix = copy.deepcopy(nra_matrix)
-            self.workload_matrix = copy.deepcopy(workload_matrix)
-            self.skill_matrix = copy.deepcopy(skill_matrix)
             self.patient_matrix = copy.deepcopy(patient_matrix)
+            self.workload_sum = copy.deepcopy(workload_sum)
+            self.skill_histogram = copy.deepcopy(skill_histogram)
+            self.skill_max = copy.deepcopy(skill_max)
+            self.coverage = copy.deepcopy(coverage)
+            self.room_covered = copy.deepcopy(room_covered)
+            self.room_nurse = copy.deepcopy(room_nurse)
+            self.hot_spots = copy.deepcopy(hot_spots)
+            self.state_hash = state_hash
         else:
             self.nra_matrix = copy.deepcopy(self.nra_matrix_copy)
-            self.workload_matrix = copy.deepcopy(self.workload_matrix_copy)
-            self.skill_matrix = copy.deepcopy(self.skill_matrix_copy)
             self.patient_matrix = copy.deepcopy(self.patient_matrix_copy)
+            self.workload_sum = copy.deepcopy(self.workload_sum_copy)
+            self.skill_histogram = copy.deepcopy(self.skill_histogram_copy)
+            self.skill_max = copy.deepcopy(self.skill_max_copy)
+            self.coverage = copy.deepcopy(self.coverage_copy)
+            self.room_covered = copy.deepcopy(self.room_covered_copy)
+            self.room_nurse = copy.deepcopy(self.room_nurse_copy)
+            self.hot_spots = copy.deepcopy(self.hot_spots_copy)
+            self.state_hash = self.state_hash_copy
 
     def add_occupants(self, occupants: NDArray):
-        """Add occupants to the NRA matrix
+        """Add occupants to the NRA baseline arrays
 
         Args:
             occupants (NDArray): array of occupants
@@ -1246,15 +1971,44 @@ class NRA:
             if not isinstance(occupant, Occupant):
                 raise ValueError("Occupant is not an instance of Occupant")
 
-            occupant_index = self.indexer.reverse_lookup("occupants", occupant.id)
             room_index = self.indexer.reverse_lookup("rooms", occupant.room.id)
             coordinates = (
                 np.arange(0, occupant.length_of_stay * self.shifts),
                 room_index,
-                occupant_index,
             )
-            self.workload_matrix[coordinates] = np.array(occupant.workload_produced)
-            self.skill_matrix[coordinates] = np.array(occupant.skill_level_required)
+            self.workload_baseline[coordinates] += np.array(occupant.workload_produced)
+            self.skill_baseline[coordinates] = np.maximum(
+                self.skill_baseline[coordinates],
+                np.array(occupant.skill_level_required),
+            )
+            self.skill_histogram[
+                (*coordinates, np.array(occupant.skill_level_required))
+            ] += 1
+        self.workload_sum = self.workload_baseline.copy()
+        self.skill_max = self.skill_baseline.copy()
+
+    def add_nurses(self, nurses: NDArray):
+        """Store the skill level, the working shifts and the maximum workload of the nurses
+
+        Args:
+            nurses (NDArray): array of nurses
+        """
+        self.nurse_skills = np.zeros(len(nurses), dtype=int)
+        # For each shift, maximum workload of each nurse (0 if the nurse is not working)
+        self.nurse_max_loads = np.zeros(
+            (self.days * self.shifts, len(nurses)), dtype=int
+        )
+        # For each shift, keep track of the nurses that are working
+        self.shift_nurses: List[List[int]] = [
+            [] for _ in range(self.days * self.shifts)
+        ]
+        for nurse in nurses:
+            nurse: Nurse
+            nurse_index = self.indexer.reverse_lookup("nurses", nurse.id)
+            self.nurse_skills[nurse_index] = nurse.skill_level
+            for shift, working_shift in nurse.working_shifts.items():
+                self.nurse_max_loads[shift, nurse_index] = working_shift.max_load
+                self.shift_nurses[shift].append(nurse_index)
 
     def schedule_patient(
         self,
@@ -1273,28 +2027,42 @@ class NRA:
             patient (Patient): patient object
             patient_index (int): index of the patient
         """
-        coordinates = (
-            np.arange(day * self.shifts, end_day * self.shifts),
-            room_index,
-            patient_index,
-        )
-        self.workload_matrix[coordinates] = np.array(
-            patient.workload_produced[: (end_day - day) * self.shifts]
+        shifts = np.arange(day * self.shifts, end_day * self.shifts)
+        skill_levels = np.array(patient.skill_level_required[: len(shifts)])
+        self.workload_sum[shifts, room_index] += np.array(
+            patient.workload_produced[: len(shifts)]
         )
-        self.skill_matrix[coordinates] = np.array(
-            patient.skill_level_required[: (end_day - day) * self.shifts]
+        self.skill_histogram[shifts, room_index, skill_levels] += 1
+        self.skill_max[shifts, room_index] = np.maximum(
+            self.skill_max[shifts, room_index], skill_levels
         )
-        self.patient_matrix[coordinates] = True
+        self.patient_matrix[shifts, room_index, patient_index] = True
+        self.update_hot_spots(shifts, room_index)
 
-    def unschedule_patient(self, patient_index: int):
+    def unschedule_patient(self, patient: Patient, patient_index: int):
         """Unschedule the patient
 
         Args:
+            patient (Patient): patient object
             patient_index (int): index of the patient
         """
-        self.workload_matrix[:, :, patient_index] = 0
-        self.skill_matrix[:, :, patient_index] = 0
-        self.patient_matrix[:, :, patient_index] = False
+        shifts, rooms = np.nonzero(self.patient_matrix[:, :, patient_index])
+        if len(shifts) == 0:
+            return
+        skill_levels = np.array(patient.skill_level_required[: len(shifts)])
+        self.workload_sum[shifts, rooms] -= np.array(
+            patient.workload_produced[: len(shifts)]
+        )
+        self.skill_histogram[shifts, rooms, skill_levels] -= 1
+        # The maximum is recomputed only where the patient was staying
+        histogram = self.skill_histogram[shifts, rooms, :] > 0
+        self.skill_max[shifts, rooms] = np.where(
+            histogram.any(axis=-1),
+            histogram.shape[-1] - 1 - histogram[:, ::-1].argmax(axis=-1),
+            0,
+        )
+        self.patient_matrix[shifts, rooms, patient_index] = False
+        self.update_hot_spots(shifts, rooms)
 
     def assign_nurse(self, shift: int, room_index: int, nurse_index: int):
         """Assign the nurse to the room
@@ -1305,6 +2073,10 @@ class NRA:
             nurse_index (int): index of the nurse
         """
         self.nra_matrix[shift, room_index, nurse_index] = True
+        self.room_nurse[shift, room_index] = nurse_index
+        self.update_coverage(shift, room_index, 1)
+        self.update_hot_spots(shift, room_index)
+        self.state_hash ^= int(self.nurse_keys[shift, room_index, nurse_index])
 
     def unassign_nurse(self, shift: int, room_index: int, nurse_index: int):
         """Unassign the nurse from the room
@@ -1315,6 +2087,39 @@ class NRA:
             nurse_index (int): index of the nurse
         """
         self.nra_matrix[shift, room_index, nurse_index] = False
+        self.room_nurse[shift, room_index] = -1
+        self.update_coverage(shift, room_index, -1)
+        self.update_hot_spots(shift, room_index)
+        self.state_hash ^= int(self.nurse_keys[shift, room_index, nurse_index])
+
+    def update_coverage(self, shift: int, room_index: int, step: Literal[1, -1]):
+        """Update the coverage of the room and the covered rooms mask of the corresponding day
+
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room
+            step (Literal[1, -1]): 1 when a nurse is assigned, -1 when it is unassigned
+        """
+        self.coverage[shift, room_index] += step
+        day = shift // self.shifts
+        self.room_covered[day, room_index] = (
+            self.coverage[day * self.shifts : (day + 1) * self.shifts, room_index] > 0
+        ).all()
+
+    def update_hot_spots(self, shifts: Union[int, NDArray], rooms: Union[int, NDArray]):
+        """Update the hot spots mask, i.e. the covered rooms whose nurse has a lower skill level than
+        required (S2) or a lower maximum workload than the one produced (S4), on the given shifts
+
+        Args:
+            shifts (Union[int, NDArray]): indices of the shifts
+            rooms (Union[int, NDArray]): indices of the rooms
+        """
+        nurses = self.room_nurse[shifts, rooms]
+        under_skilled = self.skill_max[shifts, rooms] > self.nurse_skills[nurses]
+        overloaded = (
+            self.workload_sum[shifts, rooms] > self.nurse_max_loads[shifts, nurses]
+        )
+        self.hot_spots[shifts, rooms] = (nurses >= 0) & (under_skilled | overloaded)
 
     def get_nurse_schedule(self, nurse_index: int) -> Tuple[List[int], List[int]]:
         """Return the schedule of the nurse
@@ -1338,7 +2143,7 @@ class NRA:
         Returns:
             bool: True if the room is covered by any nurse, False otherwise
         """
-        return self.nra_matrix[shift, room_index, :].any()
+        return self.coverage[shift, room_index] > 0
 
     def check_room_covered_day(self, day: int, end_day: int, room_index: int) -> bool:
         """Check if the room is covered for all shifts by any nurse
@@ -1351,15 +2156,7 @@ class NRA:
         Returns:
             bool: True if the room is covered for all shifts by any nurse, False otherwise
         """
-        return (
-            self.nra_matrix[
-                day * self.shifts : end_day * self.shifts,
-                room_index,
-                :,
-            ]
-            .any(axis=1)
-            .all()
-        )
+        return self.room_covered[day:end_day, room_index].all()
 
     def check_already_assigned(
         self, nurse_index: int, shift: int, room_index: int
@@ -1386,13 +2183,9 @@ class NRA:
         Returns:
             int: penalty for skill level
         """
-        penalty = 0
-        max_skill_level_per_room = self.skill_matrix.max(axis=-1)
-        shifts, rooms, nurses = np.nonzero(self.nra_matrix)
-        for shift, room, nurse in zip(shifts, rooms, nurses):
-            nurse_skill = self.indexer.lookup("nurses", nurse).skill_level
-            if (diff := max_skill_level_per_room[shift, room] - nurse_skill) > 0:
-                penalty += diff
+        penalty = kernels.skill_deficit(
+            self.nra_matrix, self.skill_max, self.nurse_skills
+        )
         return penalty * weight
 
     def penalty_continuity(self, weight: int) -> int:
@@ -1404,13 +2197,7 @@ class NRA:
         Returns:
             int: penalty for continuity of care
         """
-
-        penalty = 0
-        for patient in range(self.patient_matrix.shape[-1]):
-            if not self.patient_matrix[:, :, patient].any(axis=(0, 1)):
-                continue
-            shifts, rooms = np.nonzero(self.patient_matrix[:, :, patient])
-            penalty += self.nra_matrix[shifts, rooms[0], :].any(axis=0).sum()
+        penalty = kernels.continuity(self.nra_matrix, self.patient_matrix)
         return penalty * weight
 
     def penalty_workload(self, weight: int) -> int:
@@ -1422,42 +2209,131 @@ class NRA:
         Returns:
             int: penalty for workload
         """
-        penalty = 0
-        total_workload_per_room = self.workload_matrix.sum(axis=-1)
-        shifts, rooms, nurses = np.nonzero(self.nra_matrix)
-        for shift, room, nurse in zip(shifts, rooms, nurses):
-            nurse_workload = self.indexer.lookup("nurses", nurse).maximum_workload(
-                shift
-            )
-            if (diff := total_workload_per_room[shift, room] - nurse_workload) > 0:
-                penalty += diff
-
+        penalty = kernels.excess_workload(
+            self.nra_matrix, self.workload_sum, self.nurse_max_loads
+        )
         return penalty * weight
 
+    def penalty_deltas(
+        self, patient: Patient, days: NDArray, end_days: NDArray, rooms: NDArray
+    ) -> Tuple[NDArray, NDArray, NDArray]:
+        """Compute, for every candidate admission day and room, the increase of the skill level (S2),
+        continuity of care (S3) and workload (S4) penalties caused by the patient
+
+        A room is covered by at most one nurse per shift, since assign_nurse refuses covered rooms.
+
+        Args:
+            patient (Patient): patient object
+            days (NDArray): candidate admission days
+            end_days (NDArray): end day of the stay for each admission day
+            rooms (NDArray): candidate rooms
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray]: unweighted skill, continuity and workload penalty increases, for each day and room
+        """
+        # Shifts of the stay window for each admission day; the ones past the horizon are masked out
+        shifts = days[:, None] * self.shifts + np.arange(
+            patient.length_of_stay * self.shifts
+        )
+        valid = shifts < end_days[:, None] * self.shifts
+        shifts = np.where(valid, shifts, 0)[:, :, None]
+        nurses = self.room_nurse[shifts, rooms]
+        covered = valid[:, :, None] & (nurses >= 0)
+
+        skill_level = np.array(patient.skill_level_required)[None, :, None]
+        old_skill = self.skill_max[shifts, rooms]
+        nurse_skill = self.nurse_skills[nurses]
+        skill_delta = np.maximum(
+            np.maximum(old_skill, skill_level) - nurse_skill, 0
+        ) - np.maximum(old_skill - nurse_skill, 0)
+
+        workload = np.array(patient.workload_produced)[None, :, None]
+        old_workload = self.workload_sum[shifts, rooms]
+        max_load = self.nurse_max_loads[shifts, nurses]
+        workload_delta = np.maximum(old_workload + workload - max_load, 0) - np.maximum(
+            old_workload - max_load, 0
+        )
+
+        # Distinct nurses along the stay window; masked shifts repeat the first nurse
+        nurses = np.sort(np.where(covered, nurses, nurses[:, :1, :]), axis=1)
+        continuity = 1 + (np.diff(nurses, axis=1) != 0).sum(axis=1)
+
+        return (
+            (skill_delta * covered).sum(axis=1),
+            continuity,
+            (workload_delta * covered).sum(axis=1),
+        )
+
+    def penalty_reassign_deltas(
+        self, shift: int, room_index: int, new_nurses: NDArray
+    ) -> Tuple[NDArray, NDArray, NDArray]:
+        """Compute the increase of the skill level (S2), continuity of care (S3) and workload (S4)
+        penalties caused by handing a covered room to each of the given nurses
+
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room
+            new_nurses (NDArray): indices of the nurses that could take over the room
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray]: unweighted skill, continuity and workload penalty increases, for each nurse
+        """
+        nurse = self.room_nurse[shift, room_index]
+        skill_max = self.skill_max[shift, room_index]
+        skill_delta = np.maximum(skill_max - self.nurse_skills[new_nurses], 0) - max(
+            skill_max - self.nurse_skills[nurse], 0
+        )
+        workload = self.workload_sum[shift, room_index]
+        max_loads = self.nurse_max_loads[shift]
+        workload_delta = np.maximum(workload - max_loads[new_nurses], 0) - max(
+            workload - max_loads[nurse], 0
+        )
+
+        # Each patient in the room loses the nurse and gains the new one, unless they already see them
+        continuity = np.zeros(len(new_nurses), dtype=int)
+        for patient_index in np.nonzero(self.patient_matrix[shift, room_index])[0]:
+            shifts = np.nonzero(self.patient_matrix[:, room_index, patient_index])[0]
+            others = self.room_nurse[shifts[shifts != shift], room_index]
+            continuity += ~np.isin(new_nurses, others)
+            continuity -= nurse not in others
+        return skill_delta, continuity, workload_delta
+
 
 class Hospital:
-    def __init__(self, fp: str):
+    def __init__(self, fp: str, cache_size: int = 65536):
         """Initialize the Hospital object
 
         Args:
             fp (str): file path to the JSON file containing the hospital data
+            cache_size (int, optional): maximum number of states whose penalty is cached (0 disables the cache). Defaults to 65536.
         """
         self.indexer = Indexer()
         self.logger = Logger()
+        self.penalty_cache = PenaltyCache(cache_size)
+        self.move_cache = MoveCache()
+        # Component that stopped the last bounded penalty computation, and cutoffs per component
+        self.cutoff_component: Union[str, None] = None
+        self.cutoff_counts: Dict[str, int] = defaultdict(int)
         self.loader = Loader(fp, self.indexer)
+        self.file_path = fp
 
         self.days = self.loader.get_days()
         self.skill_levels = self.loader.get_skill_levels()
         self.shift_types = self.loader.get_shift_types()
         self.age_groups = self.loader.get_age_groups()
         self.weights = self.loader.get_weights()
+        self.build_penalty_components()
 
         self.rooms = self.loader.load_rooms()
         self.operating_theaters = self.loader.load_operating_theaters()
         self.surgeons = self.loader.load_surgeons()
         self.occupants = self.loader.load_occupants()
-        self.patients = self.loader.load_patients(self.occupants)
+        self.patients = self.loader.load_patients()
         self.nurses = self.loader.load_nurses()
+        # For each day, availability of each operating theater
+        self.ot_availability = np.array(
+            [ot.availability for ot in self.operating_theaters], dtype=int
+        ).T
 
         # Patient Admission Scheduling (PAS) problem
         self.pas = PAS(
@@ -1465,6 +2341,8 @@ class Hospital:
             self.days,
             len(self.rooms),
             len(self.patients),
+            len(self.age_groups),
+            np.array([room.capacity for room in self.rooms], dtype=int),
         )
         # Surgical Case Planning (SCP) problem
         self.scp = SCP(
@@ -1482,11 +2360,145 @@ class Hospital:
             len(self.rooms),
             len(self.nurses),
             len(self.patients),
+            self.skill_levels,
         )
 
-        # Add occupants to PAS:
+        # Fold occupants into the constant PAS and NRA baselines
         self.pas.add_occupants(self.occupants)
         self.nra.add_occupants(self.occupants)
+        self.nra.add_nurses(self.nurses)
+
+        # Static candidate tables, computed once since they do not depend on the solution
+        self.build_candidate_tables()
+        self.build_batch_tables()
+
+    def build_penalty_components(self):
+        """Bind the soft constraints to the subsystems of this hospital"""
+        # Soft constraints and their weights, from the cheapest to the most expensive to compute
+        self.penalty_components: List[Tuple[str, str, Callable[[int], int]]] = [
+            # Constraint S5: Open OT
+            ("S5", "open_operating_theater", lambda w: self.scp.penalty_open_ot(w)),
+            # Constraint S6: Surgeon transfer
+            ("S6", "surgeon_transfer", lambda w: self.scp.penalty_transfer(w)),
+            # Constraint S7: Admission delay
+            ("S7", "patient_delay", lambda w: self.scp.penalty_delay(w)),
+            # Constraint S8: Unscheduled patients
+            ("S8", "unscheduled_optional", lambda w: self.pas.penalty_unscheduled(w)),
+            # Constraint S1: Age group
+            (
+                "S1",
+                "room_mixed_age",
+                lambda w: self.pas.penalty_age_mix(w, len(self.age_groups)),
+            ),
+            # Constraint S2: Minimum skill level
+            ("S2", "room_nurse_skill", lambda w: self.nra.penalty_skill(w)),
+            # Constraint S4: Maximum workload
+            (
+                "S4",
+                "nurse_eccessive_workload",
+                lambda w: self.nra.penalty_workload(w),
+            ),
+            # Constraint S3: Continuity of care
+            ("S3", "continuity_of_care", lambda w: self.nra.penalty_continuity(w)),
+        ]
+
+    def build_candidate_tables(self):
+        """Compute, for each patient, the admission days (H6) and the rooms (H2) that are allowed"""
+        self.patient_surgeons = np.array(
+            [
+                self.indexer.reverse_lookup("surgeons", patient.surgeon.id)
+                for patient in self.patients
+            ],
+            dtype=int,
+        )
+        self.mandatory = np.array(
+            [patient.mandatory for patient in self.patients], dtype=bool
+        )
+        self.candidate_days: List[NDArray] = []
+        self.candidate_rooms: List[NDArray] = []
+        for patient in self.patients:
+            patient: Patient
+            # Compute start and end date that are feasible for the patient
+            start_date = patient.surgery_release_day
+            end_date = self.days - 1
+            if patient.mandatory:
+                end_date = patient.surgery_due_day
+            self.candidate_days.append(np.arange(start_date, end_date + 1))
+            # Compute compatible rooms for the patient
+            incompatible_rooms = {
+                self.indexer.reverse_lookup("rooms", i.id)
+                for i in patient.incompatible_rooms
+            }
+            self.candidate_rooms.append(
+                np.array(
+                    [r for r in range(len(self.rooms)) if r not in incompatible_rooms],
+                    dtype=int,
+                )
+            )
+        # For each patient, days and rooms where it could stay if admitted
+        admission_windows = np.zeros(
+            (len(self.patients), self.days, len(self.rooms)), dtype=bool
+        )
+        for patient_index, patient in enumerate(self.patients):
+            days = self.candidate_days[patient_index]
+            if len(days) == 0:
+                continue
+            end_day = min(self.days, days[-1] + patient.length_of_stay)
+            admission_windows[
+                patient_index, days[0] : end_day, self.candidate_rooms[patient_index]
+            ] = True
+        self.pas.add_admission_windows(admission_windows)
+        self.set_window(0, self.days)
+
+    def set_window(self, start_day: int, end_day: int):
+        """Restrict the neighboring moves to the admissions and nurse shifts of a window of days,
+        the rest of the solution being fixed
+
+        Args:
+            start_day (int): first day of the window
+            end_day (int): end day of the window (excluded)
+        """
+        self.window = (start_day, end_day)
+        # Patients that can be admitted within the window
+        self.window_patients = np.array(
+            [
+                ((days >= start_day) & (days < end_day)).any()
+                for days in self.candidate_days
+            ],
+            dtype=bool,
+        )
+        # For each shift, keep track of whether its nurses belong to the window
+        self.window_shifts = np.zeros(self.days * len(self.shift_types), dtype=bool)
+        self.window_shifts[slice(*self.get_window_shifts(start_day, end_day))] = True
+
+    def get_window_shifts(self, start_day: int, end_day: int) -> Tuple[int, int]:
+        """Return the shifts whose nurses belong to a window of days, i.e. the ones of the stays of
+        the patients that can be admitted within the window
+
+        Args:
+            start_day (int): first day of the window
+            end_day (int): end day of the window (excluded)
+
+        Returns:
+            Tuple[int, int]: first and end shift (excluded)
+        """
+        shift_types = len(self.shift_types)
+        max_length_of_stay = max(
+            [patient.length_of_stay for patient in self.patients], default=1
+        )
+        end_day = min(self.days, end_day + max_length_of_stay - 1)
+        return start_day * shift_types, end_day * shift_types
+
+    def in_window(self, day: int) -> bool:
+        """Check if the day belongs to the window
+
+        Args:
+            day (int): index of the day
+
+        Returns:
+            bool: True if the day belongs to the window, False otherwise
+        """
+        return self.window[0] <= day < self.window[1]
 
     def print(self):
         """Print the current status of the hospital"""
@@ -1501,6 +2513,7 @@ class Hospital:
         patient_index: int,
         operating_theater_index: int,
         assign: bool = False,
+        bound: Union[float, None] = None,
     ) -> Tuple[int, Dict[str, int]]:
         """Schedule a patient in a room and operating theater for a given day
 
@@ -1510,10 +2523,40 @@ class Hospital:
             patient_index (int): index of the patient
             operating_theater_index (int): index of the operating theater
             assign (bool, optional): if True, the change is saved. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
         """
+        self.check_patient_schedule(
+            day, room_index, patient_index, operating_theater_index
+        )
+        self.place_patient(day, room_index, patient_index, operating_theater_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
+
+        if not assign:
+            self.remove_patient(patient_index)
+
+        return penalty, penalty_dict
+
+    def check_patient_schedule(
+        self,
+        day: int,
+        room_index: int,
+        patient_index: int,
+        operating_theater_index: int,
+    ):
+        """Check the hard constraints for scheduling a patient in a room and operating theater for a given day
+
+        Args:
+            day (int): index of the day
+            room_index (int): index of the room
+            patient_index (int): index of the patient
+            operating_theater_index (int): index of the operating theater
+
+        Raises:
+            ActionError: if the patient cannot be scheduled
+        """
         # Information retrieval
         room: Room = self.indexer.lookup("rooms", room_index)
         patient: Patient = self.indexer.lookup("patients", patient_index)
@@ -1535,9 +2578,7 @@ class Hospital:
 
         # PAS constraints
         # Constraint H1: No gender mix
-        gender_ok = self.pas.check_gender(
-            day, end_day, self.patients, patient, room_index
-        )
+        gender_ok = self.pas.check_gender(day, end_day, patient, room_index)
         # Constraint H2: Compatible rooms
         compatible_ok = self.pas.check_room_compatible(patient, room)
         # Constraint H7: Room capacity
@@ -1561,28 +2602,156 @@ class Hospital:
         if not surgeon_overtime_ok or not ot_duration_ok:
             raise ActionError("Patient cannot be scheduled in this operating theater")
 
-        self.pas.schedule_patient(day, end_day, room_index, patient_index)
+    def place_patient(
+        self,
+        day: int,
+        room_index: int,
+        patient_index: int,
+        operating_theater_index: int,
+    ):
+        """Update the PAS, SCP and NRA problems with the schedule of a patient, without any check
+
+        Args:
+            day (int): index of the day
+            room_index (int): index of the room
+            patient_index (int): index of the patient
+            operating_theater_index (int): index of the operating theater
+        """
+        patient: Patient = self.indexer.lookup("patients", patient_index)
+        surgeon_index = self.patient_surgeons[patient_index]
+        end_day = min(self.days, day + patient.length_of_stay)
+        self.pas.schedule_patient(day, end_day, room_index, patient, patient_index)
         self.scp.schedule_patient(
             day, patient, patient_index, surgeon_index, operating_theater_index
         )
         self.nra.schedule_patient(day, end_day, room_index, patient, patient_index)
-        penalty, penalty_dict = self.compute_penalty()
+
+    def remove_patient(self, patient_index: int):
+        """Remove the schedule of a patient from the PAS, SCP and NRA problems, without any check
+
+        Args:
+            patient_index (int): index of the patient
+        """
+        patient: Patient = self.indexer.lookup("patients", patient_index)
+        self.pas.unschedule_patient(patient, patient_index)
+        self.scp.unschedule_patient(patient, patient_index)
+        self.nra.unschedule_patient(patient, patient_index)
+
+    def move_patient(
+        self,
+        patient_index: int,
+        day: int,
+        room_index: int,
+        operating_theater_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
+    ) -> Tuple[int, Dict[str, int]]:
+        """Move a scheduled patient to another day, room and/or operating theater in one step
+
+        Args:
+            patient_index (int): index of the patient
+            day (int): index of the new day
+            room_index (int): index of the new room
+            operating_theater_index (int): index of the new operating theater
+            assign (bool, optional): if True, the change is saved. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
+
+        Returns:
+            Tuple[int, Dict[str, int]]: overall penalty and individual penalties
+        """
+        if not self.pas.check_already_scheduled(patient_index):
+            raise ActionError("Patient is not scheduled")
+
+        self.pas.save()
+        self.scp.save()
+        self.nra.save()
+
+        self.remove_patient(patient_index)
+        try:
+            self.check_patient_schedule(
+                day, room_index, patient_index, operating_theater_index
+            )
+        except ActionError:
+            self.pas.restore()
+            self.scp.restore()
+            self.nra.restore()
+            raise
+        self.place_patient(day, room_index, patient_index, operating_theater_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
+
+        if not assign:
+            self.pas.restore()
+            self.scp.restore()
+            self.nra.restore()
+
+        return penalty, penalty_dict
+
+    def swap_patients(
+        self,
+        patient_index: int,
+        other_patient_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
+    ) -> Tuple[int, Dict[str, int]]:
+        """Exchange the admission day, room and operating theater of two scheduled patients in one step
+
+        Args:
+            patient_index (int): index of the first patient
+            other_patient_index (int): index of the second patient
+            assign (bool, optional): if True, the change is saved. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
+
+        Returns:
+            Tuple[int, Dict[str, int]]: overall penalty and individual penalties
+        """
+        if not self.pas.check_already_scheduled(
+            patient_index
+        ) or not self.pas.check_already_scheduled(other_patient_index):
+            raise ActionError("Patient is not scheduled")
+
+        day, room_index = self.pas.get_patient_schedule(patient_index)
+        _, _, ot_index = self.scp.get_patient_schedule(patient_index)
+        other_day, other_room_index = self.pas.get_patient_schedule(other_patient_index)
+        _, _, other_ot_index = self.scp.get_patient_schedule(other_patient_index)
+
+        self.pas.save()
+        self.scp.save()
+        self.nra.save()
+
+        self.remove_patient(patient_index)
+        self.remove_patient(other_patient_index)
+        try:
+            self.check_patient_schedule(
+                other_day, other_room_index, patient_index, other_ot_index
+            )
+            self.place_patient(
+                other_day, other_room_index, patient_index, other_ot_index
+            )
+            self.check_patient_schedule(day, room_index, other_patient_index, ot_index)
+        except ActionError:
+            self.pas.restore()
+            self.scp.restore()
+            self.nra.restore()
+            raise
+        self.place_patient(day, room_index, other_patient_index, ot_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
 
         if not assign:
-            self.pas.unschedule_patient(patient_index)
-            self.scp.unschedule_patient(patient_index)
-            self.nra.unschedule_patient(patient_index)
+            self.pas.restore()
+            self.scp.restore()
+            self.nra.restore()
 
         return penalty, penalty_dict
 
     def unschedule_patient(
-        self, patient_index: int, assign: bool = False
+        self, patient_index: int, assign: bool = False, bound: Union[float, None] = None
     ) -> Tuple[int, Dict[str, int]]:
         """Unschedule a patient
 
         Args:
             patient_index (int): index of the patient
             assign (bool, optional): if True, the change is saved. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
@@ -1590,14 +2759,16 @@ class Hospital:
         if not self.pas.check_already_scheduled(patient_index):
             raise ValueError("Patient is not scheduled")
 
+        patient: Patient = self.indexer.lookup("patients", patient_index)
+
         self.pas.save()
         self.scp.save()
         self.nra.save()
 
-        self.pas.unschedule_patient(patient_index)
-        self.scp.unschedule_patient(patient_index)
-        self.nra.unschedule_patient(patient_index)
-        penalty, penalty_dict = self.compute_penalty()
+        self.pas.unschedule_patient(patient, patient_index)
+        self.scp.unschedule_patient(patient, patient_index)
+        self.nra.unschedule_patient(patient, patient_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
 
         if not assign:
             self.pas.restore()
@@ -1607,7 +2778,12 @@ class Hospital:
         return penalty, penalty_dict
 
     def assign_nurse(
-        self, shift: int, room_index: int, nurse_index: int, assign: bool = False
+        self,
+        shift: int,
+        room_index: int,
+        nurse_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
     ) -> Tuple[int, Dict[str, int]]:
         """Schedule a nurse in a room for a given shift
 
@@ -1616,6 +2792,7 @@ class Hospital:
             room_index (int): index of the room
             nurse_index (int): index of the nurse
             assign (bool, optional): if True, save the change. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
@@ -1630,13 +2807,18 @@ class Hospital:
             raise ActionError("Room is already covered by a nurse")
 
         self.nra.assign_nurse(shift, room_index, nurse_index)
-        penalty, penalty_dict = self.compute_penalty()
+        penalty, penalty_dict = self.compute_penalty(bound)
         if not assign:
             self.nra.unassign_nurse(shift, room_index, nurse_index)
         return penalty, penalty_dict
 
     def unassign_nurse(
-        self, shift: int, room_index: int, nurse_index: int, assign: bool = False
+        self,
+        shift: int,
+        room_index: int,
+        nurse_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
     ) -> Tuple[int, Dict[str, int]]:
         """Unassign a nurse
 
@@ -1645,6 +2827,7 @@ class Hospital:
             room_index (int): index of the room
             nurse_index (int): index of the nurse
             assign (bool, optional): if True, save the change. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
@@ -1656,64 +2839,158 @@ class Hospital:
             raise ActionError("Nurse is assigned to a patient")
 
         self.nra.unassign_nurse(shift, room_index, nurse_index)
-        penalty, penalty_dict = self.compute_penalty()
+        penalty, penalty_dict = self.compute_penalty(bound)
         if not assign:
             self.nra.assign_nurse(shift, room_index, nurse_index)
         return penalty, penalty_dict
 
-    def compute_penalty(self) -> Tuple[int, Dict[str, int]]:
-        """Compute the penalty of the current solution
+    def reassign_nurse(
+        self,
+        shift: int,
+        room_index: int,
+        nurse_index: int,
+        new_nurse_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
+    ) -> Tuple[int, Dict[str, int]]:
+        """Hand a covered room from a nurse to another one in one step
+
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room
+            nurse_index (int): index of the nurse currently covering the room
+            new_nurse_index (int): index of the nurse that takes over the room
+            assign (bool, optional): if True, save the change. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
         """
-        penalty = 0
-        penalty_dict = {}
-
-        # Constraint S1: Age group
-        penalty_dict["S1"] = self.pas.penalty_age_mix(
-            self.weights["room_mixed_age"], len(self.age_groups)
-        )
-        penalty += penalty_dict["S1"]
+        if not self.nra.check_already_assigned(nurse_index, shift, room_index):
+            raise ActionError("Nurse is not assigned to the room on this shift")
 
-        # Constraint S2: Minimum skill level
-        penalty_dict["S2"] = self.nra.penalty_skill(self.weights["room_nurse_skill"])
-        penalty += penalty_dict["S2"]
+        new_nurse: Nurse = self.indexer.lookup("nurses", new_nurse_index)
+        if new_nurse_index == nurse_index or not new_nurse.is_available(shift):
+            raise ActionError("Nurse is not available at this shift")
 
-        # Constraint S3: Continuity of care
-        penalty_dict["S3"] = self.nra.penalty_continuity(
-            self.weights["continuity_of_care"]
-        )
-        penalty += penalty_dict["S3"]
+        self.nra.unassign_nurse(shift, room_index, nurse_index)
+        self.nra.assign_nurse(shift, room_index, new_nurse_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
+        if not assign:
+            self.nra.unassign_nurse(shift, room_index, new_nurse_index)
+            self.nra.assign_nurse(shift, room_index, nurse_index)
+        return penalty, penalty_dict
 
-        # Constraint S4: Maximum workload
-        penalty_dict["S4"] = self.nra.penalty_workload(
-            self.weights["nurse_eccessive_workload"]
-        )
-        penalty += penalty_dict["S4"]
+    def swap_nurses(
+        self,
+        shift: int,
+        room_index: int,
+        nurse_index: int,
+        other_room_index: int,
+        other_nurse_index: int,
+        assign: bool = False,
+        bound: Union[float, None] = None,
+    ) -> Tuple[int, Dict[str, int]]:
+        """Exchange the rooms of two nurses within a shift in one step
 
-        # Constraint S5: Open OT
-        penalty_dict["S5"] = self.scp.penalty_open_ot(
-            self.weights["open_operating_theater"]
-        )
-        penalty += penalty_dict["S5"]
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room of the first nurse
+            nurse_index (int): index of the first nurse
+            other_room_index (int): index of the room of the second nurse
+            other_nurse_index (int): index of the second nurse
+            assign (bool, optional): if True, save the change. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound. Defaults to None.
 
-        # Constraint S6: Surgeon transfer
-        penalty_dict["S6"] = self.scp.penalty_transfer(self.weights["surgeon_transfer"])
-        penalty += penalty_dict["S6"]
+        Returns:
+            Tuple[int, Dict[str, int]]: overall penalty and individual penalties
+        """
+        if not self.nra.check_already_assigned(
+            nurse_index, shift, room_index
+        ) or not self.nra.check_already_assigned(
+            other_nurse_index, shift, other_room_index
+        ):
+            raise ActionError("Nurse is not assigned to the room on this shift")
 
-        # Constraint S7: Admission delay
-        penalty_dict["S7"] = self.scp.penalty_delay(self.weights["patient_delay"])
-        penalty += penalty_dict["S7"]
+        if nurse_index == other_nurse_index or room_index == other_room_index:
+            raise ActionError("Nurses cannot be swapped")
 
-        # Constraint S8: Unscheduled patients
-        penalty_dict["S8"] = self.pas.penalty_unscheduled(
-            self.weights["unscheduled_optional"]
-        )
-        penalty += penalty_dict["S8"]
+        self.nra.unassign_nurse(shift, room_index, nurse_index)
+        self.nra.unassign_nurse(shift, other_room_index, other_nurse_index)
+        self.nra.assign_nurse(shift, room_index, other_nurse_index)
+        self.nra.assign_nurse(shift, other_room_index, nurse_index)
+        penalty, penalty_dict = self.compute_penalty(bound)
+        if not assign:
+            self.nra.unassign_nurse(shift, room_index, other_nurse_index)
+            self.nra.unassign_nurse(shift, other_room_index, nurse_index)
+            self.nra.assign_nurse(shift, room_index, nurse_index)
+            self.nra.assign_nurse(shift, other_room_index, other_nurse_index)
+        return penalty, penalty_dict
+
+    def compute_penalty(
+        self, bound: Union[float, None] = None
+    ) -> Tuple[int, Dict[str, int]]:
+        """Compute the penalty of the current solution
+
+        The penalty only depends on the solution, so it is looked up by state hash in the penalty
+        cache first and computed only on a miss. Components whose weight is zero are skipped.
+
+        With a bound, the components are computed from the cheapest to the most expensive one, and
+        the computation stops as soon as the partial penalty reaches the bound: the returned penalty
+        is then only a lower bound, the dictionary holds the computed components and the component
+        that caused the cutoff is stored in cutoff_component.
+
+        Args:
+            bound (Union[float, None], optional): penalty the solution has to stay below. Defaults to None.
+
+        Returns:
+            Tuple[int, Dict[str, int]]: overall penalty and individual penalties
+        """
+        self.cutoff_component = None
+        state_hash = self.get_state_hash()
+        cached = self.penalty_cache.get(state_hash)
+        if cached is not None:
+            return cached
 
+        penalty = 0
+        penalty_dict = {}
+        for name, weight_key, penalty_component in self.penalty_components:
+            weight = self.weights[weight_key]
+            penalty_dict[name] = penalty_component(weight) if weight else 0
+            penalty += penalty_dict[name]
+            if bound is not None and penalty >= bound:
+                self.cutoff_component = name
+                self.cutoff_counts[name] += 1
+                return penalty, penalty_dict
+
+        penalty_dict = dict(sorted(penalty_dict.items()))
+        self.penalty_cache.put(state_hash, (penalty, penalty_dict))
         return penalty, penalty_dict
 
+    def get_cutoff_stats(self) -> Dict[str, int]:
+        """Return the number of bounded penalty computations stopped by each component
+
+        Returns:
+            Dict[str, int]: number of cutoffs per component
+        """
+        return dict(self.cutoff_counts)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Return the statistics of the penalty cache
+
+        Returns:
+            Dict[str, int]: number of hits, misses and cached states
+        """
+        return self.penalty_cache.get_stats()
+
+    def get_state_hash(self) -> int:
+        """Return the Zobrist hash of the current solution, i.e. of the patient admissions and of the nurse assignments
+
+        Returns:
+            int: 64-bit hash of the current solution
+        """
+        return self.pas.state_hash ^ self.scp.state_hash ^ self.nra.state_hash
+
     def save_status(self):
         """Save the current status as the best status found so far"""
         self.best_patients = copy.deepcopy(self.patients)
@@ -1724,33 +3001,130 @@ class Hospital:
 
     def load_status(self):
         """Load the best status found so far"""
-        self.patients = np.copy(self.best_patients)
-        self.nurses = np.copy(self.best_nurses)
-        self.pas.restore(self.pas_status)
-        self.scp.restore(self.scp_status)
-        self.nra.restore(
-            self.nra_status[0],
-            self.nra_status[1],
-            self.nra_status[2],
-            self.nra_status[3],
+        self.patients = copy.deepcopy(self.best_patients)
+        self.nurses = copy.deepcopy(self.best_nurses)
+        self.pas.restore(*self.pas_status)
+        self.scp.restore(*self.scp_status)
+        self.nra.restore(*self.nra_status)
+        self.move_cache.clear()
+
+    def get_window_solution(
+        self, start_day: int, end_day: int
+    ) -> Tuple[List[Tuple[int, int, int, int]], List[Tuple[int, int, int]]]:
+        """Return the part of the solution that belongs to a window of days
+
+        Args:
+            start_day (int): first day of the window
+            end_day (int): end day of the window (excluded)
+
+        Returns:
+            Tuple[List[Tuple[int, int, int, int]], List[Tuple[int, int, int]]]: patient, day, room and operating theater
+            of the patients admitted within the window, shift, room and nurse of the covered rooms of the window shifts
+        """
+        patient_slots = []
+        for patient_index in np.nonzero(self.pas.get_scheduled_patients_mask())[0]:
+            day, room_index, ot_index = self.get_patient_slot(int(patient_index))
+            if start_day <= day < end_day:
+                patient_slots.append((int(patient_index), day, room_index, ot_index))
+        first_shift, end_shift = self.get_window_shifts(start_day, end_day)
+        shifts, rooms = np.nonzero(self.nra.coverage[first_shift:end_shift] > 0)
+        shifts += first_shift
+        nurse_cells = list(
+            zip(
+                shifts.tolist(),
+                rooms.tolist(),
+                self.nra.room_nurse[shifts, rooms].tolist(),
+            )
         )
+        return patient_slots, nurse_cells
+
+    def load_window_solution(
+        self,
+        start_day: int,
+        end_day: int,
+        patient_slots: List[Tuple[int, int, int, int]],
+        nurse_cells: List[Tuple[int, int, int]],
+    ) -> int:
+        """Replace the part of the solution that belongs to a window of days
+
+        The patients admitted within the window are unscheduled, the rooms of the window shifts
+        (see get_window_shifts) are handed to the given nurses and the given patients are scheduled again. Rooms hosting someone
+        from outside the window keep their nurse if they are not covered in the new solution, and
+        patients that cannot be scheduled anymore are left unscheduled.
+
+        Args:
+            start_day (int): first day of the window
+            end_day (int): end day of the window (excluded)
+            patient_slots (List[Tuple[int, int, int, int]]): patient, day, room and operating theater of the patients admitted within the window
+            nurse_cells (List[Tuple[int, int, int]]): shift, room and nurse of the covered rooms of the window shifts
+
+        Returns:
+            int: number of patients that could not be scheduled
+        """
+        self.move_cache.clear()
+        current_slots, current_cells = self.get_window_solution(start_day, end_day)
+        for patient_index, _, _, _ in current_slots:
+            self.remove_patient(patient_index)
+            patient: Patient = self.patients[patient_index]
+            patient.unset_assignment()
+
+        cells = {(shift, room_index): nurse for shift, room_index, nurse in nurse_cells}
+        for shift, room_index, nurse_index in current_cells:
+            new_nurse_index = cells.pop((shift, room_index), None)
+            if new_nurse_index == nurse_index:
+                continue
+            if new_nurse_index is None and not self.pas.check_room_empty(
+                shift // len(self.shift_types), room_index
+            ):
+                continue
+            self.nra.unassign_nurse(shift, room_index, nurse_index)
+            self.set_nurse_assignment(shift, room_index, nurse_index, False)
+            if new_nurse_index is not None:
+                self.nra.assign_nurse(shift, room_index, new_nurse_index)
+                self.set_nurse_assignment(shift, room_index, new_nurse_index, True)
+        for (shift, room_index), nurse_index in cells.items():
+            self.nra.assign_nurse(shift, room_index, nurse_index)
+            self.set_nurse_assignment(shift, room_index, nurse_index, True)
+
+        rejected = 0
+        for patient_index, day, room_index, ot_index in patient_slots:
+            try:
+                self.check_patient_schedule(day, room_index, patient_index, ot_index)
+            except ActionError:
+                rejected += 1
+                continue
+            self.place_patient(day, room_index, patient_index, ot_index)
+            room_id = self.indexer.lookup("rooms", room_index).id
+            ot_id = self.indexer.lookup("operating_theaters", ot_index).id
+            patient: Patient = self.patients[patient_index]
+            patient.set_assignment(day, room_id, ot_id)
+
+        penalty, _ = self.compute_penalty()
+        self.logger.log_action(penalty, f"Loaded days {start_day}-{end_day}")
+        return rejected
 
     def apply_action(
-        self, action: NeighboringAction, assign: bool = False
+        self,
+        action: NeighboringAction,
+        assign: bool = False,
+        bound: Union[float, None] = None,
     ) -> Tuple[int, Dict[str, int]]:
         """Apply a neighboring action to the current state
 
         Args:
             action (NeighboringAction): action to apply
             assign (bool, optional): if True, the change is saved. Defaults to False.
+            bound (Union[float, None], optional): stop computing the penalty once it reaches the bound, ignored if the change is saved. Defaults to None.
 
         Returns:
             Tuple[int, Dict[str, int]]: overall penalty and individual penalties
         """
+        if assign:
+            bound = None
 
         if isinstance(action, PASActionSchedule):
             penalty, penalty_dict = self.schedule_patient(
-                action.day, action.room, action.patient, action.ot, assign
+                action.day, action.room, action.patient, action.ot, assign, bound
             )
             if assign:
                 room_id = self.indexer.lookup("rooms", action.room).id
@@ -1763,16 +3137,47 @@ class Hospital:
                 # )
 
         if isinstance(action, PASActionUnschedule):
-            penalty, penalty_dict = self.unschedule_patient(action.patient, assign)
+            penalty, penalty_dict = self.unschedule_patient(
+                action.patient, assign, bound
+            )
             if assign:
                 patient: Patient = self.patients[action.patient]
                 patient.unset_assignment()
 
                 # print(f"Patient {patient.id} unscheduled")
 
+        if isinstance(action, PASActionMove):
+            penalty, penalty_dict = self.move_patient(
+                action.patient,
+                action.new_day,
+                action.new_room,
+                action.new_ot,
+                assign,
+                bound,
+            )
+            if assign:
+                room_id = self.indexer.lookup("rooms", action.new_room).id
+                ot_id = self.indexer.lookup("operating_theaters", action.new_ot).id
+                patient: Patient = self.patients[action.patient]
+                patient.set_assignment(action.new_day, room_id, ot_id)
+
+        if isinstance(action, PASActionSwap):
+            penalty, penalty_dict = self.swap_patients(
+                action.patient, action.other_patient, assign, bound
+            )
+            if assign:
+                room_id = self.indexer.lookup("rooms", action.other_room).id
+                ot_id = self.indexer.lookup("operating_theaters", action.other_ot).id
+                patient: Patient = self.patients[action.patient]
+                patient.set_assignment(action.other_day, room_id, ot_id)
+                room_id = self.indexer.lookup("rooms", action.room).id
+                ot_id = self.indexer.lookup("operating_theaters", action.ot).id
+                patient: Patient = self.patients[action.other_patient]
+                patient.set_assignment(action.day, room_id, ot_id)
+
         if isinstance(action, NRAActionSchedule):
             penalty, penalty_dict = self.assign_nurse(
-                action.shift, action.room, action.nurse, assign
+                action.shift, action.room, action.nurse, assign, bound
             )
             if assign:
                 room_id = self.indexer.lookup("rooms", action.room).id
@@ -1789,7 +3194,7 @@ class Hospital:
 
         if isinstance(action, NRAActionUnschedule):
             penalty, penalty_dict = self.unassign_nurse(
-                action.shift, action.room, action.nurse, assign
+                action.shift, action.room, action.nurse, assign, bound
             )
             if assign:
                 room_id = self.indexer.lookup("rooms", action.room).id
@@ -1804,12 +3209,324 @@ class Hospital:
                 #     f"Nurse {nurse.id} unassigned on shift {action.shift} in room {room_id}"
                 # )
 
+        if isinstance(action, NRAActionReassign):
+            penalty, penalty_dict = self.reassign_nurse(
+                action.shift, action.room, action.nurse, action.new_nurse, assign, bound
+            )
+            if assign:
+                self.set_nurse_assignment(
+                    action.shift, action.room, action.nurse, False
+                )
+                self.set_nurse_assignment(
+                    action.shift, action.room, action.new_nurse, True
+                )
+
+        if isinstance(action, NRAActionSwap):
+            penalty, penalty_dict = self.swap_nurses(
+                action.shift,
+                action.room,
+                action.nurse,
+                action.other_room,
+                action.other_nurse,
+                assign,
+                bound,
+            )
+            if assign:
+                self.set_nurse_assignment(
+                    action.shift, action.room, action.nurse, False
+                )
+                self.set_nurse_assignment(
+                    action.shift, action.other_room, action.other_nurse, False
+                )
+                self.set_nurse_assignment(
+                    action.shift, action.room, action.other_nurse, True
+                )
+                self.set_nurse_assignment(
+                    action.shift, action.other_room, action.nurse, True
+                )
+
         if assign:
+            self.move_cache.invalidate(self.get_move_footprint(action))
             self.logger.log_action(penalty, str(action))
             # print(f"\tPenalty: {penalty}, penalties: {penalty_dict}", end="\n\n")
 
         return penalty, penalty_dict
 
+    def set_nurse_assignment(
+        self, shift: int, room_index: int, nurse_index: int, assigned: bool
+    ):
+        """Save or remove the assignment information of a nurse
+
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room
+            nurse_index (int): index of the nurse
+            assigned (bool): if True, the assignment is saved, otherwise it is removed
+        """
+        room_id = self.indexer.lookup("rooms", room_index).id
+        nurse: Nurse = self.nurses[nurse_index]
+        day = shift // len(self.shift_types)
+        shift_type = self.shift_types[shift % len(self.shift_types)]
+        if assigned:
+            nurse.set_assignment(day, shift_type, room_id)
+        else:
+            nurse.unset_assignment(day, shift_type, room_id)
+
+    def get_patient_footprint(
+        self, patient_index: int, day: int, room_index: int, ot_index: int
+    ) -> Set[Tuple[str, int, int]]:
+        """Return the resources used by a patient admitted on the given day, room and operating theater
+
+        Args:
+            patient_index (int): index of the patient
+            day (int): index of the day
+            room_index (int): index of the room
+            ot_index (int): index of the operating theater
+
+        Returns:
+            Set[Tuple[str, int, int]]: room of each day of the stay, operating theater and surgeon of the surgery day
+        """
+        patient: Patient = self.patients[patient_index]
+        end_day = min(self.days, day + patient.length_of_stay)
+        footprint = {("room", d, room_index) for d in range(day, end_day)}
+        footprint.add(("ot", day, ot_index))
+        footprint.add(("surgeon", day, int(self.patient_surgeons[patient_index])))
+        return footprint
+
+    def get_move_footprint(
+        self, action: NeighboringAction
+    ) -> Set[Tuple[str, int, int]]:
+        """Return the resources changed by a move
+
+        Args:
+            action (NeighboringAction): move
+
+        Returns:
+            Set[Tuple[str, int, int]]: changed resources
+        """
+        if isinstance(action, (PASActionSchedule, PASActionUnschedule)):
+            return self.get_patient_footprint(
+                action.patient, action.day, action.room, action.ot
+            )
+        if isinstance(action, PASActionMove):
+            return self.get_patient_footprint(
+                action.patient, action.day, action.room, action.ot
+            ) | self.get_patient_footprint(
+                action.patient, action.new_day, action.new_room, action.new_ot
+            )
+        if isinstance(action, PASActionSwap):
+            footprint = set()
+            for patient_index in [action.patient, action.other_patient]:
+                for slot in [
+                    (action.day, action.room, action.ot),
+                    (action.other_day, action.other_room, action.other_ot),
+                ]:
+                    footprint |= self.get_patient_footprint(patient_index, *slot)
+            return footprint
+        day = action.shift // len(self.shift_types)
+        footprint = {("room", day, action.room)}
+        if isinstance(action, NRAActionSwap):
+            footprint.add(("room", day, action.other_room))
+        return footprint
+
+    def get_move_dependencies(
+        self, action: NeighboringAction
+    ) -> Set[Tuple[str, int, int]]:
+        """Return the resources the penalty increase of a move depends on
+
+        Besides the resources it changes, the move of a nurse depends on the stays of the patients
+        in the room, because of the continuity of care.
+
+        Args:
+            action (NeighboringAction): move
+
+        Returns:
+            Set[Tuple[str, int, int]]: resources the penalty increase depends on
+        """
+        footprint = self.get_move_footprint(action)
+        if isinstance(action, (NRAActionSchedule, NRAActionUnschedule)):
+            patients = np.nonzero(self.nra.patient_matrix[action.shift, action.room])[0]
+            for patient_index in patients:
+                days = np.nonzero(self.pas.pas_matrix[:, action.room, patient_index])[0]
+                footprint |= {("room", int(d), action.room) for d in days}
+        return footprint
+
+    def evaluate_cached_move(
+        self,
+        action: NeighboringAction,
+        penalty: int,
+        bound: Union[NeighborhoodBound, None] = None,
+    ) -> Union[int, None]:
+        """Evaluate a move through the move cache, applying and reverting it only if it is not cached
+
+        Args:
+            action (NeighboringAction): move
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): if given, a move that is not cached stops once it cannot beat the bound, and its lower bound is cached and returned. Defaults to None.
+
+        Returns:
+            Union[int, None]: penalty after the move, None if the move is infeasible
+        """
+        self.cutoff_component = None
+        key = (type(action).__name__, *vars(action).values())
+        delta = self.move_cache.get(key)
+        if delta is not None and not self.move_cache.is_exact(key):
+            # A lower bound is enough as long as the move still cannot beat the bound
+            if bound is not None and penalty + delta >= bound.bound:
+                return penalty + int(delta)
+            delta = None
+        if delta is None:
+            try:
+                p, _ = self.apply_action(
+                    action, bound=bound.bound if bound is not None else None
+                )
+            except ActionError:
+                p = float("inf")
+            exact = self.cutoff_component is None
+            delta = p - penalty
+            self.move_cache.put(key, delta, self.get_move_dependencies(action), exact)
+            if not exact:
+                return int(p)
+        if delta == float("inf"):
+            return None
+        return penalty + int(delta)
+
+    def best_operating_theaters(
+        self, days: NDArray, patient: Patient, surgeon_index: int
+    ) -> Tuple[NDArray, NDArray]:
+        """Return, for each day, the operating theater where the surgery of the patient is cheapest
+
+        The operating theater only affects the OT overtime (H4), open OT (S5) and surgeon transfer (S6)
+        terms, while the room only affects the PAS and NRA terms. The two parts of a schedule move are
+        therefore independent, and the best operating theater is the same for every room.
+
+        Args:
+            days (NDArray): indices of the days
+            patient (Patient): patient object
+            surgeon_index (int): index of the surgeon of the patient
+
+        Returns:
+            Tuple[NDArray, NDArray]: index of the best operating theater (-1 if none is available) and its penalty increase, for each day
+        """
+        # Constraint H4: OT overtime
+        feasible = self.scp.check_operating_theaters_overtime(
+            days, self.ot_availability[days], patient
+        )
+        feasible[:, self.scp.dummy_ot] = False  # not consider dummy
+        delta = self.scp.penalty_ot_deltas(
+            days,
+            surgeon_index,
+            self.weights["open_operating_theater"],
+            self.weights["surgeon_transfer"],
+        )
+        delta = np.where(feasible, delta, np.inf)
+        ot_indices = delta.argmin(axis=-1)
+        ot_deltas = delta[np.arange(len(days)), ot_indices]
+        return np.where(np.isfinite(ot_deltas), ot_indices, -1), ot_deltas
+
+    def get_schedule_candidates(
+        self, patient_index: int
+    ) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+        """Check the hard constraints of all the schedule candidates of an unscheduled patient in one pass
+
+        Args:
+            patient_index (int): index of the patient
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]: candidate days, end day of the stay for each day,
+            candidate rooms, best operating theater and its penalty increase for each day, feasibility mask for each day and room
+        """
+        patient: Patient = self.patients[patient_index]
+        surgeon_index = self.patient_surgeons[patient_index]
+        # Constraints H6 (admission day) and H2 (compatible rooms) are static
+        days = self.candidate_days[patient_index]
+        rooms = self.candidate_rooms[patient_index]
+        end_days = np.minimum(self.days, days + patient.length_of_stay)
+
+        # Constraints H1 (gender mix), H7 (room capacity) and H8 (room coverage) hold for the whole stay
+        blocked = (
+            self.pas.room_full
+            | ~self.nra.room_covered
+            | ~self.pas.get_gender_mask(patient)
+        )
+        feasible = window_sum(blocked[:, rooms], days, end_days) == 0
+        # Constraint H3: Surgeon overtime
+        surgeon_ok = self.scp.get_surgeon_overtime_mask(
+            patient.surgeon, surgeon_index, patient
+        )
+        # Constraint H4: OT overtime
+        ot_indices, ot_deltas = self.best_operating_theaters(
+            days, patient, surgeon_index
+        )
+        feasible &= (surgeon_ok[days] & (ot_indices >= 0))[:, None]
+        # Days outside the window are fixed
+        feasible &= ((days >= self.window[0]) & (days < self.window[1]))[:, None]
+        return days, end_days, rooms, ot_indices, ot_deltas, feasible
+
+    def evaluate_patient_schedules(
+        self, patient_index: int, penalty: int
+    ) -> Tuple[List[NeighboringAction], NDArray]:
+        """Evaluate all the feasible schedule moves of an unscheduled patient at once
+
+        The moves of a patient share its length of stay, workload, skill levels, surgeon and duration,
+        so the penalty increase of every (day, room, OT) candidate is computed with array operations
+        on the current state instead of applying each move.
+
+        Args:
+            patient_index (int): index of the patient
+            penalty (int): penalty of the current solution
+
+        Returns:
+            Tuple[List[NeighboringAction], NDArray]: feasible schedule moves and the corresponding penalties
+        """
+        patient: Patient = self.patients[patient_index]
+        days, end_days, rooms, ot_indices, ot_deltas, feasible = (
+            self.get_schedule_candidates(patient_index)
+        )
+        day_indices, room_indices = np.nonzero(feasible)
+        if len(day_indices) == 0:
+            return [], np.array([], dtype=int)
+
+        age_delta = window_sum(
+            self.pas.penalty_age_deltas(patient)[:, rooms], days, end_days
+        )
+        skill_delta, continuity, workload_delta = self.nra.penalty_deltas(
+            patient, days, end_days, rooms
+        )
+        day_delta = (
+            ot_deltas
+            + np.maximum(days - patient.surgery_release_day, 0)
+            * self.weights["patient_delay"]
+            - self.weights["unscheduled_optional"]
+        )
+        delta = (
+            age_delta * self.weights["room_mixed_age"]
+            + skill_delta * self.weights["room_nurse_skill"]
+            + continuity * self.weights["continuity_of_care"]
+            + workload_delta * self.weights["nurse_eccessive_workload"]
+            + day_delta[:, None]
+        )
+        moves = [
+            PASActionSchedule(
+                int(days[d]), int(rooms[r]), patient_index, int(ot_indices[d])
+            )
+            for d, r in zip(day_indices, room_indices)
+        ]
+        return moves, (penalty + delta[day_indices, room_indices]).astype(int)
+
+    def get_patient_slot(self, patient_index: int) -> Tuple[int, int, int]:
+        """Return the admission day, room and operating theater of a scheduled patient
+
+        Args:
+            patient_index (int): index of the patient
+
+        Returns:
+            Tuple[int, int, int]: index of the day, room and operating theater
+        """
+        day, room = self.pas.get_patient_schedule(patient_index)
+        _, _, ot = self.scp.get_patient_schedule(patient_index)
+        return int(day), int(room), int(ot)
+
     def generate_patients_moves(self) -> List[NeighboringAction]:
         """Generate all possible neighboring moves for the patients
 
@@ -1817,82 +3534,456 @@ class Hospital:
             List[NeighboringAction]: list of possible moves
         """
         moves = []
-        # Mask of unscheduled patients
-        patients_unscheduled_mask = ~self.pas.get_scheduled_patients_mask()[
-            len(self.occupants) :
-        ]
-        # Get unscheduled patients
-        patients_unscheduled = self.patients[len(self.occupants) :][
-            patients_unscheduled_mask
-        ]
         # Check if there are mandatory patients among the unscheduled ones
-        mandatory_fun = np.vectorize(lambda p: p.mandatory, otypes=[bool])
-        # Mask of unscheduled mandatory patients
-        patients_unscheduled_mandatory_mask = mandatory_fun(patients_unscheduled)
-        for patient in self.patients[len(self.occupants) :]:
+        mandatory_first = (
+            self.mandatory
+            & ~self.pas.get_scheduled_patients_mask()
+            & self.window_patients
+        ).any()
+        for patient_index, patient in enumerate(self.patients):
             patient: Patient
-            patient_index = self.indexer.reverse_lookup("patients", patient.id)
-            # Unschedule action if the patient is already scheduled
+            # Unschedule and move actions if the patient is already scheduled
             if self.pas.check_already_scheduled(patient_index):
-                day, room = self.pas.get_patient_schedule(patient_index)
-                _, _, ot = self.scp.get_patient_schedule(patient_index)
-                moves.append(PASActionUnschedule(day, room, patient_index, ot))
+                slot = self.get_patient_slot(patient_index)
+                # Patients admitted outside the window are fixed
+                if not self.in_window(slot[0]):
+                    continue
+                moves.append(
+                    PASActionUnschedule(slot[0], slot[1], patient_index, slot[2])
+                )
+                # The candidates of a move are the ones of the unscheduled patient
+                self.pas.save()
+                self.scp.save()
+                self.nra.save()
+                self.remove_patient(patient_index)
+                days, _, rooms, ot_indices, _, feasible = self.get_schedule_candidates(
+                    patient_index
+                )
+                self.pas.restore()
+                self.scp.restore()
+                self.nra.restore()
+                for d, r in zip(*np.nonzero(feasible)):
+                    new_slot = (int(days[d]), int(rooms[r]), int(ot_indices[d]))
+                    if new_slot != slot:
+                        moves.append(
+                            PASActionMove(*slot[:2], patient_index, slot[2], *new_slot)
+                        )
                 continue
             # If there are unscheduled mandatory patients, they have priority
-            if patients_unscheduled_mandatory_mask.any() and not patient.mandatory:
+            if mandatory_first and not patient.mandatory:
                 continue
-            # Compute incompatible rooms for the patient
-            incompatible_rooms = {
-                self.indexer.reverse_lookup("rooms", i.id)
-                for i in patient.incompatible_rooms
-            }
-            # Compute start and end date that are feasible for the patient
-            start_date = patient.surgery_release_day
-            end_date = self.days - 1
-            if patient.mandatory:
-                end_date = patient.surgery_due_day
-            for day in range(start_date, end_date + 1):
-                for room_index, _ in enumerate(self.rooms):
-                    if room_index in incompatible_rooms:
-                        continue
-                    for ot_index, _ in enumerate(self.operating_theaters):
-                        if ot_index == 0:  # not consider dummy
-                            continue
-                        schedule_move = PASActionSchedule(
-                            day, room_index, patient_index, ot_index
-                        )
-                        moves.append(schedule_move)
+            days, _, rooms, ot_indices, _, feasible = self.get_schedule_candidates(
+                patient_index
+            )
+            for d, r in zip(*np.nonzero(feasible)):
+                schedule_move = PASActionSchedule(
+                    int(days[d]), int(rooms[r]), patient_index, int(ot_indices[d])
+                )
+                moves.append(schedule_move)
+        moves.extend(self.generate_swap_moves())
         return moves
 
-    def generate_nurses_moves(self) -> List[NeighboringAction]:
-        """Generate all possible neighboring moves for the nurses
+    def generate_swap_moves(self) -> List[NeighboringAction]:
+        """Generate the swap moves between scheduled patients admitted on the same day in different rooms
+
+        Only pairs where each room is compatible with the other patient are considered; the other
+        constraints are checked when the move is applied.
 
         Returns:
             List[NeighboringAction]: list of possible moves
         """
         moves = []
-        for nurse in self.nurses:
-            nurse: Nurse
-            nurse_index = self.indexer.reverse_lookup("nurses", nurse.id)
-            # Shifts where the nurse is already scheduled, with the corresponding rooms
-            # Each of these pairs (shift, room) characterizes a forbidden action
-            shifts, rooms = self.nra.get_nurse_schedule(nurse_index)
-            forbidden_actions = {(s, r) for s, r in zip(shifts, rooms)}
-            # Schedule actions based on the forbidden actions
-            for shift in nurse.working_shifts.values():
-                for room_index, _ in enumerate(self.rooms):
-                    if (shift.index, room_index) in forbidden_actions:
-                        unschedule_move = NRAActionUnschedule(
-                            shift.index, room_index, nurse_index
-                        )
-                        moves.append(unschedule_move)
-                    else:
-                        schedule_move = NRAActionSchedule(
-                            shift.index, room_index, nurse_index
+        scheduled = np.nonzero(self.pas.get_scheduled_patients_mask())[0].tolist()
+        slots = {
+            patient_index: self.get_patient_slot(patient_index)
+            for patient_index in scheduled
+        }
+        for i, patient_index in enumerate(scheduled):
+            day, room, ot = slots[patient_index]
+            if not self.in_window(day):
+                continue
+            for other_patient_index in scheduled[i + 1 :]:
+                other_day, other_room, other_ot = slots[other_patient_index]
+                if other_day != day or other_room == room:
+                    continue
+                if (
+                    other_room not in self.candidate_rooms[patient_index]
+                    or room not in self.candidate_rooms[other_patient_index]
+                ):
+                    continue
+                swap_move = PASActionSwap(
+                    day,
+                    room,
+                    patient_index,
+                    ot,
+                    other_day,
+                    other_room,
+                    other_patient_index,
+                    other_ot,
+                )
+                moves.append(swap_move)
+        return moves
+
+    def get_patient_order(self) -> NDArray:
+        """Rank the patients by how promising their moves are
+
+        Unscheduled mandatory patients come first, from the closest to their due day, then the
+        scheduled patients, from the most delayed, and finally the unscheduled optional patients,
+        from the earliest release day.
+
+        Returns:
+            NDArray: indices of the patients, from the most to the least promising
+        """
+        scheduled = self.pas.get_scheduled_patients_mask()
+        groups = np.where(scheduled, 1, np.where(self.mandatory, 0, 2))
+        keys = np.array([days[-1] for days in self.candidate_days], dtype=int)
+        keys[groups == 2] = [
+            self.candidate_days[p][0] for p in np.nonzero(groups == 2)[0]
+        ]
+        for patient_index in np.nonzero(scheduled)[0]:
+            day = self.get_patient_slot(patient_index)[0]
+            keys[patient_index] = self.candidate_days[patient_index][0] - day
+        return np.lexsort((keys, groups))
+
+    def iterate_patients_moves(
+        self,
+        penalty: int,
+        bound: Union[NeighborhoodBound, None] = None,
+        ordered: bool = False,
+        patients: Union[List[int], None] = None,
+        swaps: bool = True,
+    ) -> Iterator[Tuple[NeighboringAction, int]]:
+        """Generate and evaluate the feasible neighboring moves for the patients, one patient at a time
+
+        The move actions of a scheduled patient are evaluated in one batched pass in the state where
+        the patient is unscheduled, which is the state the unschedule action is evaluated in. Swap
+        actions come last. The solution must not change while the moves are iterated.
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves, swaps that cannot beat it are not fully evaluated. Defaults to None.
+            ordered (bool, optional): if True, the patients are visited from the most promising one. Defaults to False.
+            patients (Union[List[int], None], optional): indices of the patients to visit. Defaults to None (all).
+            swaps (bool, optional): if True, the swap actions are generated too. Defaults to True.
+
+        Yields:
+            Iterator[Tuple[NeighboringAction, int]]: feasible move and the corresponding penalty
+        """
+        # Check if there are mandatory patients among the unscheduled ones
+        mandatory_first = (
+            self.mandatory
+            & ~self.pas.get_scheduled_patients_mask()
+            & self.window_patients
+        ).any()
+        patient_indices = patients
+        if patient_indices is None:
+            patient_indices = (
+                self.get_patient_order().tolist()
+                if ordered
+                else range(len(self.patients))
+            )
+        for patient_index in patient_indices:
+            patient: Patient = self.patients[patient_index]
+            # Unschedule and move actions if the patient is already scheduled
+            if self.pas.check_already_scheduled(patient_index):
+                slot = self.get_patient_slot(patient_index)
+                # Patients admitted outside the window are fixed
+                if not self.in_window(slot[0]):
+                    continue
+                self.pas.save()
+                self.scp.save()
+                self.nra.save()
+                self.remove_patient(patient_index)
+                unscheduled_penalty, _ = self.compute_penalty()
+                schedule_moves, schedule_penalties = self.evaluate_patient_schedules(
+                    patient_index, unscheduled_penalty
+                )
+                self.pas.restore()
+                self.scp.restore()
+                self.nra.restore()
+                evaluated = [
+                    (
+                        PASActionUnschedule(slot[0], slot[1], patient_index, slot[2]),
+                        unscheduled_penalty,
+                    )
+                ]
+                for schedule_move, p in zip(
+                    schedule_moves, schedule_penalties.tolist()
+                ):
+                    new_slot = (schedule_move.day, schedule_move.room, schedule_move.ot)
+                    if new_slot != slot:
+                        evaluated.append(
+                            (
+                                PASActionMove(
+                                    *slot[:2], patient_index, slot[2], *new_slot
+                                ),
+                                p,
+                            )
                         )
-                        moves.append(schedule_move)
+            else:
+                # If there are unscheduled mandatory patients, they have priority
+                if mandatory_first and not patient.mandatory:
+                    continue
+                schedule_moves, schedule_penalties = self.evaluate_patient_schedules(
+                    patient_index, penalty
+                )
+                evaluated = zip(schedule_moves, schedule_penalties.tolist())
+            for move, p in evaluated:
+                if bound is not None:
+                    bound.update(move, p)
+                yield move, p
+        if swaps:
+            yield from self.iterate_swap_moves(penalty, bound)
+
+    def iterate_swap_moves(
+        self,
+        penalty: int,
+        bound: Union[NeighborhoodBound, None] = None,
+        swap_moves: Union[List[NeighboringAction], None] = None,
+    ) -> Iterator[Tuple[NeighboringAction, int]]:
+        """Evaluate the feasible patient swap actions through the move cache, one move at a time
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves, swaps that cannot beat it are not fully evaluated. Defaults to None.
+            swap_moves (Union[List[NeighboringAction], None], optional): swap actions to evaluate. Defaults to None (all, see generate_swap_moves).
+
+        Yields:
+            Iterator[Tuple[NeighboringAction, int]]: feasible move and the corresponding penalty
+        """
+        if swap_moves is None:
+            swap_moves = self.generate_swap_moves()
+        for swap_move in swap_moves:
+            p = self.evaluate_cached_move(swap_move, penalty, bound)
+            if p is None:
+                continue
+            if bound is not None:
+                bound.update(swap_move, p)
+            yield swap_move, p
+
+    def evaluate_patients_moves(
+        self, penalty: int, bound: Union[NeighborhoodBound, None] = None
+    ) -> Tuple[List[NeighboringAction], List[int]]:
+        """Generate and evaluate all possible neighboring moves for the patients
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves, swaps that cannot beat it are not fully evaluated. Defaults to None.
+
+        Returns:
+            Tuple[List[NeighboringAction], List[int]]: list of feasible moves and the corresponding penalties
+        """
+        moves = []
+        penalties = []
+        for move, p in self.iterate_patients_moves(penalty, bound):
+            moves.append(move)
+            penalties.append(p)
+        return moves, penalties
+
+    def generate_nurses_moves(self) -> List[NeighboringAction]:
+        """Generate the relevant neighboring moves for the nurses
+
+        Only the (shift, room) cells where a nurse move is feasible and can matter are considered:
+        uncovered rooms hosting someone or that an unscheduled patient could need are assigned one
+        of the working nurses, while covered rooms that are empty on that day can be released.
+        Covered rooms hosting someone can be handed to another nurse: to any working nurse if the
+        room is a hot spot, otherwise to the nurses covering it in the previous and next shifts,
+        which is the only way to improve the continuity of care. Nurses can swap rooms within a
+        shift when at least one of the two rooms is a hot spot.
+
+        Returns:
+            List[NeighboringAction]: list of possible moves
+        """
+        moves = []
+        shift_types = len(self.shift_types)
+        occupied = np.repeat(self.pas.occupancy > 0, shift_types, axis=0)
+        requested = np.repeat(self.pas.admission_demand > 0, shift_types, axis=0)
+        covered = self.nra.coverage > 0
+        # Shifts outside the window are fixed
+        window = self.window_shifts[:, None]
+        # Schedule actions for the uncovered rooms that are needed
+        shifts, rooms = np.nonzero(window & ~covered & (occupied | requested))
+        for shift, room_index in zip(shifts.tolist(), rooms.tolist()):
+            for nurse_index in self.nra.shift_nurses[shift]:
+                schedule_move = NRAActionSchedule(shift, room_index, nurse_index)
+                moves.append(schedule_move)
+        # Unschedule actions for the covered rooms that are empty
+        shifts, rooms = np.nonzero(window & covered & ~occupied)
+        nurses = self.nra.room_nurse[shifts, rooms]
+        for shift, room_index, nurse_index in zip(
+            shifts.tolist(), rooms.tolist(), nurses.tolist()
+        ):
+            unschedule_move = NRAActionUnschedule(shift, room_index, nurse_index)
+            moves.append(unschedule_move)
+        # Reassign actions for the covered rooms hosting someone
+        hot_spots = self.nra.hot_spots & window
+        shifts, rooms = np.nonzero(window & covered & occupied)
+        for shift, room_index in zip(shifts.tolist(), rooms.tolist()):
+            nurse_index = self.nra.room_nurse[shift, room_index]
+            if hot_spots[shift, room_index]:
+                new_nurses = self.nra.shift_nurses[shift]
+            else:
+                neighbors = self.nra.room_nurse[
+                    max(shift - 1, 0) : shift + 2, room_index
+                ].tolist()
+                new_nurses = [n for n in self.nra.shift_nurses[shift] if n in neighbors]
+            for new_nurse_index in new_nurses:
+                if new_nurse_index != nurse_index:
+                    reassign_move = NRAActionReassign(
+                        shift, room_index, int(nurse_index), new_nurse_index
+                    )
+                    moves.append(reassign_move)
+        # Swap actions between the rooms of a shift when one of them is a hot spot
+        for shift in np.nonzero(hot_spots.any(axis=1))[0].tolist():
+            rooms = np.nonzero(covered[shift])[0].tolist()
+            for i, room_index in enumerate(rooms):
+                nurse_index = int(self.nra.room_nurse[shift, room_index])
+                for other_room_index in rooms[i + 1 :]:
+                    other_nurse_index = int(
+                        self.nra.room_nurse[shift, other_room_index]
+                    )
+                    if other_nurse_index == nurse_index or not (
+                        hot_spots[shift, room_index]
+                        or hot_spots[shift, other_room_index]
+                    ):
+                        continue
+                    swap_move = NRAActionSwap(
+                        shift,
+                        room_index,
+                        nurse_index,
+                        other_room_index,
+                        other_nurse_index,
+                    )
+                    moves.append(swap_move)
         return moves
 
+    def reassign_deltas(self, shift: int, room_index: int) -> NDArray:
+        """Compute the penalty increase caused by handing a covered room to each nurse
+
+        Args:
+            shift (int): index of the shift
+            room_index (int): index of the room
+
+        Returns:
+            NDArray: weighted penalty increase for each nurse
+        """
+        skill_delta, continuity, workload_delta = self.nra.penalty_reassign_deltas(
+            shift, room_index, np.arange(len(self.nurses))
+        )
+        return (
+            skill_delta * self.weights["room_nurse_skill"]
+            + continuity * self.weights["continuity_of_care"]
+            + workload_delta * self.weights["nurse_eccessive_workload"]
+        )
+
+    def get_nurse_assignment_costs(
+        self, shift: int
+    ) -> Tuple[NDArray, NDArray, NDArray, NDArray]:
+        """Return the cost of handing each covered room of a shift to each working nurse
+
+        Within a shift every room is handed independently, and the continuity of care only depends
+        on the nurses of the other shifts, so the costs are exact as long as the other shifts are fixed.
+
+        Args:
+            shift (int): index of the shift
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray, NDArray]: covered rooms, their current nurse, working nurses,
+            penalty increase for each room and working nurse (0 for the current nurse)
+        """
+        rooms = np.nonzero(self.nra.coverage[shift] > 0)[0]
+        nurses = np.array(self.nra.shift_nurses[shift], dtype=int)
+        costs = np.array(
+            [self.reassign_deltas(shift, room_index)[nurses] for room_index in rooms],
+            dtype=int,
+        ).reshape(len(rooms), len(nurses))
+        return rooms, self.nra.room_nurse[shift, rooms], nurses, costs
+
+    def get_cell_priorities(self) -> NDArray:
+        """Compute the skill deficit of each (shift, room), i.e. how much the skill level required by
+        the patients exceeds the one of the nurse covering the room, if any
+
+        Returns:
+            NDArray: skill deficit for each shift and room
+        """
+        nurses = self.nra.room_nurse
+        skills = np.where(nurses >= 0, self.nra.nurse_skills[nurses], 0)
+        return np.maximum(self.nra.skill_max - skills, 0)
+
+    def iterate_nurses_moves(
+        self,
+        penalty: int,
+        bound: Union[NeighborhoodBound, None] = None,
+        ordered: bool = False,
+        nurses_moves: Union[List[NeighboringAction], None] = None,
+    ) -> Iterator[Tuple[NeighboringAction, int]]:
+        """Generate and evaluate the feasible neighboring moves for the nurses, one move at a time
+
+        Reassign and swap actions only change the nurse of one or two covered rooms, so they are
+        evaluated with the S2, S3 and S4 deltas of each room, computed once per room for all the
+        nurses. The other actions are evaluated through the move cache. The solution must not
+        change while the moves are iterated.
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves, moves that cannot beat it are not fully evaluated. Defaults to None.
+            ordered (bool, optional): if True, the moves are visited from the room with the highest skill deficit. Defaults to False.
+            nurses_moves (Union[List[NeighboringAction], None], optional): moves to evaluate. Defaults to None (all, see generate_nurses_moves).
+
+        Yields:
+            Iterator[Tuple[NeighboringAction, int]]: feasible move and the corresponding penalty
+        """
+        if nurses_moves is None:
+            nurses_moves = self.generate_nurses_moves()
+        if ordered:
+            priorities = self.get_cell_priorities()
+            nurses_moves = sorted(
+                nurses_moves, key=lambda move: -priorities[move.shift, move.room]
+            )
+        # For each (shift, room), penalty increase of handing the room to each nurse
+        deltas: Dict[Tuple[int, int], NDArray] = {}
+        for move in nurses_moves:
+            if isinstance(move, NRAActionReassign):
+                cell = (move.shift, move.room)
+                if cell not in deltas:
+                    deltas[cell] = self.reassign_deltas(*cell)
+                p = penalty + int(deltas[cell][move.new_nurse])
+            elif isinstance(move, NRAActionSwap):
+                for cell in [(move.shift, move.room), (move.shift, move.other_room)]:
+                    if cell not in deltas:
+                        deltas[cell] = self.reassign_deltas(*cell)
+                p = (
+                    penalty
+                    + int(deltas[move.shift, move.room][move.other_nurse])
+                    + int(deltas[move.shift, move.other_room][move.nurse])
+                )
+            else:
+                p = self.evaluate_cached_move(move, penalty, bound)
+                if p is None:
+                    continue
+            if bound is not None:
+                bound.update(move, p)
+            yield move, p
+
+    def evaluate_nurses_moves(
+        self, penalty: int, bound: Union[NeighborhoodBound, None] = None
+    ) -> Tuple[List[NeighboringAction], List[int]]:
+        """Generate and evaluate all possible neighboring moves for the nurses
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves, moves that cannot beat it are not fully evaluated. Defaults to None.
+
+        Returns:
+            Tuple[List[NeighboringAction], List[int]]: list of feasible moves and the corresponding penalties
+        """
+        moves = []
+        penalties = []
+        for move, p in self.iterate_nurses_moves(penalty, bound):
+            moves.append(move)
+            penalties.append(p)
+        return moves, penalties
+
     def get_neighboring_moves(self) -> List[NeighboringAction]:
         """Generate all possible neighboring moves
 
@@ -1904,6 +3995,919 @@ class Hospital:
         moves.extend(nurses_moves)
         return moves
 
+    def iterate_neighboring_moves(
+        self,
+        bound: Union[NeighborhoodBound, None] = None,
+        ordered: bool = False,
+        neighborhood: Literal["full", "feasibility", "nurses"] = "full",
+    ) -> Iterator[Tuple[NeighboringAction, int]]:
+        """Generate and evaluate the feasible neighboring moves lazily, so that the scan can stop early
+
+        The patient moves come first, then the nurse moves. The solution must not change while the
+        moves are iterated.
+
+        Args:
+            bound (Union[NeighborhoodBound, None], optional): best admissible penalty found so far. Defaults to None.
+            ordered (bool, optional): if True, the patients closest to their due day or most delayed and the rooms with the highest skill deficit come first. Defaults to False.
+            neighborhood (Literal["full", "feasibility", "nurses"], optional): "full" generates every move, "feasibility" only the ones repairing a hard violation (see iterate_feasibility_moves), "nurses" only the nurse moves. Defaults to "full".
+
+        Yields:
+            Iterator[Tuple[NeighboringAction, int]]: feasible move and the corresponding penalty
+        """
+        penalty, _ = self.compute_penalty()
+        if neighborhood == "feasibility":
+            yield from self.iterate_feasibility_moves(penalty, bound)
+            return
+        if neighborhood == "full":
+            yield from self.iterate_patients_moves(penalty, bound, ordered)
+        yield from self.iterate_nurses_moves(penalty, bound, ordered)
+
+    def get_mandatory_demand(self) -> NDArray:
+        """Compute the (shift, room) cells that an unscheduled mandatory patient of the window could stay in
+
+        Returns:
+            NDArray: mask of the cells for each shift and room
+        """
+        unscheduled = (
+            self.mandatory
+            & ~self.pas.get_scheduled_patients_mask()
+            & self.window_patients
+        )
+        demand = self.pas.admission_windows[unscheduled].any(axis=0)
+        return np.repeat(demand, len(self.shift_types), axis=0)
+
+    def count_feasibility_violations(self) -> int:
+        """Count the hard violations the feasibility moves repair: unscheduled mandatory patients
+        and uncovered rooms hosting someone, within the window
+
+        Returns:
+            int: number of violations
+        """
+        occupied = np.repeat(self.pas.occupancy > 0, len(self.shift_types), axis=0)
+        uncovered = self.window_shifts[:, None] & (self.nra.coverage == 0) & occupied
+        unscheduled = (
+            self.mandatory
+            & ~self.pas.get_scheduled_patients_mask()
+            & self.window_patients
+        )
+        return int(uncovered.sum() + unscheduled.sum())
+
+    def iterate_feasibility_moves(
+        self, penalty: int, bound: Union[NeighborhoodBound, None] = None
+    ) -> Iterator[Tuple[NeighboringAction, int]]:
+        """Generate and evaluate the moves that repair a hard violation, one move at a time
+
+        Only the schedule actions of the unscheduled mandatory patients and the nurse schedule
+        actions of the uncovered rooms hosting someone, or that such a patient could need, are
+        generated, so the neighborhood is much smaller than the full one while the solution is not
+        feasible. The solution must not change while the moves are iterated.
+
+        Args:
+            penalty (int): penalty of the current solution
+            bound (Union[NeighborhoodBound, None], optional): bound tightened by the evaluated moves. Defaults to None.
+
+        Yields:
+            Iterator[Tuple[NeighboringAction, int]]: feasible move and the corresponding penalty
+        """
+        unscheduled = (
+            self.mandatory
+            & ~self.pas.get_scheduled_patients_mask()
+            & self.window_patients
+        )
+        for patient_index in np.nonzero(unscheduled)[0].tolist():
+            schedule_moves, schedule_penalties = self.evaluate_patient_schedules(
+                patient_index, penalty
+            )
+            for move, p in zip(schedule_moves, schedule_penalties.tolist()):
+                if bound is not None:
+                    bound.update(move, p)
+                yield move, p
+        occupied = np.repeat(self.pas.occupancy > 0, len(self.shift_types), axis=0)
+        needed = occupied | self.get_mandatory_demand()
+        shifts, rooms = np.nonzero(
+            self.window_shifts[:, None] & (self.nra.coverage == 0) & needed
+        )
+        for shift, room_index in zip(shifts.tolist(), rooms.tolist()):
+            for nurse_index in self.nra.shift_nurses[shift]:
+                move = NRAActionSchedule(shift, room_index, nurse_index)
+                p = self.evaluate_cached_move(move, penalty, bound)
+                if p is None:
+                    continue
+                if bound is not None:
+                    bound.update(move, p)
+                yield move, p
+
+    def get_worker(self) -> "Hospital":
+        """Return a copy of the hospital for a worker thread of the concurrent neighborhood scan
+
+        The instance data are shared, while the subsystems are copied so that the worker can
+        evaluate moves on its own state (see sync_worker). The worker reads the move cache of the
+        hospital and keeps the moves it evaluates in its own cache, merged back after each scan.
+
+        Returns:
+            Hospital: worker copy
+        """
+        worker = copy.copy(self)
+        worker.pas = copy.copy(self.pas)
+        worker.scp = copy.copy(self.scp)
+        worker.nra = copy.copy(self.nra)
+        worker.penalty_cache = PenaltyCache(self.penalty_cache.max_size)
+        worker.cutoff_counts = defaultdict(int)
+        worker.logger = Logger()
+        worker.move_cache = MoveCache(self.move_cache)
+        worker.build_penalty_components()
+        self.sync_worker(worker)
+        return worker
+
+    def sync_worker(self, worker: "Hospital"):
+        """Copy the current solution into a worker copy
+
+        Args:
+            worker (Hospital): worker copy (see get_worker)
+        """
+        worker.pas.restore(*self.pas.save())
+        worker.scp.restore(*self.scp.save())
+        worker.nra.restore(*self.nra.save())
+
+    def scan_moves(
+        self,
+        penalty: int,
+        admissible: Callable[[NeighboringAction, int], bool],
+        patients: List[int],
+        swap_moves: List[NeighboringAction],
+        nurses_moves: List[NeighboringAction],
+        bounded: bool = False,
+    ) -> List[Tuple[Union[NeighboringAction, None], float, int]]:
+        """Find the best admissible move among a chunk of patients, swap actions and nurse moves
+
+        Args:
+            penalty (int): penalty of the current solution
+            admissible (Callable[[NeighboringAction, int], bool]): whether a move and its penalty can be selected
+            patients (List[int]): indices of the patients whose moves are scanned
+            swap_moves (List[NeighboringAction]): swap actions to scan
+            nurses_moves (List[NeighboringAction]): nurse moves to scan
+            bounded (bool, optional): if True, the evaluation of a move stops as soon as it cannot beat the best admissible move of the chunk. Defaults to False.
+
+        Returns:
+            List[Tuple[Union[NeighboringAction, None], float, int]]: best admissible move, its penalty and number of
+            scanned moves, for the patient moves, the swap actions and the nurse moves
+        """
+        results = []
+        for iterate in [
+            lambda bound: self.iterate_patients_moves(
+                penalty, bound, patients=patients, swaps=False
+            ),
+            lambda bound: self.iterate_swap_moves(penalty, bound, swap_moves),
+            lambda bound: self.iterate_nurses_moves(
+                penalty, bound, nurses_moves=nurses_moves
+            ),
+        ]:
+            best_action = None
+            best_penalty = float("inf")
+            scanned = 0
+            bound = NeighborhoodBound(admissible) if bounded else None
+            for action, p in iterate(bound):
+                scanned += 1
+                if p < best_penalty and admissible(action, p):
+                    best_action = action
+                    best_penalty = p
+            results.append((best_action, best_penalty, scanned))
+        return results
+
+    def find_best_move_concurrently(
+        self,
+        executor: Executor,
+        workers: List["Hospital"],
+        admissible: Callable[[NeighboringAction, int], bool],
+        bounded: bool = False,
+        neighborhood: Literal["full", "nurses"] = "full",
+    ) -> Tuple[Union[NeighboringAction, None], float, int]:
+        """Find the best admissible neighboring move, scanning chunks of the neighborhood in worker threads
+
+        Each worker evaluates a contiguous chunk of the patients, of the swap actions and of the
+        nurse moves on its copy of the current solution, with a bound local to each chunk if
+        bounded. The best moves of the chunks are reduced in the order of the serial scan, so the
+        result is the same as the one of iterate_neighboring_moves. The moves evaluated by the
+        workers are then merged into the move cache.
+
+        Args:
+            executor (Executor): thread pool
+            workers (List[Hospital]): one worker copy per thread (see get_worker)
+            admissible (Callable[[NeighboringAction, int], bool]): whether a move and its penalty can be selected
+            bounded (bool, optional): if True, the evaluation of a move stops as soon as it cannot beat the best admissible move of its chunk. Defaults to False.
+            neighborhood (Literal["full", "nurses"], optional): "full" scans every move, "nurses" only the nurse moves. Defaults to "full".
+
+        Returns:
+            Tuple[Union[NeighboringAction, None], float, int]: best admissible move, its penalty and number of scanned moves
+        """
+        penalty, _ = self.compute_penalty()
+        for worker in workers:
+            self.sync_worker(worker)
+        chunks = len(workers)
+        patients = []
+        swap_moves = []
+        if neighborhood == "full":
+            patients = list(range(len(self.patients)))
+            swap_moves = self.generate_swap_moves()
+        nurses_moves = self.generate_nurses_moves()
+        futures = [
+            executor.submit(
+                worker.scan_moves,
+                penalty,
+                admissible,
+                *[
+                    moves[w * len(moves) // chunks : (w + 1) * len(moves) // chunks]
+                    for moves in [patients, swap_moves, nurses_moves]
+                ],
+                bounded,
+            )
+            for w, worker in enumerate(workers)
+        ]
+        results = [future.result() for future in futures]
+        for worker in workers:
+            self.move_cache.merge(worker.move_cache)
+        best_action = None
+        best_penalty = float("inf")
+        scanned = 0
+        # Patient moves of all the chunks first, then swap actions, then nurse moves
+        for part in range(3):
+            for result in results:
+                action, p, count = result[part]
+                scanned += count
+                if p < best_penalty:
+                    best_action = action
+                    best_penalty = p
+        return best_action, best_penalty, scanned
+
+    def evaluate_neighboring_moves(
+        self, bound: Union[NeighborhoodBound, None] = None
+    ) -> Tuple[List[NeighboringAction], List[int]]:
+        """Generate and evaluate all possible neighboring moves
+
+        Patient schedule and move actions are evaluated in one batched pass per patient, nurse
+        reassign and swap actions with per-room deltas, the other moves through the move cache,
+        which only re-evaluates the moves touched by the previously committed ones. Infeasible
+        moves are discarded.
+
+        With a bound, the moves are evaluated in the order they are returned and each move that is
+        not cached stops as soon as it cannot beat the best admissible move evaluated before it: its
+        penalty is then a lower bound, which is not smaller than the penalty of that move.
+
+        Args:
+            bound (Union[NeighborhoodBound, None], optional): best admissible penalty found so far. Defaults to None.
+
+        Returns:
+            Tuple[List[NeighboringAction], List[int]]: list of feasible moves and the corresponding penalties
+        """
+        moves = []
+        penalties = []
+        for move, p in self.iterate_neighboring_moves(bound):
+            moves.append(move)
+            penalties.append(p)
+        return moves, penalties
+
+    def check_room_available(
+        self, day: int, room_index: int, patient_index: int
+    ) -> bool:
+        """Check the room constraints of a stay from the dynamic masks, without changing the state:
+        gender mix (H1), room capacity (H7) and room coverage (H8)
+
+        Args:
+            day (int): admission day
+            room_index (int): index of the room
+            patient_index (int): index of the patient
+
+        Returns:
+            bool: True if the patient can stay in the room, False otherwise
+        """
+        patient: Patient = self.patients[patient_index]
+        end_day = min(self.days, day + patient.length_of_stay)
+        return (
+            self.pas.check_gender(day, end_day, patient, room_index)
+            and not self.pas.room_full[day:end_day, room_index].any()
+            and self.nra.check_room_covered_day(day, end_day, room_index)
+        )
+
+    def sample_admission(
+        self,
+        rng: np.random.Generator,
+        patient_index: int,
+        slot: Union[Tuple[int, int, int], None] = None,
+    ) -> Union[Tuple[int, int, int], None]:
+        """Draw a random admission day within the window and a random compatible room for a patient,
+        with the cheapest operating theater of that day
+
+        The day and the room come from the candidate tables (H2, H6), and the surgeon (H3) and
+        operating theater (H4) availability of the drawn day is checked on the current state. The
+        room constraints are left to check_room_available or to apply_action.
+
+        Args:
+            rng (np.random.Generator): random number generator
+            patient_index (int): index of the patient
+            slot (Union[Tuple[int, int, int], None], optional): current day, room and operating theater of the patient, which keeps its operating theater if the same day is drawn. Defaults to None (not scheduled).
+
+        Returns:
+            Union[Tuple[int, int, int], None]: day, room and operating theater, None if the drawn day is not available
+        """
+        days = self.candidate_days[patient_index]
+        if len(days) == 0:
+            return None
+        # The candidate days are consecutive
+        start_day = max(int(days[0]), self.window[0])
+        end_day = min(int(days[-1]) + 1, self.window[1])
+        if start_day >= end_day:
+            return None
+        day = int(rng.integers(start_day, end_day))
+        rooms = self.candidate_rooms[patient_index]
+        room_index = int(rooms[rng.integers(len(rooms))])
+        if slot is not None and day == slot[0]:
+            # The surgery does not move
+            return day, room_index, slot[2]
+        patient: Patient = self.patients[patient_index]
+        surgeon_index = self.patient_surgeons[patient_index]
+        if not self.scp.check_surgeon_overtime(
+            day, patient.surgeon, surgeon_index, patient
+        ):
+            return None
+        ot_indices, _ = self.best_operating_theaters(
+            np.array([day]), patient, surgeon_index
+        )
+        if ot_indices[0] < 0:
+            return None
+        return day, room_index, int(ot_indices[0])
+
+    def sample_patient_move(
+        self, rng: np.random.Generator
+    ) -> Union[NeighboringAction, None]:
+        """Draw a random patient and one of its moves: a schedule action if the patient is not
+        scheduled, otherwise an unschedule, move or swap action with equal probability
+
+        Args:
+            rng (np.random.Generator): random number generator
+
+        Returns:
+            Union[NeighboringAction, None]: move, None if the patient is fixed by the window or the drawn move is known to be infeasible
+        """
+        patient_index = int(rng.integers(len(self.patients)))
+        if not self.pas.check_already_scheduled(patient_index):
+            if not self.window_patients[patient_index]:
+                return None
+            admission = self.sample_admission(rng, patient_index)
+            if admission is None:
+                return None
+            day, room_index, ot_index = admission
+            if not self.check_room_available(day, room_index, patient_index):
+                return None
+            return PASActionSchedule(day, room_index, patient_index, ot_index)
+        slot = self.get_patient_slot(patient_index)
+        if not self.in_window(slot[0]):
+            return None
+        kind = rng.integers(3)
+        if kind == 0:
+            return PASActionUnschedule(slot[0], slot[1], patient_index, slot[2])
+        if kind == 1:
+            # The patient is not removed: the other hard constraints are checked by apply_action
+            new_slot = self.sample_admission(rng, patient_index, slot)
+            if new_slot is None or new_slot == slot:
+                return None
+            # The occupancy of the current room still includes the patient
+            if new_slot[1] != slot[1] and not self.check_room_available(
+                new_slot[0], new_slot[1], patient_index
+            ):
+                return None
+            return PASActionMove(*slot[:2], patient_index, slot[2], *new_slot)
+        other_patient_index = int(rng.integers(len(self.patients)))
+        if (
+            other_patient_index == patient_index
+            or not self.pas.check_already_scheduled(other_patient_index)
+        ):
+            return None
+        other_slot = self.get_patient_slot(other_patient_index)
+        if not self.in_window(other_slot[0]):
+            return None
+        # Each room must be compatible with the other patient, as in generate_swap_moves
+        if (
+            other_slot[1] not in self.candidate_rooms[patient_index]
+            or slot[1] not in self.candidate_rooms[other_patient_index]
+        ):
+            return None
+        return PASActionSwap(
+            *slot[:2],
+            patient_index,
+            slot[2],
+            *other_slot[:2],
+            other_patient_index,
+            other_slot[2],
+        )
+
+    def sample_nurse_move(
+        self, rng: np.random.Generator
+    ) -> Union[NeighboringAction, None]:
+        """Draw a random (shift, room) and one of its moves: a working nurse is assigned if the room
+        is not covered, otherwise the nurse is unassigned, replaced by a working nurse or swapped
+        with the nurse of another room with equal probability
+
+        Args:
+            rng (np.random.Generator): random number generator
+
+        Returns:
+            Union[NeighboringAction, None]: move, None if the shift is fixed by the window or no nurse works on it
+        """
+        shift = int(rng.integers(len(self.window_shifts)))
+        room_index = int(rng.integers(len(self.rooms)))
+        nurses = self.nra.shift_nurses[shift]
+        if not self.window_shifts[shift] or not nurses:
+            return None
+        new_nurse_index = nurses[rng.integers(len(nurses))]
+        nurse_index = int(self.nra.room_nurse[shift, room_index])
+        if nurse_index < 0:
+            return NRAActionSchedule(shift, room_index, new_nurse_index)
+        kind = rng.integers(3)
+        if kind == 0:
+            return NRAActionUnschedule(shift, room_index, nurse_index)
+        if kind == 1:
+            if new_nurse_index == nurse_index:
+                return None
+            return NRAActionReassign(shift, room_index, nurse_index, new_nurse_index)
+        other_room_index = int(rng.integers(len(self.rooms)))
+        other_nurse_index = int(self.nra.room_nurse[shift, other_room_index])
+        if other_nurse_index < 0 or other_nurse_index == nurse_index:
+            return None
+        return NRAActionSwap(
+            shift, room_index, nurse_index, other_room_index, other_nurse_index
+        )
+
+    def sample_neighboring_move(
+        self, rng: np.random.Generator, attempts: int = 10
+    ) -> Union[NeighboringAction, None]:
+        """Draw a random neighboring move without generating the neighborhood
+
+        A patient move or a nurse move is drawn with equal probability, and a move of the same
+        kind is drawn again if the drawn patient or shift admits no move. The move is only
+        partially checked against the hard constraints, apply_action checks all of them.
+
+        Args:
+            rng (np.random.Generator): random number generator
+            attempts (int, optional): maximum number of draws. Defaults to 10.
+
+        Returns:
+            Union[NeighboringAction, None]: move, None if no draw gave a move
+        """
+        sample = self.sample_patient_move if rng.random() < 0.5 else self.sample_nurse_move
+        for _ in range(attempts):
+            action = sample(rng)
+            if action is not None:
+                return action
+        return None
+
+    def get_related_patients(
+        self,
+        rng: np.random.Generator,
+        relatedness: Literal["surgeon", "room", "days", "random"],
+        size: int,
+        span: int = 2,
+    ) -> List[int]:
+        """Draw a cluster of related scheduled patients around a random seed patient
+
+        Related patients have the same surgeon and are admitted within span days of the seed
+        ("surgeon"), are in the same room ("room"), are admitted within span days of the seed
+        ("days") or are any scheduled patient ("random"). Patients admitted outside the window are
+        fixed and never drawn.
+
+        Args:
+            rng (np.random.Generator): random number generator
+            relatedness (Literal["surgeon", "room", "days", "random"]): how the patients are related to the seed
+            size (int): maximum number of patients in the cluster
+            span (int, optional): maximum distance in days from the admission of the seed. Defaults to 2.
+
+        Returns:
+            List[int]: indices of the patients, seed first
+        """
+        slots = {}
+        for patient_index in np.nonzero(self.pas.get_scheduled_patients_mask())[0]:
+            slot = self.get_patient_slot(int(patient_index))
+            if self.in_window(slot[0]):
+                slots[int(patient_index)] = slot
+        if not slots:
+            return []
+        patients = list(slots)
+        seed = patients[rng.integers(len(patients))]
+        day, room_index, _ = slots[seed]
+        if relatedness == "surgeon":
+            related = [
+                p
+                for p in patients
+                if self.patient_surgeons[p] == self.patient_surgeons[seed]
+                and abs(slots[p][0] - day) <= span
+            ]
+        elif relatedness == "room":
+            related = [p for p in patients if slots[p][1] == room_index]
+        elif relatedness == "days":
+            related = [p for p in patients if abs(slots[p][0] - day) <= span]
+        else:
+            related = patients
+        related = [p for p in related if p != seed]
+        drawn = rng.choice(len(related), min(size - 1, len(related)), replace=False)
+        return [seed] + [related[i] for i in drawn]
+
+    def recreate_patients(self, patients: List[int], regret: int = 2) -> List[int]:
+        """Schedule unscheduled patients again with regret-k insertion
+
+        At each step every remaining patient is evaluated at once over all its (day, room, OT)
+        candidates, and the one with the largest regret, i.e. the sum of the differences between
+        its k cheapest insertions and its cheapest one, is inserted at its cheapest position.
+        Mandatory patients and patients with fewer than k candidates go first; with k = 1 this is the
+        greedy cheapest insertion.
+
+        Args:
+            patients (List[int]): indices of the unscheduled patients
+            regret (int, optional): number of insertions considered for the regret. Defaults to 2.
+
+        Returns:
+            List[int]: indices of the patients that could not be scheduled
+        """
+        remaining = list(patients)
+        while remaining:
+            penalty, _ = self.compute_penalty()
+            best_key = None
+            best_move = None
+            for patient_index in remaining:
+                moves, penalties = self.evaluate_patient_schedules(
+                    patient_index, penalty
+                )
+                if not moves:
+                    continue
+                cheapest = np.argsort(penalties, kind="stable")[:regret]
+                cost = penalties[cheapest[0]]
+                regret_value = (
+                    float("inf")
+                    if len(cheapest) < regret
+                    else int((penalties[cheapest] - cost).sum())
+                )
+                key = (self.mandatory[patient_index], regret_value, -cost)
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best_move = moves[cheapest[0]]
+            if best_move is None:
+                break
+            self.apply_action(best_move, assign=True)
+            remaining.remove(best_move.patient)
+        return remaining
+
+    def ruin_and_recreate(
+        self,
+        rng: np.random.Generator,
+        relatedness: Literal["surgeon", "room", "days", "random"] = "surgeon",
+        size: int = 5,
+        regret: int = 2,
+    ) -> int:
+        """Large neighborhood search step: unschedule a cluster of related patients and schedule them
+        again with regret-k insertion
+
+        Args:
+            rng (np.random.Generator): random number generator
+            relatedness (Literal["surgeon", "room", "days", "random"], optional): how the patients of the cluster are related. Defaults to "surgeon".
+            size (int, optional): maximum number of patients in the cluster. Defaults to 5.
+            regret (int, optional): number of insertions considered for the regret. Defaults to 2.
+
+        Returns:
+            int: penalty of the new solution
+        """
+        patients = self.get_related_patients(rng, relatedness, size)
+        for patient_index in patients:
+            day, room_index, ot_index = self.get_patient_slot(patient_index)
+            self.apply_action(
+                PASActionUnschedule(day, room_index, patient_index, ot_index),
+                assign=True,
+            )
+        self.recreate_patients(patients, regret)
+        penalty, _ = self.compute_penalty()
+        return penalty
+
+    def build_batch_tables(self):
+        """Compute the patient, nurse and surgeon arrays used to evaluate batches of solutions"""
+        shift_types = len(self.shift_types)
+        genders = sorted(
+            {patient.gender for patient in self.patients}
+            | {occupant.gender for occupant in self.occupants}
+        )
+        self.patient_genders = np.array(
+            [genders.index(patient.gender) for patient in self.patients], dtype=int
+        )
+        # For every day, gender of the occupants of each room (-1 if empty)
+        self.gender_baseline = np.array(
+            [
+                [genders.index(g) if g else -1 for g in row]
+                for row in self.pas.gender_baseline
+            ],
+            dtype=int,
+        ).reshape(self.days, len(self.rooms))
+        self.gender_count = len(genders)
+        self.patient_ages = np.array(
+            [patient.age_group for patient in self.patients], dtype=int
+        )
+        self.patient_stays = np.array(
+            [patient.length_of_stay for patient in self.patients], dtype=int
+        )
+        self.patient_durations = np.array(
+            [patient.surgery_duration for patient in self.patients], dtype=int
+        )
+        self.patient_releases = np.array(
+            [patient.surgery_release_day for patient in self.patients], dtype=int
+        )
+        # Latest admission day of each patient (the last day for optional patients)
+        self.patient_dues = np.array(
+            [
+                patient.surgery_due_day if patient.mandatory else self.days - 1
+                for patient in self.patients
+            ],
+            dtype=int,
+        )
+        # For each patient, mask of the incompatible rooms
+        self.incompatible_rooms = np.zeros(
+            (len(self.patients), len(self.rooms)), dtype=bool
+        )
+        for patient_index, patient in enumerate(self.patients):
+            for room in patient.incompatible_rooms:
+                self.incompatible_rooms[
+                    patient_index, self.indexer.reverse_lookup("rooms", room.id)
+                ] = True
+        # For each patient, workload produced and skill level required in each shift of the stay
+        max_shifts = max(self.patient_stays.max(initial=1), 1) * shift_types
+        self.patient_workloads = np.zeros((len(self.patients), max_shifts), dtype=int)
+        self.patient_skills = np.zeros((len(self.patients), max_shifts), dtype=int)
+        for patient_index, patient in enumerate(self.patients):
+            length = patient.length_of_stay * shift_types
+            self.patient_workloads[patient_index, :length] = patient.workload_produced[
+                :length
+            ]
+            self.patient_skills[patient_index, :length] = patient.skill_level_required[
+                :length
+            ]
+        # For each shift, keep track of the nurses that are working
+        self.nurse_available = np.array(
+            [nurse.available for nurse in self.nurses], dtype=bool
+        ).T
+        # For each day, maximum surgery time of each surgeon
+        self.surgeon_max_times = np.array(
+            [surgeon.max_surgery_time for surgeon in self.surgeons], dtype=int
+        ).T
+
+    def get_solution_vectors(self) -> Tuple[NDArray, NDArray, NDArray, NDArray]:
+        """Return the current solution as assignment vectors, in the format of evaluate_solutions
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray, NDArray]: admission day, room and operating theater of each patient
+            (-1 if unscheduled), nurse of each shift and room (-1 if uncovered)
+        """
+        admission_days = np.full(len(self.patients), -1, dtype=int)
+        rooms = np.full(len(self.patients), -1, dtype=int)
+        operating_theaters = np.full(len(self.patients), -1, dtype=int)
+        for patient_index in np.nonzero(self.pas.get_scheduled_patients_mask())[0]:
+            slot = self.get_patient_slot(int(patient_index))
+            (
+                admission_days[patient_index],
+                rooms[patient_index],
+                operating_theaters[patient_index],
+            ) = slot
+        return admission_days, rooms, operating_theaters, self.nra.room_nurse.copy()
+
+    def load_solution_vectors(
+        self,
+        admission_days: NDArray,
+        rooms: NDArray,
+        operating_theaters: NDArray,
+        nurses: NDArray,
+    ) -> int:
+        """Replace the current solution with one given as assignment vectors (see get_solution_vectors)
+
+        The mandatory patients are scheduled first, and patients that cannot be scheduled are left
+        unscheduled.
+
+        Args:
+            admission_days (NDArray): admission day of each patient (-1 if unscheduled)
+            rooms (NDArray): room of each patient
+            operating_theaters (NDArray): operating theater of each patient
+            nurses (NDArray): nurse of each shift and room (-1 if uncovered)
+
+        Returns:
+            int: number of patients that could not be scheduled
+        """
+        patient_indices = np.nonzero(admission_days >= 0)[0]
+        patient_indices = patient_indices[
+            np.argsort(~self.mandatory[patient_indices], kind="stable")
+        ]
+        patient_slots = [
+            (
+                int(p),
+                int(admission_days[p]),
+                int(rooms[p]),
+                int(operating_theaters[p]),
+            )
+            for p in patient_indices
+        ]
+        shifts, room_indices = np.nonzero(nurses >= 0)
+        nurse_cells = list(
+            zip(
+                shifts.tolist(),
+                room_indices.tolist(),
+                nurses[shifts, room_indices].tolist(),
+            )
+        )
+        return self.load_window_solution(0, self.days, patient_slots, nurse_cells)
+
+    def evaluate_solutions(
+        self,
+        admission_days: NDArray,
+        rooms: NDArray,
+        operating_theaters: NDArray,
+        nurses: NDArray,
+    ) -> Tuple[NDArray, Dict[str, NDArray], Dict[str, NDArray]]:
+        """Evaluate a batch of complete solutions at once, without changing the current state
+
+        The solutions are given as assignment vectors with a leading population axis, and every
+        hard constraint and soft penalty is computed with array operations over the whole batch.
+
+        Args:
+            admission_days (NDArray): admission day of each patient (-1 if unscheduled), shape (solutions, patients)
+            rooms (NDArray): room of each patient, shape (solutions, patients)
+            operating_theaters (NDArray): operating theater of each patient, shape (solutions, patients)
+            nurses (NDArray): nurse of each shift and room (-1 if uncovered), shape (solutions, shifts, rooms)
+
+        Returns:
+            Tuple[NDArray, Dict[str, NDArray], Dict[str, NDArray]]: overall penalty, individual penalties and
+            number of violations of each hard constraint, for each solution
+        """
+        admission_days = np.atleast_2d(admission_days)
+        rooms = np.atleast_2d(rooms)
+        operating_theaters = np.atleast_2d(operating_theaters)
+        nurses = nurses.reshape(-1, *self.nra.room_nurse.shape)
+        solutions, patients = admission_days.shape
+        shift_types = len(self.shift_types)
+        shifts = self.days * shift_types
+        room_count = len(self.rooms)
+        scheduled = admission_days >= 0
+        patient_indices = np.broadcast_to(np.arange(patients), (solutions, patients))
+        violations = {}
+
+        # PAS: for every day of each stay, keep track of the room
+        offsets = np.arange(self.patient_stays.max(initial=1))
+        stay_days = admission_days[:, :, None] + offsets
+        in_stay = (
+            scheduled[:, :, None]
+            & (offsets < self.patient_stays[:, None])
+            & (stay_days < self.days)
+        )
+        b, p, k = np.nonzero(in_stay)
+        d, r = stay_days[b, p, k], rooms[b, p]
+        occupancy = np.broadcast_to(
+            self.pas.occupancy_baseline, (solutions, self.days, room_count)
+        ).copy()
+        np.add.at(occupancy, (b, d, r), 1)
+        gender_present = np.zeros(
+            (solutions, self.days, room_count, self.gender_count), dtype=bool
+        )
+        baseline_days, baseline_rooms = np.nonzero(self.gender_baseline >= 0)
+        gender_present[
+            :,
+            baseline_days,
+            baseline_rooms,
+            self.gender_baseline[baseline_days, baseline_rooms],
+        ] = True
+        gender_present[b, d, r, self.patient_genders[p]] = True
+        age_histogram = np.broadcast_to(
+            self.pas.age_baseline, (solutions, *self.pas.age_baseline.shape)
+        ).copy()
+        np.add.at(age_histogram, (b, d, r, self.patient_ages[p]), 1)
+
+        # Constraint H1: No gender mix
+        violations["H1"] = (gender_present.sum(axis=-1) > 1).sum(axis=(1, 2))
+        # Constraint H2: Compatible rooms
+        violations["H2"] = (
+            scheduled & self.incompatible_rooms[patient_indices, rooms]
+        ).sum(axis=1)
+        # Constraint H5: Mandatory patients
+        violations["H5"] = (~scheduled & self.mandatory).sum(axis=1)
+        # Constraint H6: Admission day
+        violations["H6"] = (
+            scheduled
+            & (
+                (admission_days < self.patient_releases)
+                | (admission_days > self.patient_dues)
+            )
+        ).sum(axis=1)
+        # Constraint H7: Room capacity
+        violations["H7"] = (occupancy > self.pas.capacities).sum(axis=(1, 2))
+
+        # SCP: surgery time of each operating theater and surgeon, surgeries of each surgeon in each operating theater
+        b, p = np.nonzero(scheduled)
+        d, o, g = (
+            admission_days[b, p],
+            operating_theaters[b, p],
+            self.patient_surgeons[p],
+        )
+        ot_time = np.zeros(
+            (solutions, self.days, len(self.operating_theaters)), dtype=int
+        )
+        np.add.at(ot_time, (b, d, o), self.patient_durations[p])
+        surgeon_time = np.zeros((solutions, self.days, len(self.surgeons)), dtype=int)
+        np.add.at(surgeon_time, (b, d, g), self.patient_durations[p])
+        surgeon_ots = np.zeros(
+            (solutions, self.days, len(self.surgeons), len(self.operating_theaters)),
+            dtype=bool,
+        )
+        surgeon_ots[b, d, g, o] = True
+
+        # Constraint H3: Surgeon overtime
+        violations["H3"] = (surgeon_time > self.surgeon_max_times).sum(axis=(1, 2))
+        # Constraint H4: OT overtime
+        violations["H4"] = (ot_time > self.ot_availability).sum(axis=(1, 2))
+
+        # NRA: for every shift of each stay, keep track of the room and of the nurse
+        offsets = np.arange(self.patient_workloads.shape[1])
+        stay_shifts = admission_days[:, :, None] * shift_types + offsets
+        in_stay = (
+            scheduled[:, :, None]
+            & (offsets < self.patient_stays[:, None] * shift_types)
+            & (stay_shifts < shifts)
+        )
+        b, p, k = np.nonzero(in_stay)
+        t, r = stay_shifts[b, p, k], rooms[b, p]
+        workload_sum = np.broadcast_to(
+            self.nra.workload_baseline, (solutions, shifts, room_count)
+        ).copy()
+        np.add.at(workload_sum, (b, t, r), self.patient_workloads[p, k])
+        skill_max = np.broadcast_to(
+            self.nra.skill_baseline, (solutions, shifts, room_count)
+        ).copy()
+        np.maximum.at(skill_max, (b, t, r), self.patient_skills[p, k])
+        stay_nurses = np.full(in_stay.shape, -1, dtype=int)
+        stay_nurses[b, p, k] = nurses[b, t, r]
+        covered = nurses >= 0
+        cell_nurses = np.where(covered, nurses, 0)
+
+        # Constraint H8: Room coverage, by nurses working on the shift
+        occupied = np.repeat(occupancy > 0, shift_types, axis=1)
+        working = self.nurse_available[np.arange(shifts)[:, None], cell_nurses]
+        violations["H8"] = (occupied & ~covered).sum(axis=(1, 2)) + (
+            covered & ~working
+        ).sum(axis=(1, 2))
+
+        penalty_dict = {}
+        # Constraint S1: Age group
+        present = age_histogram > 0
+        age_range = (
+            present.shape[-1]
+            - 1
+            - present[..., ::-1].argmax(axis=-1)
+            - present.argmax(axis=-1)
+        )
+        penalty_dict["S1"] = (
+            np.where(present.any(axis=-1), age_range, 0).sum(axis=(1, 2))
+            * self.weights["room_mixed_age"]
+        )
+        # Constraint S2: Minimum skill level
+        skill_deficit = np.maximum(skill_max - self.nra.nurse_skills[cell_nurses], 0)
+        penalty_dict["S2"] = (
+            np.where(covered, skill_deficit, 0).sum(axis=(1, 2))
+            * self.weights["room_nurse_skill"]
+        )
+        # Constraint S3: Continuity of care, i.e. number of distinct nurses of each patient
+        stay_nurses.sort(axis=-1)
+        distinct = (stay_nurses[..., 1:] != stay_nurses[..., :-1]) & (
+            stay_nurses[..., 1:] >= 0
+        )
+        continuity = distinct.sum(axis=-1) + (stay_nurses[..., 0] >= 0)
+        penalty_dict["S3"] = continuity.sum(axis=1) * self.weights["continuity_of_care"]
+        # Constraint S4: Maximum workload
+        max_loads = self.nra.nurse_max_loads[np.arange(shifts)[:, None], cell_nurses]
+        excess = np.maximum(workload_sum - max_loads, 0)
+        penalty_dict["S4"] = (
+            np.where(covered, excess, 0).sum(axis=(1, 2))
+            * self.weights["nurse_eccessive_workload"]
+        )
+        # Constraint S5: Open OT
+        penalty_dict["S5"] = (ot_time > 0).sum(axis=(1, 2)) * self.weights[
+            "open_operating_theater"
+        ]
+        # Constraint S6: Surgeon transfer
+        transfers = np.maximum(surgeon_ots.sum(axis=-1) - 1, 0)
+        penalty_dict["S6"] = (
+            transfers.sum(axis=(1, 2)) * self.weights["surgeon_transfer"]
+        )
+        # Constraint S7: Admission delay
+        delay = np.where(
+            scheduled, np.maximum(admission_days - self.patient_releases, 0), 0
+        )
+        penalty_dict["S7"] = delay.sum(axis=1) * self.weights["patient_delay"]
+        # Constraint S8: Unscheduled patients
+        penalty_dict["S8"] = (~scheduled).sum(axis=1) * self.weights[
+            "unscheduled_optional"
+        ]
+
+        penalty = sum(penalty_dict.values())
+        return penalty, penalty_dict, dict(sorted(violations.items()))
+
     def json_dump(self, filename: str, log_filename: str = ""):
         """Dump the current status of the hospital in a JSON file
 
@@ -0,0 +1,207 @@
+import os
+from typing import List, Tuple
+import numpy as np
+from numpy.typing import NDArray
+
+
+class NumpyKernels:
+    """Hot evaluation routines implemented with NumPy array operations, always available"""
+
+    name = "numpy"
+
+    @staticmethod
+    def skill_deficit(
+        nra_matrix: NDArray, skill_max: NDArray, nurse_skills: NDArray
+    ) -> int:
+        """Sum the skill deficits of the nurses covering each (shift, room)
+
+        Args:
+            nra_matrix (NDArray): mask of the nurses covering each shift and room
+            skill_max (NDArray): maximum skill level required in each shift and room
+            nurse_skills (NDArray): skill level of each nurse
+
+        Returns:
+            int: sum of the skill deficits
+        """
+        shifts, rooms, nurses = np.nonzero(nra_matrix)
+        return int(np.maximum(skill_max[shifts, rooms] - nurse_skills[nurses], 0).sum())
+
+    @staticmethod
+    def excess_workload(
+        nra_matrix: NDArray, workload_sum: NDArray, nurse_max_loads: NDArray
+    ) -> int:
+        """Sum the workloads exceeding the maximum load of the nurses covering each (shift, room)
+
+        Args:
+            nra_matrix (NDArray): mask of the nurses covering each shift and room
+            workload_sum (NDArray): workload of each shift and room
+            nurse_max_loads (NDArray): maximum load of each nurse in each shift
+
+        Returns:
+            int: sum of the excessive workloads
+        """
+        shifts, rooms, nurses = np.nonzero(nra_matrix)
+        excess = workload_sum[shifts, rooms] - nurse_max_loads[shifts, nurses]
+        return int(np.maximum(excess, 0).sum())
+
+    @staticmethod
+    def continuity(nra_matrix: NDArray, patient_matrix: NDArray) -> int:
+        """Sum the number of distinct nurses covering the room of each patient during the stay
+
+        Args:
+            nra_matrix (NDArray): mask of the nurses covering each shift and room
+            patient_matrix (NDArray): mask of the patients staying in each shift and room
+
+        Returns:
+            int: sum of the number of distinct nurses of each patient
+        """
+        patients = patient_matrix.shape[-1]
+        nurses = nra_matrix.shape[-1]
+        # For each patient and nurse, number of shifts of the stay the nurse covers the room in
+        shared = patient_matrix.reshape(-1, patients).T.astype(np.float64) @ (
+            nra_matrix.reshape(-1, nurses).astype(np.float64)
+        )
+        return int((shared > 0).sum())
+
+    @staticmethod
+    def age_range(age_histogram: NDArray) -> Tuple[NDArray, NDArray, NDArray]:
+        """Find the youngest and oldest age group of each (day, room)
+
+        Args:
+            age_histogram (NDArray): number of people of each age group in each day and room
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray]: minimum age group, maximum age group, mask of occupied rooms
+        """
+        present = age_histogram > 0
+        occupied = present.any(axis=-1)
+        min_age = present.argmax(axis=-1)
+        max_age = present.shape[-1] - 1 - present[:, :, ::-1].argmax(axis=-1)
+        return min_age, max_age, occupied
+
+    @staticmethod
+    def gender_fits(room_gender: NDArray, gender: str) -> bool:
+        """Check that a room only hosts people of a gender over some days
+
+        The room genders are an object array, so this routine is not compiled by NumbaKernels.
+
+        Args:
+            room_gender (NDArray): gender of each day of the room ("" if empty)
+            gender (str): gender of the patient
+
+        Returns:
+            bool: True if the room is empty or hosts people of that gender every day
+        """
+        return bool(((room_gender == "") | (room_gender == gender)).all())
+
+
+# The compiled backend is used when Numba is installed, unless HOSPITAL_KERNELS=numpy
+NumbaKernels = None
+if os.environ.get("HOSPITAL_KERNELS", "numba") != "numpy":
+    try:
+        import numba
+    except ImportError:
+        numba = None
+
+    if numba is not None:
+
+        @numba.njit(cache=True)
+        def numba_skill_deficit(nra_matrix, skill_max, nurse_skills):
+            total = 0
+            shifts, rooms, nurses = nra_matrix.shape
+            for shift in range(shifts):
+                for room in range(rooms):
+                    for nurse in range(nurses):
+                        if nra_matrix[shift, room, nurse]:
+                            total += max(
+                                skill_max[shift, room] - nurse_skills[nurse], 0
+                            )
+            return total
+
+        @numba.njit(cache=True)
+        def numba_excess_workload(nra_matrix, workload_sum, nurse_max_loads):
+            total = 0
+            shifts, rooms, nurses = nra_matrix.shape
+            for shift in range(shifts):
+                for room in range(rooms):
+                    for nurse in range(nurses):
+                        if nra_matrix[shift, room, nurse]:
+                            total += max(
+                                workload_sum[shift, room]
+                                - nurse_max_loads[shift, nurse],
+                                0,
+                            )
+            return total
+
+        @numba.njit(cache=True)
+        def numba_continuity(nra_matrix, patient_matrix):
+            total = 0
+            shifts, rooms, patients = patient_matrix.shape
+            nurses = nra_matrix.shape[-1]
+            seen = np.zeros(nurses, dtype=np.bool_)
+            for patient in range(patients):
+                seen[:] = False
+                for shift in range(shifts):
+                    for room in range(rooms):
+                        if patient_matrix[shift, room, patient]:
+                            for nurse in range(nurses):
+                                if nra_matrix[shift, room, nurse]:
+                                    seen[nurse] = True
+                total += seen.sum()
+            return total
+
+        @numba.njit(cache=True)
+        def numba_age_range(age_histogram):
+            days, rooms, age_groups = age_histogram.shape
+            min_age = np.zeros((days, rooms), dtype=np.int64)
+            max_age = np.full((days, rooms), age_groups - 1, dtype=np.int64)
+            occupied = np.zeros((days, rooms), dtype=np.bool_)
+            for day in range(days):
+                for room in range(rooms):
+                    for age in range(age_groups):
+                        if age_histogram[day, room, age] > 0:
+                            if not occupied[day, room]:
+                                min_age[day, room] = age
+                                occupied[day, room] = True
+                            max_age[day, room] = age
+            return min_age, max_age, occupied
+
+        class NumbaKernels(NumpyKernels):
+            """Hot evaluation routines compiled with Numba, except gender_fits, whose object arrays are left to NumPy"""
+
+            name = "numba"
+
+            @staticmethod
+            def skill_deficit(
+                nra_matrix: NDArray, skill_max: NDArray, nurse_skills: NDArray
+            ) -> int:
+                return int(numba_skill_deficit(nra_matrix, skill_max, nurse_skills))
+
+            @staticmethod
+            def excess_workload(
+                nra_matrix: NDArray, workload_sum: NDArray, nurse_max_loads: NDArray
+            ) -> int:
+                return int(
+                    numba_excess_workload(nra_matrix, workload_sum, nurse_max_loads)
+                )
+
+            @staticmethod
+            def continuity(nra_matrix: NDArray, patient_matrix: NDArray) -> int:
+                return int(numba_continuity(nra_matrix, patient_matrix))
+
+            @staticmethod
+            def age_range(age_histogram: NDArray) -> Tuple[NDArray, NDArray, NDArray]:
+                return numba_age_range(age_histogram)
+
+
+# Backend used by the hospital, selected at import time
+kernels = NumbaKernels if NumbaKernels is not None else NumpyKernels
+
+
+def get_backends() -> List[type]:
+    """Return the available backends
+
+    Returns:
+        List[type]: kernel classes, NumPy first
+    """
+    return [NumpyKernels] + ([NumbaKernels] if NumbaKernels is not None else [])
@@ -0,0 +1,305 @@
+import math
+from typing import Dict, Tuple
+import numpy as np
+from numpy.typing import NDArray
+from .Hospital import Hospital
+
+
+class LowerBound:
+    def __init__(self, hospital: Hospital):
+        """Initializes the lower bound object
+
+        Every component is a relaxation of a different part of the penalty, so their sum is a lower
+        bound on the penalty of any solution that satisfies the hard constraints. The bounds only
+        depend on the instance, i.e. on the occupants, the mandatory patients and the resources.
+        Apart from the shared beds and surgery times, the interactions between the patients are
+        relaxed, so the bound stays loose on the instances where most of the penalty comes from them.
+
+        Args:
+            hospital (Hospital): hospital object
+        """
+        self.hospital = hospital
+        self.shift_types = len(hospital.shift_types)
+        self.shifts = hospital.days * self.shift_types
+        # For each nurse, number of working shifts before each shift
+        self.nurse_cumsum = np.zeros((len(hospital.nurses), self.shifts + 1), dtype=int)
+        self.nurse_cumsum[:, 1:] = np.cumsum(hospital.nurse_available.T, axis=1)
+        # For each shift, highest skill level among the working nurses (-1 if none is working)
+        skills = np.where(hospital.nurse_available, hospital.nra.nurse_skills, -1)
+        self.max_skills = skills.max(axis=1, initial=-1)
+
+    def compute(self) -> Tuple[int, Dict[str, int]]:
+        """Compute the lower bound on the penalty
+
+        Returns:
+            Tuple[int, Dict[str, int]]: overall lower bound and lower bound of each penalty
+        """
+        weights = self.hospital.weights
+        bound_dict = {
+            "S1": self.bound_age() * weights["room_mixed_age"],
+            "S2": self.bound_skill() * weights["room_nurse_skill"],
+            "S4": self.bound_workload() * weights["nurse_eccessive_workload"],
+            "S5": self.bound_open_ots() * weights["open_operating_theater"],
+        }
+        # Continuity of care, admission delay and unscheduled patients are bounded patient by patient
+        bound_dict["S3+S7+S8"] = self.bound_patients()
+        bound = int(sum(bound_dict.values()))
+
+        return bound, bound_dict
+
+    def bound_age(self) -> int:
+        """Bound the age group differences by the ones among the occupants of each room
+
+        Returns:
+            int: lower bound on the sum of the age group differences
+        """
+        present = self.hospital.pas.age_baseline > 0
+        age_range = (
+            present.shape[-1]
+            - 1
+            - present[..., ::-1].argmax(axis=-1)
+            - present.argmax(axis=-1)
+        )
+        return int(np.where(present.any(axis=-1), age_range, 0).sum())
+
+    def bound_skill(self) -> int:
+        """Bound the skill deficits of the rooms of the occupants, which must be covered, by the most
+        skilled nurse working in each shift
+
+        Returns:
+            int: lower bound on the sum of the skill deficits
+        """
+        deficit = self.hospital.nra.skill_baseline - self.max_skills[:, None]
+        occupied = self.hospital.nra.workload_baseline > 0
+        occupied |= np.repeat(
+            self.hospital.pas.occupancy_baseline > 0, self.shift_types, axis=0
+        )
+        return int(np.where(occupied, np.maximum(deficit, 0), 0).sum())
+
+    def bound_workload(self) -> int:
+        """Bound the excessive workloads of the rooms of the occupants, which must be covered, by the
+        highest maximum load among the nurses working in each shift
+
+        Returns:
+            int: lower bound on the sum of the excessive workloads
+        """
+        max_loads = self.hospital.nra.nurse_max_loads.max(axis=1, initial=0)
+        excess = self.hospital.nra.workload_baseline - max_loads[:, None]
+        return int(np.maximum(excess, 0).sum())
+
+    def bound_open_ots(self) -> int:
+        """Bound the number of open operating theaters by the surgery time of the mandatory patients
+
+        The mandatory patients whose admission window lies within an interval of days must be
+        operated on in the operating theaters of that interval, the largest ones first. Disjoint
+        intervals need distinct operating theaters, so the bound is the best sum over a partition
+        of the horizon in intervals, which covers both the whole horizon and the single days.
+
+        Returns:
+            int: lower bound on the number of open operating theaters
+        """
+        hospital = self.hospital
+        days = hospital.days
+        mandatory = np.nonzero(hospital.mandatory & (hospital.patient_releases < days))[0]
+        releases = hospital.patient_releases[mandatory]
+        dues = np.minimum(hospital.patient_dues[mandatory], days - 1)
+        durations = hospital.patient_durations[mandatory]
+        # best[day]: bound over a partition of the days before day
+        best = np.zeros(days + 1, dtype=int)
+        for end_day in range(1, days + 1):
+            for start_day in range(end_day):
+                inside = (releases >= start_day) & (dues < end_day)
+                count = self.count_ots(
+                    hospital.ot_availability[start_day:end_day].ravel(),
+                    durations[inside].sum(),
+                )
+                best[end_day] = max(best[end_day], best[start_day] + count)
+        return int(best[days])
+
+    def bound_patients(self) -> int:
+        """Bound the weighted continuity of care, admission delay and unscheduled penalty of the patients
+
+        A patient is either unscheduled or admitted on a day where it fits in an empty compatible room
+        with enough surgeon and operating theater time and nurses working in every shift of its stay.
+        Since nurses cannot cover more shifts of the stay than the ones they work, the stay needs at
+        least as many nurses as its shifts divided by the most shifts worked by a single nurse.
+
+        The patients also compete for beds, operating theater time and surgeon time: the optional
+        patients that do not fit in these resources pay for being unscheduled (see bound_capacity).
+
+        Returns:
+            int: lower bound on the weighted sum of the three penalties
+        """
+        hospital = self.hospital
+        weights = hospital.weights
+        fits = self.get_room_fits()
+        unscheduled = weights["unscheduled_optional"]
+        costs = np.full(len(hospital.patients), np.inf)
+        # Fewest days of the horizon a stay can cover
+        bed_days = np.zeros(len(hospital.patients), dtype=int)
+        for patient_index in range(len(hospital.patients)):
+            for day in hospital.candidate_days[patient_index]:
+                if day >= hospital.days:
+                    continue
+                bed_days[patient_index] = min(
+                    hospital.patient_stays[patient_index], hospital.days - day
+                )
+                continuity = self.bound_continuity(patient_index, day, fits)
+                if continuity is None:
+                    continue
+                delay = day - hospital.patient_releases[patient_index]
+                costs[patient_index] = min(
+                    costs[patient_index],
+                    continuity * weights["continuity_of_care"]
+                    + delay * weights["patient_delay"],
+                )
+        mandatory = hospital.mandatory
+        # A mandatory patient that fits nowhere makes every solution infeasible
+        costs[mandatory & np.isinf(costs)] = unscheduled
+        bound = costs[mandatory].sum() + np.minimum(costs[~mandatory], unscheduled).sum()
+        # Penalty saved by scheduling each optional patient
+        savings = np.where(mandatory, 0, np.maximum(unscheduled - costs, 0))
+        durations = hospital.patient_durations
+        surgeons = hospital.patient_surgeons
+        free_beds = np.maximum(
+            hospital.pas.capacities - hospital.pas.occupancy_baseline, 0
+        ).sum()
+        lost = max(
+            self.bound_capacity(savings, bed_days, mandatory, free_beds),
+            self.bound_capacity(
+                savings, durations, mandatory, hospital.ot_availability.sum()
+            ),
+            # Each patient has one surgeon, so the savings lost by the surgeons add up
+            sum(
+                self.bound_capacity(
+                    savings[surgeons == surgeon_index],
+                    durations[surgeons == surgeon_index],
+                    mandatory[surgeons == surgeon_index],
+                    hospital.surgeon_max_times[:, surgeon_index].sum(),
+                )
+                for surgeon_index in range(hospital.surgeon_max_times.shape[1])
+            ),
+        )
+        return int(math.floor(bound + lost))
+
+    @staticmethod
+    def bound_capacity(
+        savings: NDArray, usage: NDArray, mandatory: NDArray, capacity: int
+    ) -> float:
+        """Bound the savings that the optional patients lose because they do not fit in a resource
+
+        The mandatory patients use the resource first, and the optional ones share the rest as in
+        the linear relaxation of a knapsack problem, i.e. by decreasing savings per unit.
+
+        Args:
+            savings (NDArray): penalty saved by scheduling each patient
+            usage (NDArray): amount of the resource used by each patient
+            mandatory (NDArray): mask of the mandatory patients
+            capacity (int): amount of the resource over the horizon
+
+        Returns:
+            float: lower bound on the savings lost
+        """
+        capacity = max(capacity - usage[mandatory].sum(), 0)
+        optional = ~mandatory & (savings > 0)
+        savings, usage = savings[optional], usage[optional]
+        order = np.argsort(-savings / np.maximum(usage, 1e-9), kind="stable")
+        savings, usage = savings[order], usage[order]
+        used = np.cumsum(usage)
+        # Fraction of each patient that still fits
+        fraction = np.clip((capacity - used + usage) / np.maximum(usage, 1e-9), 0, 1)
+        fraction[usage == 0] = 1
+        return float((savings * (1 - fraction)).sum())
+
+    def bound_continuity(self, patient_index: int, day: int, fits: NDArray) -> int:
+        """Bound the number of nurses of a patient admitted on a given day
+
+        Args:
+            patient_index (int): index of the patient
+            day (int): index of the admission day
+            fits (NDArray): mask of the rooms where each gender fits on each day (see get_room_fits)
+
+        Returns:
+            int: lower bound on the number of distinct nurses, None if the patient does not fit on that day
+        """
+        hospital = self.hospital
+        duration = hospital.patient_durations[patient_index]
+        surgeon_index = hospital.patient_surgeons[patient_index]
+        if hospital.surgeon_max_times[day, surgeon_index] < duration:
+            return None
+        if hospital.ot_availability[day].max(initial=0) < duration:
+            return None
+        end_day = min(hospital.days, day + hospital.patient_stays[patient_index])
+        rooms = fits[hospital.patient_genders[patient_index], day:end_day].all(axis=0)
+        if not rooms[hospital.candidate_rooms[patient_index]].any():
+            return None
+        start, end = day * self.shift_types, end_day * self.shift_types
+        if (self.max_skills[start:end] < 0).any():
+            return None
+        max_shifts = (self.nurse_cumsum[:, end] - self.nurse_cumsum[:, start]).max()
+        return math.ceil((end - start) / max_shifts)
+
+    def get_room_fits(self) -> NDArray:
+        """Compute where a patient of each gender fits next to the occupants
+
+        Returns:
+            NDArray: mask of the rooms with a free bed and no occupant of another gender, for each gender and day
+        """
+        hospital = self.hospital
+        free = hospital.pas.occupancy_baseline < hospital.pas.capacities
+        return np.stack(
+            [
+                free
+                & (
+                    (hospital.gender_baseline < 0)
+                    | (hospital.gender_baseline == gender)
+                )
+                for gender in range(hospital.gender_count)
+            ]
+        )
+
+    def get_fixed_patients(self) -> NDArray:
+        """Return the mandatory patients that can only be admitted on their release day
+
+        Returns:
+            NDArray: indices of the patients
+        """
+        hospital = self.hospital
+        return np.nonzero(
+            hospital.mandatory
+            & (hospital.patient_releases == hospital.patient_dues)
+            & (hospital.patient_releases < hospital.days)
+        )[0]
+
+    @staticmethod
+    def count_ots(availability: NDArray, duration: int) -> int:
+        """Count the operating theaters needed to host a surgery time, using the largest ones first
+
+        Args:
+            availability (NDArray): surgery time of the operating theaters
+            duration (int): surgery time to host
+
+        Returns:
+            int: minimum number of operating theaters
+        """
+        if duration <= 0:
+            return 0
+        capacity = np.cumsum(np.sort(availability)[::-1])
+        return int(
+            min(np.searchsorted(capacity, duration) + 1, np.count_nonzero(availability))
+        )
+
+    @staticmethod
+    def get_gap(penalty: int, bound: int) -> float:
+        """Compute the relative gap between a penalty and a lower bound
+
+        Args:
+            penalty (int): penalty of a solution
+            bound (int): lower bound
+
+        Returns:
+            float: relative gap
+        """
+        if penalty <= 0:
+            return 0.0
+        return max(penalty - bound, 0) / penalty
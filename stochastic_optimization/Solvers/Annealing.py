@@ -0,0 +1,124 @@
+import math
+from typing import Literal, Union
+import numpy as np
+from Instances import Hospital
+from Instances.Hospital import ActionError
+
+
+class Annealing:
+    def __init__(
+        self,
+        hospital: Hospital,
+        initial_temperature: Union[float, None] = None,
+        cooling: Literal["geometric", "linear", "logarithmic"] = "geometric",
+        alpha: float = 0.9999,
+        final_temperature: float = 0.1,
+        seed: Union[int, None] = None,
+    ):
+        """Initializes the simulated annealing solver
+
+        Each step draws a single random move from the hospital, evaluates only that move and accepts
+        it with the Metropolis criterion. The acceptance threshold is drawn before the move is
+        evaluated, so that the evaluation of a rejected move stops as soon as its penalty reaches it.
+
+        Args:
+            hospital (Hospital): hospital object
+            initial_temperature (Union[float, None], optional): initial temperature. Defaults to None (estimated from random moves).
+            cooling (Literal["geometric", "linear", "logarithmic"], optional): cooling schedule. Defaults to "geometric".
+            alpha (float, optional): cooling factor per step of the geometric schedule. Defaults to 0.9999.
+            final_temperature (float, optional): minimum temperature. Defaults to 0.1.
+            seed (Union[int, None], optional): seed of the random number generator. Defaults to None.
+        """
+        self.hospital = hospital
+        self.initial_temperature = initial_temperature
+        self.cooling = cooling
+        self.alpha = alpha
+        self.final_temperature = final_temperature
+        self.rng = np.random.default_rng(seed)
+
+    def estimate_temperature(
+        self, samples: int = 200, acceptance: float = 0.5
+    ) -> float:
+        """Estimate the temperature at which the average worsening move is accepted with the given probability
+
+        Args:
+            samples (int, optional): number of random moves to draw. Defaults to 200.
+            acceptance (float, optional): acceptance probability of the average worsening move. Defaults to 0.5.
+
+        Returns:
+            float: initial temperature
+        """
+        penalty, _ = self.hospital.compute_penalty()
+        deltas = []
+        for _ in range(samples):
+            action = self.hospital.sample_neighboring_move(self.rng)
+            if action is None:
+                continue
+            try:
+                p, _ = self.hospital.apply_action(action)
+            except ActionError:
+                continue
+            if p > penalty:
+                deltas.append(p - penalty)
+        if not deltas:
+            return self.final_temperature
+        return max(-np.mean(deltas) / math.log(acceptance), self.final_temperature)
+
+    def temperature(
+        self, step: int, max_iter: int, initial_temperature: float
+    ) -> float:
+        """Compute the temperature of a step according to the cooling schedule
+
+        Args:
+            step (int): current step
+            max_iter (int): number of steps
+            initial_temperature (float): initial temperature
+
+        Returns:
+            float: temperature
+        """
+        if self.cooling == "geometric":
+            temperature = initial_temperature * self.alpha**step
+        elif self.cooling == "linear":
+            temperature = initial_temperature * (1 - step / max_iter)
+        else:
+            temperature = initial_temperature / math.log(step + math.e)
+        return max(temperature, self.final_temperature)
+
+    def solve(self, max_iter: int) -> int:
+        """Solves the hospital assignment problem using simulated annealing
+
+        Args:
+            max_iter (int): number of steps
+
+        Returns:
+            int: best penalty found
+        """
+        initial_temperature = self.initial_temperature
+        if initial_temperature is None:
+            initial_temperature = self.estimate_temperature()
+        best_penalty, _ = self.hospital.compute_penalty()
+        current_penalty = best_penalty
+        # The best solution is kept as plain lists, as saving the status copies every patient and nurse
+        best_solution = self.hospital.get_window_solution(0, self.hospital.days)
+        for step in range(max_iter):
+            action = self.hospital.sample_neighboring_move(self.rng)
+            if action is None:
+                continue
+            # Metropolis criterion: accept if the penalty increase is below -T * ln(u)
+            temperature = self.temperature(step, max_iter, initial_temperature)
+            threshold = current_penalty - temperature * math.log(1 - self.rng.random())
+            try:
+                p, _ = self.hospital.apply_action(action, bound=threshold)
+            except ActionError:
+                continue
+            if p >= threshold:
+                continue
+            current_penalty, _ = self.hospital.apply_action(action, assign=True)
+            if current_penalty < best_penalty:
+                best_penalty = current_penalty
+                best_solution = self.hospital.get_window_solution(0, self.hospital.days)
+        self.hospital.load_window_solution(0, self.hospital.days, *best_solution)
+        self.hospital.save_status()
+
+        return best_penalty
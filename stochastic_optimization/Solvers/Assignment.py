@@ -0,0 +1,66 @@
+import numpy as np
+from Instances import Hospital
+from Instances.Hospital import NRAActionReassign
+
+
+class NurseAssignment:
+    def __init__(self, hospital: Hospital, sweeps: int = 1):
+        """Initializes the nurse assignment optimizer, which improves the nurses of the covered rooms shift by shift
+
+        Each shift is solved as a min-cost assignment between its covered rooms and its working nurses.
+        A nurse may cover several rooms, and the skill, continuity and workload penalties are all charged
+        per (shift, room), so the assignment separates and every room is handed to its cheapest nurse.
+        The current nurse has a cost of 0, so a sub-solve never makes the solution worse.
+
+        Args:
+            hospital (Hospital): hospital object
+            sweeps (int, optional): number of passes over all the shifts. Defaults to 1.
+        """
+        self.hospital = hospital
+        self.sweeps = sweeps
+
+    def solve_shift(self, shift: int) -> bool:
+        """Optimally reassign the covered rooms of a shift, the other shifts being fixed
+
+        Args:
+            shift (int): index of the shift
+
+        Returns:
+            bool: True if the assignment of the shift has improved
+        """
+        rooms, room_nurses, nurses, costs = self.hospital.get_nurse_assignment_costs(
+            shift
+        )
+        if len(rooms) == 0:
+            return False
+        # The rooms are independent within a shift: each one goes to its cheapest nurse
+        cheapest = costs.argmin(axis=1)
+        improving = costs[np.arange(len(rooms)), cheapest] < 0
+        if not improving.any():
+            return False
+        for room_index, nurse_index, new_nurse_index in zip(
+            rooms[improving].tolist(),
+            room_nurses[improving].tolist(),
+            nurses[cheapest[improving]].tolist(),
+        ):
+            self.hospital.apply_action(
+                NRAActionReassign(shift, room_index, nurse_index, new_nurse_index),
+                assign=True,
+            )
+        return True
+
+    def solve(self) -> int:
+        """Optimizes the nurse assignment of all the shifts
+
+        Returns:
+            int: penalty of the resulting solution
+        """
+        shifts = self.hospital.days * len(self.hospital.shift_types)
+        for _ in range(self.sweeps):
+            improved = False
+            for shift in range(shifts):
+                improved |= self.solve_shift(shift)
+            if not improved:
+                break
+        penalty, _ = self.hospital.compute_penalty()
+        return penalty
@@ -0,0 +1,134 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Tuple
+from Instances import Hospital
+from .Tabu import Tabu
+
+
+def solve_window(
+    file_path: str,
+    patient_slots: List[Tuple[int, int, int, int]],
+    nurse_cells: List[Tuple[int, int, int]],
+    start_day: int,
+    end_day: int,
+    tabu_size: int,
+    factor: float,
+    max_iter: int,
+) -> Tuple[List[Tuple[int, int, int, int]], List[Tuple[int, int, int]]]:
+    """Optimize a window of days with Tabu search, the rest of the solution being fixed
+
+    The hospital is rebuilt from the instance file, since it cannot be sent to another process.
+
+    Args:
+        file_path (str): path to the JSON file containing the hospital data
+        patient_slots (List[Tuple[int, int, int, int]]): patient, day, room and operating theater of the scheduled patients
+        nurse_cells (List[Tuple[int, int, int]]): shift, room and nurse of the covered rooms
+        start_day (int): first day of the window
+        end_day (int): end day of the window (excluded)
+        tabu_size (int): size of the tabu queue
+        factor (float): factor for aspiration criterion
+        max_iter (int): maximum number of iterations
+
+    Returns:
+        Tuple[List[Tuple[int, int, int, int]], List[Tuple[int, int, int]]]: part of the best solution that belongs to the window
+    """
+    hospital = Hospital(file_path)
+    hospital.load_window_solution(0, hospital.days, patient_slots, nurse_cells)
+    hospital.set_window(start_day, end_day)
+    Tabu(tabu_size, factor, hospital).solve(max_iter)
+    return hospital.get_window_solution(start_day, end_day)
+
+
+class Decomposition:
+    def __init__(
+        self,
+        window_size: int,
+        tabu_size: int,
+        factor: float,
+        hospital: Hospital,
+        workers: int = None,
+    ):
+        """Initializes the time-window decomposition solver
+
+        The horizon is split into windows of consecutive days. Windows are optimized with Tabu search
+        in two phases, even windows first and odd windows then, so that the windows of a phase are
+        separated by a fixed window and can be solved concurrently in a process pool. The nurses of
+        a window also cover the stays of its patients, so the windows of a phase may still conflict
+        when stays are longer than a window: the rooms hosting someone keep a nurse when the windows
+        are merged, patients that cannot be scheduled anymore are left unscheduled, and a phase is
+        kept only if it improves the solution.
+
+        Args:
+            window_size (int): number of days of each window
+            tabu_size (int): size of the tabu queue
+            factor (float): factor for aspiration criterion
+            hospital (Hospital): hospital object
+            workers (int, optional): number of processes. Defaults to None (number of CPUs).
+        """
+        self.window_size = window_size
+        self.tabu_size = tabu_size
+        self.factor = factor
+        self.hospital = hospital
+        self.workers = workers
+
+    def get_windows(self, phase: int) -> List[Tuple[int, int]]:
+        """Return the windows of a phase
+
+        Args:
+            phase (int): 0 for the even windows, 1 for the odd windows
+
+        Returns:
+            List[Tuple[int, int]]: first and end day (excluded) of each window
+        """
+        days = self.hospital.days
+        return [
+            (start_day, min(start_day + self.window_size, days))
+            for start_day in range(phase * self.window_size, days, 2 * self.window_size)
+        ]
+
+    def solve(self, max_iter: int, rounds: int = 1) -> int:
+        """Solves the hospital assignment problem by optimizing the windows in parallel
+
+        Args:
+            max_iter (int): maximum number of Tabu iterations for each window
+            rounds (int, optional): number of passes over all the windows. Defaults to 1.
+
+        Returns:
+            int: best penalty found
+        """
+        best_penalty, _ = self.hospital.compute_penalty()
+        self.hospital.save_status()
+        with ProcessPoolExecutor(self.workers) as pool:
+            for _ in range(rounds):
+                for phase in range(2):
+                    windows = self.get_windows(phase)
+                    if len(windows) == 0:
+                        continue
+                    patient_slots, nurse_cells = self.hospital.get_window_solution(
+                        0, self.hospital.days
+                    )
+                    start_days, end_days = zip(*windows)
+                    results = pool.map(
+                        solve_window,
+                        repeat(self.hospital.file_path),
+                        repeat(patient_slots),
+                        repeat(nurse_cells),
+                        start_days,
+                        end_days,
+                        repeat(self.tabu_size),
+                        repeat(self.factor),
+                        repeat(max_iter),
+                    )
+                    for (start_day, end_day), (window_slots, window_cells) in zip(
+                        windows, results
+                    ):
+                        self.hospital.load_window_solution(
+                            start_day, end_day, window_slots, window_cells
+                        )
+                    penalty, _ = self.hospital.compute_penalty()
+                    if penalty < best_penalty:
+                        best_penalty = penalty
+                        self.hospital.save_status()
+                    else:
+                        self.hospital.load_status()
+        return best_penalty
@@ -0,0 +1,78 @@
+from typing import Literal, Union
+import numpy as np
+from Instances import Hospital
+
+
+class IteratedLocalSearch:
+    def __init__(
+        self,
+        local_search,
+        hospital: Hospital,
+        ruin_size: int = 5,
+        relatedness: Union[Literal["surgeon", "room", "days", "random"], None] = None,
+        regret: int = 2,
+        seed: Union[int, None] = None,
+    ):
+        """Initializes the iterated local search solver
+
+        The local search runs until it stagnates, then a ruin-and-recreate perturbation unschedules
+        a cluster of related patients and schedules them again with regret-k insertion, and the local
+        search restarts from there. A new local optimum replaces the current one if it is not worse.
+
+        Args:
+            local_search: solver improving the current solution of the hospital, with a solve(max_iter) method returning the best penalty, e.g. LateAcceptance or Tabu
+            hospital (Hospital): hospital object
+            ruin_size (int, optional): number of patients unscheduled by each perturbation. Defaults to 5.
+            relatedness (Union[Literal["surgeon", "room", "days", "random"], None], optional): how the unscheduled patients are related. Defaults to None (drawn at random for each perturbation).
+            regret (int, optional): number of insertions considered for the regret. Defaults to 2.
+            seed (Union[int, None], optional): seed of the random number generator. Defaults to None.
+        """
+        self.local_search = local_search
+        self.hospital = hospital
+        self.ruin_size = ruin_size
+        self.relatedness = relatedness
+        self.regret = regret
+        self.rng = np.random.default_rng(seed)
+
+    def perturb(self):
+        """Ruin and recreate a cluster of related patients, with a relatedness drawn at random if not given"""
+        relatedness = self.relatedness
+        if relatedness is None:
+            relatedness = self.rng.choice(["surgeon", "room", "days", "random"])
+        self.hospital.ruin_and_recreate(
+            self.rng, relatedness, self.ruin_size, self.regret
+        )
+
+    def solve(self, rounds: int, max_iter: int) -> int:
+        """Solves the hospital assignment problem using iterated local search
+
+        Args:
+            rounds (int): number of perturbations
+            max_iter (int): maximum number of iterations of each local search
+
+        Returns:
+            int: best penalty found
+        """
+        best_penalty = self.local_search.solve(max_iter)
+        best_solution = self.hospital.get_window_solution(0, self.hospital.days)
+        current_penalty = best_penalty
+        current_solution = best_solution
+        for _ in range(rounds):
+            self.perturb()
+            penalty = self.local_search.solve(max_iter)
+            if penalty <= current_penalty:
+                current_penalty = penalty
+                current_solution = self.hospital.get_window_solution(
+                    0, self.hospital.days
+                )
+                if penalty < best_penalty:
+                    best_penalty = penalty
+                    best_solution = current_solution
+            else:
+                self.hospital.load_window_solution(
+                    0, self.hospital.days, *current_solution
+                )
+        self.hospital.load_window_solution(0, self.hospital.days, *best_solution)
+        self.hospital.save_status()
+
+        return best_penalty
@@ -0,0 +1,68 @@
+from typing import Union
+import numpy as np
+from Instances import Hospital
+from Instances.Hospital import ActionError
+
+
+class LateAcceptance:
+    def __init__(
+        self,
+        hospital: Hospital,
+        history_length: int = 100,
+        patience: Union[int, None] = None,
+        seed: Union[int, None] = None,
+    ):
+        """Initializes the late-acceptance hill climbing solver
+
+        Each step draws a single random move from the hospital and accepts it if its penalty is not
+        worse than the current one or than the one of history_length steps before, kept in a ring
+        buffer. The evaluation of a move stops as soon as its penalty exceeds both.
+
+        Args:
+            hospital (Hospital): hospital object
+            history_length (int, optional): length of the history ring buffer. Defaults to 100.
+            patience (Union[int, None], optional): number of steps without improvement of the best solution after which the search stops. Defaults to None (never).
+            seed (Union[int, None], optional): seed of the random number generator. Defaults to None.
+        """
+        self.hospital = hospital
+        self.history_length = history_length
+        self.patience = patience
+        self.rng = np.random.default_rng(seed)
+
+    def solve(self, max_iter: int) -> int:
+        """Solves the hospital assignment problem using late-acceptance hill climbing
+
+        Args:
+            max_iter (int): maximum number of steps
+
+        Returns:
+            int: best penalty found
+        """
+        best_penalty, _ = self.hospital.compute_penalty()
+        current_penalty = best_penalty
+        # The best solution is kept as plain lists, as saving the status copies every patient and nurse
+        best_solution = self.hospital.get_window_solution(0, self.hospital.days)
+        history = np.full(self.history_length, current_penalty)
+        last_improvement = 0
+        for step in range(max_iter):
+            if self.patience is not None and step - last_improvement > self.patience:
+                break
+            slot = step % self.history_length
+            action = self.hospital.sample_neighboring_move(self.rng)
+            if action is not None:
+                threshold = max(current_penalty, history[slot]) + 1
+                try:
+                    p, _ = self.hospital.apply_action(action, bound=threshold)
+                except ActionError:
+                    p = threshold
+                if p < threshold:
+                    current_penalty, _ = self.hospital.apply_action(action, assign=True)
+                    if current_penalty < best_penalty:
+                        best_penalty = current_penalty
+                        last_improvement = step
+                        best_solution = self.hospital.get_window_solution(0, self.hospital.days)
+            history[slot] = current_penalty
+        self.hospital.load_window_solution(0, self.hospital.days, *best_solution)
+        self.hospital.save_status()
+
+        return best_penalty
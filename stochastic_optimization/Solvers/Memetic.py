@@ -0,0 +1,280 @@
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Literal, Tuple, Union
+import numpy as np
+from numpy.typing import NDArray
+from Instances import Hospital
+from .Phased import Phased
+from .Tabu import Tabu
+
+Individual = Tuple[NDArray, NDArray, NDArray, NDArray]
+
+# Hospital of the worker process, built once by init_worker
+worker_hospital: Union[Hospital, None] = None
+
+
+def init_worker(file_path: str):
+    """Build the hospital of a worker process, since it cannot be sent to another process
+
+    Args:
+        file_path (str): path to the JSON file containing the hospital data
+    """
+    global worker_hospital
+    worker_hospital = Hospital(file_path)
+
+
+def improve_child(
+    child: Individual,
+    seed: int,
+    mutate: bool,
+    ruin_size: int,
+    tabu_size: int,
+    factor: float,
+    max_iter: int,
+) -> Individual:
+    """Mutate, repair and improve a child with a short Tabu search in a worker process
+
+    The repair is the feasibility phase of the phased solver, with at most max_iter moves.
+
+    Args:
+        child (Individual): assignment vectors of the child (see Hospital.get_solution_vectors)
+        seed (int): seed of the random number generator of the mutation
+        mutate (bool): if True, the child is perturbed with ruin and recreate before the search
+        ruin_size (int): number of patients unscheduled by the mutation
+        tabu_size (int): size of the tabu queue
+        factor (float): factor for aspiration criterion
+        max_iter (int): maximum number of Tabu iterations
+
+    Returns:
+        Individual: assignment vectors of the improved child
+    """
+    hospital = worker_hospital
+    hospital.load_solution_vectors(*child)
+    if mutate:
+        rng = np.random.default_rng(seed)
+        relatedness = rng.choice(["surgeon", "room", "days", "random"])
+        hospital.ruin_and_recreate(rng, relatedness, ruin_size)
+    # Tabu ignores the uncovered rooms, so the hard violations are repaired first
+    Phased(tabu_size, factor, hospital).repair(max_iter)
+    # Tabu prints every iteration, which would flood the output of the parent process
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        Tabu(tabu_size, factor, hospital).solve(max_iter)
+    return hospital.get_solution_vectors()
+
+
+class Memetic:
+    def __init__(
+        self,
+        population_size: int,
+        tabu_size: int,
+        factor: float,
+        hospital: Hospital,
+        crossover: Literal["days", "uniform"] = "days",
+        mutation_rate: float = 0.2,
+        ruin_size: int = 5,
+        workers: int = None,
+        seed: Union[int, None] = None,
+    ):
+        """Initializes the memetic solver
+
+        A population of solutions is evolved by crossover of the assignment vectors of two parents,
+        drawn by binary tournament: each patient takes its admission day, room and operating theater
+        from one parent and each shift takes its nurses from one parent. The rooms left uncovered by
+        the chosen parent are covered by the nurses of the other one, so that every patient keeps
+        its nurses. Each child is then possibly mutated with ruin and recreate, repaired and
+        improved with a short Tabu search; children are processed concurrently in a process pool.
+        The whole population is scored at once with Hospital.evaluate_solutions and the best
+        distinct solutions among parents and children survive, feasible solutions always ranking
+        before infeasible ones.
+
+        Args:
+            population_size (int): number of solutions in the population
+            tabu_size (int): size of the tabu queue
+            factor (float): factor for aspiration criterion
+            hospital (Hospital): hospital object
+            crossover (Literal["days", "uniform"], optional): "days" takes the patients admitted and the shifts before a random day from the first parent and the rest from the second one, "uniform" draws the parent of each patient and shift at random. Defaults to "days".
+            mutation_rate (float, optional): probability of mutating a child. Defaults to 0.2.
+            ruin_size (int, optional): number of patients unscheduled by each mutation. Defaults to 5.
+            workers (int, optional): number of processes. Defaults to None (number of CPUs).
+            seed (Union[int, None], optional): seed of the random number generator. Defaults to None.
+        """
+        self.population_size = population_size
+        self.tabu_size = tabu_size
+        self.factor = factor
+        self.hospital = hospital
+        self.crossover = crossover
+        self.mutation_rate = mutation_rate
+        self.ruin_size = ruin_size
+        self.workers = workers
+        self.rng = np.random.default_rng(seed)
+
+    def crossover_parents(
+        self, parent: Individual, other_parent: Individual
+    ) -> Individual:
+        """Combine the assignment vectors of two parents
+
+        Args:
+            parent (Individual): assignment vectors of the first parent
+            other_parent (Individual): assignment vectors of the second parent
+
+        Returns:
+            Individual: assignment vectors of the child
+        """
+        days, rooms, ots, nurses = parent
+        other_days, other_rooms, other_ots, other_nurses = other_parent
+        shift_types = len(self.hospital.shift_types)
+        if self.crossover == "days":
+            cut = self.rng.integers(1, self.hospital.days)
+            # Unscheduled patients follow the parent whose part they would be admitted in
+            admission = np.where(days >= 0, days, other_days)
+            from_parent = (admission >= 0) & (admission < cut)
+            shift_from_parent = np.arange(nurses.shape[0]) < cut * shift_types
+        else:
+            from_parent = self.rng.random(days.shape[0]) < 0.5
+            shift_from_parent = self.rng.random(nurses.shape[0]) < 0.5
+        child_nurses = np.where(shift_from_parent[:, None], nurses, other_nurses)
+        spare_nurses = np.where(shift_from_parent[:, None], other_nurses, nurses)
+        return (
+            np.where(from_parent, days, other_days),
+            np.where(from_parent, rooms, other_rooms),
+            np.where(from_parent, ots, other_ots),
+            np.where(child_nurses >= 0, child_nurses, spare_nurses),
+        )
+
+    def evaluate(self, population: List[Individual]) -> Tuple[NDArray, NDArray]:
+        """Score a population at once
+
+        Args:
+            population (List[Individual]): assignment vectors of the solutions
+
+        Returns:
+            Tuple[NDArray, NDArray]: penalty and number of hard constraint violations of each solution
+        """
+        vectors = [np.stack(vector) for vector in zip(*population)]
+        penalty, _, violations = self.hospital.evaluate_solutions(*vectors)
+        return penalty, sum(violations.values())
+
+    @staticmethod
+    def rank(penalties: NDArray, violations: NDArray) -> NDArray:
+        """Sort the solutions from the best one: feasible solutions come first, whatever their penalty
+
+        Args:
+            penalties (NDArray): penalty of each solution
+            violations (NDArray): number of hard constraint violations of each solution
+
+        Returns:
+            NDArray: indices of the solutions, from the best one
+        """
+        return np.lexsort((penalties, violations))
+
+    def select(self, penalties: NDArray, violations: NDArray) -> int:
+        """Select a parent by binary tournament
+
+        Args:
+            penalties (NDArray): penalty of each solution of the population
+            violations (NDArray): number of hard constraint violations of each solution
+
+        Returns:
+            int: index of the selected solution
+        """
+        i, j = self.rng.integers(len(penalties), size=2)
+        if (violations[i], penalties[i]) <= (violations[j], penalties[j]):
+            return i
+        return j
+
+    def survive(
+        self, population: List[Individual], penalties: NDArray, violations: NDArray
+    ) -> Tuple[List[Individual], NDArray, NDArray]:
+        """Keep the best distinct solutions
+
+        Args:
+            population (List[Individual]): assignment vectors of the solutions
+            penalties (NDArray): penalty of each solution
+            violations (NDArray): number of hard constraint violations of each solution
+
+        Returns:
+            Tuple[List[Individual], NDArray, NDArray]: surviving solutions, their penalties and violations
+        """
+        survivors = []
+        seen = set()
+        for index in self.rank(penalties, violations):
+            key = b"".join(vector.tobytes() for vector in population[index])
+            if key in seen:
+                continue
+            seen.add(key)
+            survivors.append(index)
+            if len(survivors) == self.population_size:
+                break
+        return (
+            [population[i] for i in survivors],
+            penalties[survivors],
+            violations[survivors],
+        )
+
+    def solve(self, generations: int, max_iter: int) -> int:
+        """Solves the hospital assignment problem using a memetic algorithm
+
+        Args:
+            generations (int): number of generations
+            max_iter (int): maximum number of Tabu iterations for each child
+
+        Returns:
+            int: best penalty found
+        """
+        initial = self.hospital.get_solution_vectors()
+        with ProcessPoolExecutor(
+            self.workers, initializer=init_worker, initargs=(self.hospital.file_path,)
+        ) as pool:
+            # The initial population is made of mutations of the current solution
+            seeds = self.rng.integers(2**31, size=self.population_size)
+            mutate = np.arange(self.population_size) > 0
+            population = list(
+                pool.map(
+                    improve_child,
+                    repeat(initial),
+                    seeds,
+                    mutate,
+                    repeat(self.ruin_size),
+                    repeat(self.tabu_size),
+                    repeat(self.factor),
+                    repeat(max_iter),
+                )
+            )
+            penalties, violations = self.evaluate(population)
+            for _ in range(generations):
+                children = [
+                    self.crossover_parents(
+                        population[self.select(penalties, violations)],
+                        population[self.select(penalties, violations)],
+                    )
+                    for _ in range(self.population_size)
+                ]
+                seeds = self.rng.integers(2**31, size=self.population_size)
+                mutate = self.rng.random(self.population_size) < self.mutation_rate
+                children = list(
+                    pool.map(
+                        improve_child,
+                        children,
+                        seeds,
+                        mutate,
+                        repeat(self.ruin_size),
+                        repeat(self.tabu_size),
+                        repeat(self.factor),
+                        repeat(max_iter),
+                    )
+                )
+                child_penalties, child_violations = self.evaluate(children)
+                population, penalties, violations = self.survive(
+                    population + children,
+                    np.concatenate([penalties, child_penalties]),
+                    np.concatenate([violations, child_violations]),
+                )
+        # The best feasible solution, if any
+        best = self.rank(penalties, violations)[0]
+        self.hospital.load_solution_vectors(*population[best])
+        self.hospital.save_status()
+        best_penalty, _ = self.hospital.compute_penalty()
+
+        return best_penalty
@@ -0,0 +1,91 @@
+from Instances import Hospital
+from .Assignment import NurseAssignment
+from .Tabu import Tabu
+
+
+class Phased:
+    def __init__(
+        self,
+        tabu_size: int,
+        factor: float,
+        hospital: Hospital,
+        patience: int = 100,
+        polish_patience: int = 20,
+    ):
+        """Initializes the phased solver
+
+        The search runs in three phases, each with its own neighborhood and stopping rule:
+        1. feasibility: greedy moves that schedule the unscheduled mandatory patients and cover the
+           rooms hosting someone, until no such violation is left or no repairing move is feasible;
+        2. cost optimization: Tabu search over the full neighborhood, until max_iter iterations or
+           patience iterations without improvement;
+        3. nurse polishing: Tabu search over the nurse moves only, until polish_patience iterations
+           without improvement, followed by the optimal reassignment of the rooms of each shift.
+
+        Args:
+            tabu_size (int): size of the tabu queue
+            factor (float): factor for aspiration criterion
+            hospital (Hospital): hospital object
+            patience (int, optional): number of iterations without improvement after which the cost optimization stops. Defaults to 100.
+            polish_patience (int, optional): number of iterations without improvement after which the nurse polishing stops. Defaults to 20.
+        """
+        self.tabu_size = tabu_size
+        self.factor = factor
+        self.hospital = hospital
+        self.patience = patience
+        self.polish_patience = polish_patience
+
+    def repair(self, max_iter: int) -> int:
+        """Repair the hard violations with the cheapest feasibility move at each iteration
+
+        Args:
+            max_iter (int): maximum number of moves
+
+        Returns:
+            int: number of violations left
+        """
+        for _ in range(max_iter):
+            if self.hospital.count_feasibility_violations() == 0:
+                break
+            next_action = None
+            next_penalty = float("inf")
+            for action, p in self.hospital.iterate_neighboring_moves(
+                neighborhood="feasibility"
+            ):
+                if p < next_penalty:
+                    next_penalty = p
+                    next_action = action
+            if next_action is None:
+                break
+            self.hospital.apply_action(next_action, assign=True)
+        self.hospital.save_status()
+        return self.hospital.count_feasibility_violations()
+
+    def solve(self, max_iter: int) -> int:
+        """Solves the hospital assignment problem phase by phase
+
+        Args:
+            max_iter (int): maximum number of iterations of each phase
+
+        Returns:
+            int: best penalty found
+        """
+        violations = self.repair(max_iter)
+        penalty, _ = self.hospital.compute_penalty()
+        self.hospital.logger.log_action(
+            penalty, f"Feasibility phase, {violations} violations left"
+        )
+        Tabu(self.tabu_size, self.factor, self.hospital, patience=self.patience).solve(
+            max_iter
+        )
+        Tabu(
+            self.tabu_size,
+            self.factor,
+            self.hospital,
+            neighborhood="nurses",
+            patience=self.polish_patience,
+        ).solve(max_iter)
+        best_penalty = NurseAssignment(self.hospital).solve()
+        self.hospital.save_status()
+
+        return best_penalty
@@ -1,18 +1,87 @@
-from Instances import Hospital, ActionError
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Literal, Union
+from Instances import Hospital
+from Instances.Hospital import NeighborhoodBound
+from Instances.LowerBound import LowerBound
+from .Assignment import NurseAssignment
 
 class Tabu:
-    def __init__(self, tabu_size: int, factor: float, hospital: Hospital):
+    def __init__(self, tabu_size: int, factor: float, hospital: Hospital, optimize_every: int = 0, reactive: bool = False, bounded: bool = False, strategy: Literal["best", "first", "best_of_k", "ordered"] = "best", k: int = 5, gap: Union[float, None] = None, neighborhood: Literal["full", "feasibility", "nurses"] = "full", patience: Union[int, None] = None, threads: int = 0):
         """Initializes the Tabu solver object
 
         Args:
             tabu_size (int): size of the tabu queue
             factor (float): factor for aspiration criterion. The larger the factor, the more likely the algorithm will accept a move that is in the tabu list 
             hospital (Hospital): hospital object
+            optimize_every (int, optional): number of iterations between two runs of the nurse assignment optimizer, which also polishes the best solution. Defaults to 0 (never).
+            reactive (bool, optional): if True, the size of the tabu queue is adapted during the search and tabu_size is only its initial value. Defaults to False.
+            bounded (bool, optional): if True, the evaluation of a move stops as soon as it cannot beat the best admissible move of the neighborhood. Defaults to False.
+            strategy (Literal["best", "first", "best_of_k", "ordered"], optional): how the neighborhood is scanned. "best" evaluates every move, "first" stops at the first improving move, "best_of_k" at the k-th improving move, "ordered" stops at the first improving move visiting the most promising patients and rooms first. Defaults to "best".
+            k (int, optional): number of improving moves the "best_of_k" strategy collects. Defaults to 5.
+            gap (Union[float, None], optional): relative gap to the lower bound of the penalty below which the search stops, e.g. 0.05, only checked while the best solution is feasible. The gap of the solution is logged with it. Defaults to None (never).
+            neighborhood (Literal["full", "feasibility", "nurses"], optional): moves generated at each iteration, see Hospital.iterate_neighboring_moves. Defaults to "full".
+            patience (Union[int, None], optional): number of iterations without improvement of the best solution after which the search stops. Defaults to None (never).
+            threads (int, optional): number of threads scanning chunks of the "full" or "nurses" neighborhood concurrently, each on its own copy of the solution. The whole neighborhood is scanned, so only the "best" strategy is supported. Defaults to 0 (serial scan).
+
+        Raises:
+            ValueError: if threads are used with a strategy other than "best" or the "feasibility" neighborhood
         """
+        if threads and (strategy != "best" or neighborhood == "feasibility"):
+            raise ValueError("The concurrent scan only supports the best strategy on the full and nurses neighborhoods")
         self.tabu_size = tabu_size
         self.tabu_list = []
         self.factor = factor
         self.hospital = hospital
+        self.optimize_every = optimize_every
+        self.nurse_assignment = NurseAssignment(hospital)
+        self.reactive = reactive
+        self.bounded = bounded
+        self.strategy = strategy
+        # Number of improving moves after which the scan of the neighborhood stops
+        self.scan_limit = {"best": math.inf, "first": 1, "best_of_k": k, "ordered": 1}[strategy]
+        self.gap = gap
+        self.neighborhood = neighborhood
+        self.patience = patience
+        self.threads = threads
+        # Lower bound of the penalty and gap of the best solution (None if infeasible), computed when a gap is given
+        self.lower_bound = None
+        self.solution_gap = None
+        # Reactive tabu: last iteration each state was visited at, moving average of the cycle lengths and last tabu size change
+        self.visited: Dict[int, int] = {}
+        self.cycle_length = 0.0
+        self.last_change = 0
+
+    def react(self, iteration: int, max_size: int):
+        """Adapt the size of the tabu queue to the history of the search
+
+        The size grows when the current state has already been visited, i.e. the search is cycling,
+        and shrinks when no state has been repeated for longer than the average cycle length.
+
+        Args:
+            iteration (int): current iteration
+            max_size (int): maximum size of the tabu queue
+        """
+        state = self.hospital.get_state_hash()
+        last_visit = self.visited.get(state)
+        self.visited[state] = iteration
+        if last_visit is not None:
+            cycle = iteration - last_visit
+            self.cycle_length = 0.9 * self.cycle_length + 0.1 * cycle if self.cycle_length else cycle
+            self.tabu_size = min(max(math.ceil(self.tabu_size * 1.1), self.tabu_size + 1), max_size)
+            self.last_change = iteration
+        elif iteration - self.last_change > self.cycle_length:
+            self.tabu_size = max(min(math.floor(self.tabu_size * 0.9), self.tabu_size - 1), 1)
+            self.last_change = iteration
+
+    def is_feasible(self) -> bool:
+        """Check if the current solution satisfies every hard constraint, which the lower bound requires
+
+        Returns:
+            bool: True if the solution is feasible, False otherwise
+        """
+        _, _, violations = self.hospital.evaluate_solutions(*self.hospital.get_solution_vectors())
+        return not any(v[0] for v in violations.values())
 
     def solve(self, max_iter:int) -> int:
         """Solves the hospital assignment problem using Tabu search
@@ -25,31 +94,80 @@ class Tabu:
         """
         best_penalty, _ = self.hospital.compute_penalty()
         current_penalty = best_penalty
+        self.hospital.save_status()
+        # The gap is only meaningful for a feasible best solution
+        best_feasible = False
+        if self.gap is not None:
+            self.lower_bound, _ = LowerBound(self.hospital).compute()
+            best_feasible = self.is_feasible()
+        last_improvement = 0
+        # Only moves that are not tabu or satisfy the aspiration criterion can be selected
+        admissible = lambda action, p: action not in self.tabu_list or p < best_penalty * self.factor
+        if self.threads:
+            executor = ThreadPoolExecutor(self.threads)
+            workers = [self.hospital.get_worker() for _ in range(self.threads)]
         for i in range(max_iter):
+            if best_feasible and LowerBound.get_gap(best_penalty, self.lower_bound) <= self.gap:
+                break
+            if self.patience is not None and i - last_improvement > self.patience:
+                break
             print(i)
-            neighboring_actions = self.hospital.get_neighboring_moves()
+            bound = None
+            if self.bounded:
+                bound = NeighborhoodBound(admissible)
             next_action = None
             next_penalty = float("inf")
-            for neighboring_action in neighboring_actions:
-                try:
-                    p, _ = self.hospital.apply_action(neighboring_action)
-                except ActionError as e:
-                    continue
-                if neighboring_action in self.tabu_list and p >= best_penalty * self.factor:
-                    continue
-                if p < next_penalty:
-                    next_penalty = p
-                    next_action = neighboring_action
+            scanned = 0
+            improving = 0
+            if self.threads:
+                next_action, next_penalty, scanned = self.hospital.find_best_move_concurrently(executor, workers, admissible, self.bounded, self.neighborhood)
+            else:
+                for neighboring_action, p in self.hospital.iterate_neighboring_moves(bound, self.strategy == "ordered", self.neighborhood):
+                    scanned += 1
+                    if not admissible(neighboring_action, p):
+                        continue
+                    if p < next_penalty:
+                        next_penalty = p
+                        next_action = neighboring_action
+                    if p < current_penalty:
+                        improving += 1
+                        if improving >= self.scan_limit:
+                            break
             if next_action is None:
                 break
             self.hospital.apply_action(next_action, assign=True)
             current_penalty = next_penalty
             if current_penalty < best_penalty:
                 best_penalty = current_penalty
+                last_improvement = i
                 self.hospital.save_status()
+                if self.gap is not None:
+                    best_feasible = self.is_feasible()
             self.tabu_list.append(next_action)
+            if self.reactive:
+                self.react(i, max(scanned - 1, 1))
             if len(self.tabu_list) > self.tabu_size:
                 self.tabu_list = self.tabu_list[-self.tabu_size :]
+            if self.optimize_every and (i + 1) % self.optimize_every == 0:
+                current_penalty = self.nurse_assignment.solve()
+                if current_penalty < best_penalty:
+                    best_penalty = current_penalty
+                    last_improvement = i
+                    self.hospital.save_status()
+                    if self.gap is not None:
+                        best_feasible = self.is_feasible()
+        if self.threads:
+            executor.shutdown()
         self.hospital.load_status()
+        if self.optimize_every:
+            best_penalty = self.nurse_assignment.solve()
+            self.hospital.save_status()
+        if self.gap is not None:
+            if self.is_feasible():
+                self.solution_gap = LowerBound.get_gap(best_penalty, self.lower_bound)
+                self.hospital.logger.log_action(best_penalty, f"Lower bound {self.lower_bound}, gap {self.solution_gap:.4f}")
+            else:
+                self.solution_gap = None
+                self.hospital.logger.log_action(best_penalty, f"Lower bound {self.lower_bound}, infeasible solution")
         
         return best_penalty
@@ -1,3 +1,10 @@
 from .Tabu import Tabu
+from .Assignment import NurseAssignment
+from .Decomposition import Decomposition
+from .Annealing import Annealing
+from .LateAcceptance import LateAcceptance
+from .IteratedLocalSearch import IteratedLocalSearch
+from .Memetic import Memetic
+from .Phased import Phased
 
-__all__ = ['Tabu']
\ No newline at end of file
+__all__ = ['Tabu', 'NurseAssignment', 'Decomposition', 'Annealing', 'LateAcceptance', 'IteratedLocalSearch', 'Memetic', 'Phased']
\ No newline at end of file
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+from typing import Tuple
+import numpy as np
+from numpy.typing import NDArray
+
+# The packages are imported as in main.py, from the stochastic_optimization directory
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from Instances import Hospital
+
+data_dir = os.path.join(root_dir, "data", "ihtc2024_test_dataset")
+solutions_dir = os.path.join(root_dir, "data", "ihtc2024_test_solutions")
+instances = ["toy"] + [f"test{i:02d}" for i in range(1, 11)]
+
+
+def load_reference_solution(
+    hospital: Hospital, instance: str
+) -> Tuple[NDArray, NDArray, NDArray, NDArray]:
+    """Read the bundled solution of an instance as assignment vectors
+
+    Args:
+        hospital (Hospital): hospital object of the instance
+        instance (str): name of the instance
+
+    Returns:
+        Tuple[NDArray, NDArray, NDArray, NDArray]: admission day, room and operating theater of each patient, nurse of each shift and room
+    """
+    file_name = "toy_solution.json" if instance == "toy" else f"sol_{instance}.json"
+    with open(os.path.join(solutions_dir, file_name)) as f:
+        solution = json.load(f)
+    indexer = hospital.indexer
+    admission_days = np.full(len(hospital.patients), -1, dtype=int)
+    rooms = np.full(len(hospital.patients), -1, dtype=int)
+    operating_theaters = np.full(len(hospital.patients), -1, dtype=int)
+    for patient in solution["patients"]:
+        if patient["admission_day"] == "none":
+            continue
+        patient_index = indexer.reverse_lookup("patients", patient["id"])
+        admission_days[patient_index] = patient["admission_day"]
+        rooms[patient_index] = indexer.reverse_lookup("rooms", patient["room"])
+        operating_theaters[patient_index] = indexer.reverse_lookup(
+            "operating_theaters", patient["operating_theater"]
+        )
+    nurses = np.full(hospital.nra.room_nurse.shape, -1, dtype=int)
+    for nurse in solution["nurses"]:
+        nurse_index = indexer.reverse_lookup("nurses", nurse["id"])
+        for assignment in nurse["assignments"]:
+            shift = assignment["day"] * len(hospital.shift_types)
+            shift += hospital.shift_types.index(assignment["shift"])
+            for room_id in assignment["rooms"]:
+                nurses[shift, indexer.reverse_lookup("rooms", room_id)] = nurse_index
+    return admission_days, rooms, operating_theaters, nurses
+
+
+def load_reference_window(hospital: Hospital, instance: str):
+    """Load the bundled solution of an instance into the hospital, as a window covering the whole horizon
+
+    Args:
+        hospital (Hospital): hospital object of the instance
+        instance (str): name of the instance
+    """
+    admission_days, rooms, operating_theaters, nurses = load_reference_solution(
+        hospital, instance
+    )
+    patient_slots = [
+        (int(p), int(admission_days[p]), int(rooms[p]), int(operating_theaters[p]))
+        for p in np.nonzero(admission_days >= 0)[0]
+    ]
+    shifts, room_indices = np.nonzero(nurses >= 0)
+    nurse_cells = list(
+        zip(
+            shifts.tolist(),
+            room_indices.tolist(),
+            nurses[shifts, room_indices].tolist(),
+        )
+    )
+    hospital.load_window_solution(0, hospital.days, patient_slots, nurse_cells)
@@ -0,0 +1,33 @@
+import os
+import numpy as np
+import pytest
+from conftest import data_dir, load_reference_window
+from Instances import Hospital
+from Instances.Hospital import ActionError
+
+
+@pytest.mark.parametrize("instance", ["toy", "test01", "test03"])
+def test_batch_matches_compute_penalty(instance: str):
+    hospital = Hospital(os.path.join(data_dir, f"{instance}.json"))
+    load_reference_window(hospital, instance)
+    rng = np.random.default_rng(0)
+    solutions = []
+    expected = []
+    # States along a random walk from the reference solution
+    for _ in range(5):
+        for _ in range(20):
+            action = hospital.sample_neighboring_move(rng)
+            if action is None:
+                continue
+            try:
+                hospital.apply_action(action, assign=True)
+            except ActionError:
+                pass
+        solutions.append(hospital.get_solution_vectors())
+        expected.append(hospital.compute_penalty())
+
+    vectors = [np.stack(vector) for vector in zip(*solutions)]
+    penalties, penalty_dicts, _ = hospital.evaluate_solutions(*vectors)
+    for index, (penalty, penalty_dict) in enumerate(expected):
+        assert penalties[index] == penalty
+        assert {key: value[index] for key, value in penalty_dicts.items()} == penalty_dict
@@ -0,0 +1,113 @@
+import os
+from typing import Dict, Tuple, Union
+import numpy as np
+from numpy.typing import NDArray
+import pytest
+from conftest import data_dir, load_reference_solution
+from Instances import Hospital
+from Instances.Hospital import ActionError
+from Instances.Kernels import NumpyKernels, get_backends
+
+
+@pytest.fixture(params=["numpy", "numba"])
+def backend(request) -> type:
+    backends = {backend.name: backend for backend in get_backends()}
+    if request.param not in backends:
+        pytest.skip("Numba is not installed or HOSPITAL_KERNELS=numpy")
+    return backends[request.param]
+
+
+def reference_kernels(
+    hospital: Hospital,
+) -> Dict[str, Union[int, Tuple[NDArray, NDArray, NDArray]]]:
+    """Compute the kernel values with the original loops, one nurse assignment or patient at a time
+
+    Args:
+        hospital (Hospital): hospital object
+
+    Returns:
+        Dict[str, Union[int, Tuple[NDArray, NDArray, NDArray]]]: value of each kernel
+    """
+    nra = hospital.nra
+    skill_deficit = 0
+    excess_workload = 0
+    shifts, rooms, nurses = np.nonzero(nra.nra_matrix)
+    for shift, room, nurse in zip(shifts, rooms, nurses):
+        nurse_object = hospital.indexer.lookup("nurses", nurse)
+        skill_deficit += max(nra.skill_max[shift, room] - nurse_object.skill_level, 0)
+        excess_workload += max(
+            nra.workload_sum[shift, room] - nurse_object.maximum_workload(shift), 0
+        )
+    continuity = 0
+    for patient in range(nra.patient_matrix.shape[-1]):
+        if not nra.patient_matrix[:, :, patient].any():
+            continue
+        shifts, rooms = np.nonzero(nra.patient_matrix[:, :, patient])
+        continuity += nra.nra_matrix[shifts, rooms[0], :].any(axis=0).sum()
+    age_histogram = hospital.pas.age_histogram
+    days, room_count, age_groups = age_histogram.shape
+    min_age = np.zeros((days, room_count), dtype=int)
+    max_age = np.full((days, room_count), age_groups - 1, dtype=int)
+    occupied = np.zeros((days, room_count), dtype=bool)
+    for day in range(days):
+        for room in range(room_count):
+            ages = np.nonzero(age_histogram[day, room])[0]
+            if len(ages):
+                min_age[day, room], max_age[day, room] = ages[0], ages[-1]
+                occupied[day, room] = True
+    return {
+        "skill_deficit": skill_deficit,
+        "excess_workload": excess_workload,
+        "continuity": int(continuity),
+        "age_range": (min_age, max_age, occupied),
+    }
+
+
+def walk(hospital: Hospital, steps: int, seed: int):
+    """Apply random neighboring moves to the hospital, yielding after each of them
+
+    Args:
+        hospital (Hospital): hospital object
+        steps (int): number of random moves
+        seed (int): seed of the random number generator
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(steps):
+        action = hospital.sample_neighboring_move(rng)
+        if action is not None:
+            try:
+                hospital.apply_action(action, assign=True)
+            except ActionError:
+                pass
+        yield
+
+
+@pytest.mark.parametrize("instance", ["toy", "test01"])
+def test_kernels_match_reference(backend: type, instance: str):
+    hospital = Hospital(os.path.join(data_dir, f"{instance}.json"))
+    # The walk starts from a complete solution
+    hospital.load_solution_vectors(*load_reference_solution(hospital, instance))
+    pas, nra = hospital.pas, hospital.nra
+    for _ in walk(hospital, 300, seed=0):
+        reference = reference_kernels(hospital)
+        assert reference["skill_deficit"] == backend.skill_deficit(
+            nra.nra_matrix, nra.skill_max, nra.nurse_skills
+        )
+        assert reference["excess_workload"] == backend.excess_workload(
+            nra.nra_matrix, nra.workload_sum, nra.nurse_max_loads
+        )
+        assert reference["continuity"] == backend.continuity(
+            nra.nra_matrix, nra.patient_matrix
+        )
+        for array, expected in zip(
+            backend.age_range(pas.age_histogram), reference["age_range"]
+        ):
+            assert np.array_equal(array, expected)
+
+
+def test_gender_fits():
+    # Only implemented with NumPy, since the room genders are an object array
+    room_gender = np.array(["", "A", "A", ""], dtype=object)
+    assert NumpyKernels.gender_fits(room_gender, "A")
+    assert not NumpyKernels.gender_fits(room_gender, "B")
+    assert NumpyKernels.gender_fits(room_gender[[0, 3]], "B")
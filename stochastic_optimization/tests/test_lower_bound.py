@@ -0,0 +1,34 @@
+import os
+import pytest
+from conftest import data_dir, instances, load_reference_solution
+from Instances import Hospital
+from Instances.LowerBound import LowerBound
+from Solvers import Tabu
+
+
+@pytest.mark.parametrize("instance", instances)
+def test_bound_below_reference_solution(instance: str):
+    hospital = Hospital(os.path.join(data_dir, f"{instance}.json"))
+    penalty, _, violations = hospital.evaluate_solutions(
+        *load_reference_solution(hospital, instance)
+    )
+    if any(v[0] for v in violations.values()):
+        pytest.skip("the bundled solution violates some hard constraints")
+    bound, _ = LowerBound(hospital).compute()
+    assert bound <= penalty[0]
+
+
+def test_bound_below_tabu_solution():
+    hospital = Hospital(os.path.join(data_dir, "toy.json"))
+    penalty = Tabu(30, 1, hospital).solve(50)
+    bound, _ = LowerBound(hospital).compute()
+    assert bound <= penalty
+
+
+def test_gap_ignored_while_infeasible():
+    hospital = Hospital(os.path.join(data_dir, "toy.json"))
+    tabu = Tabu(30, 1, hospital, gap=1.0)
+    # The empty solution leaves the rooms of the occupants uncovered
+    assert not tabu.is_feasible()
+    tabu.solve(5)
+    assert len(tabu.tabu_list) > 0
@@ -0,0 +1,38 @@
+import json
+import os
+from conftest import data_dir, load_reference_window
+from Instances import Hospital
+
+
+def test_rejected_windows_keep_dump_consistent(tmp_path):
+    hospital = Hospital(os.path.join(data_dir, "toy.json"))
+    load_reference_window(hospital, "toy")
+    hospital.save_status()
+    # Two rejected phases, as in Decomposition.solve: empty the whole horizon and roll back
+    for _ in range(2):
+        hospital.load_window_solution(0, hospital.days, [], [])
+        hospital.load_status()
+
+    slots = {
+        patient_index: (day, room_index, ot_index)
+        for patient_index, day, room_index, ot_index in hospital.get_window_solution(
+            0, hospital.days
+        )[0]
+    }
+    assert slots
+    file_name = os.path.join(tmp_path, "solution.json")
+    hospital.json_dump(file_name)
+    with open(file_name) as f:
+        solution = json.load(f)
+    for patient in solution["patients"]:
+        patient_index = hospital.indexer.reverse_lookup("patients", patient["id"])
+        if patient_index not in slots:
+            assert patient["admission_day"] == "none"
+            continue
+        day, room_index, ot_index = slots[patient_index]
+        assert patient["admission_day"] == day
+        assert patient["room"] == hospital.indexer.lookup("rooms", room_index).id
+        assert (
+            patient["operating_theater"]
+            == hospital.indexer.lookup("operating_theaters", ot_index).id
+        )